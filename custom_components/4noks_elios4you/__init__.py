@@ -12,6 +12,7 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.storage import Store
 
 from .const import (
     CONF_ENABLE_REPAIR_NOTIFICATION,
@@ -24,6 +25,8 @@ from .const import (
     DEFAULT_RECOVERY_SCRIPT,
     DOMAIN,
     STARTUP_MESSAGE,
+    STORAGE_KEY,
+    STORAGE_VERSION,
 )
 from .coordinator import Elios4YouCoordinator
 from .helpers import log_debug, log_error, log_info
@@ -51,18 +54,23 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: Elios4YouConfigEn
     # Initialise the coordinator that manages data updates from the API
     coordinator = Elios4YouCoordinator(hass, config_entry)
 
-    # If the refresh fails, async_config_entry_first_refresh() will
-    # raise ConfigEntryNotReady and setup will try again later
-    # ref.: https://developers.home-assistant.io/docs/integration_setup_failures
-    await coordinator.async_config_entry_first_refresh()
-
-    # Test to see if api initialised correctly, else raise ConfigNotReady to make HA retry setup
-    if not coordinator.api.data["sn"]:
-        raise ConfigEntryNotReady(
-            translation_domain=DOMAIN,
-            translation_key="connection_timeout",
-            translation_placeholders={"device_name": str(config_entry.data.get(CONF_NAME, ""))},
-        )
+    # With the last-known device values restored, entities come up from them
+    # right away and the first refresh runs in the background
+    restored = await coordinator.async_restore_snapshot()
+
+    if not restored:
+        # If the refresh fails, async_config_entry_first_refresh() will
+        # raise ConfigEntryNotReady and setup will try again later
+        # ref.: https://developers.home-assistant.io/docs/integration_setup_failures
+        await coordinator.async_config_entry_first_refresh()
+
+        # Test to see if api initialised correctly, else raise ConfigNotReady to make HA retry setup
+        if not coordinator.api.data["sn"]:
+            raise ConfigEntryNotReady(
+                translation_domain=DOMAIN,
+                translation_key="connection_timeout",
+                translation_placeholders={"device_name": str(config_entry.data.get(CONF_NAME, ""))},
+            )
 
     # Store coordinator in runtime_data to make it accessible throughout the integration
     config_entry.runtime_data = RuntimeData(coordinator)
@@ -75,6 +83,9 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: Elios4YouConfigEn
     # Register device
     async_update_device_registry(hass, config_entry)
 
+    # Spread the first scheduled poll of every entry over the polling period
+    coordinator.async_schedule_first_refresh()
+
     # Return true to denote a successful setup
     return True
 
@@ -148,6 +159,12 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: Elios4YouConfigE
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Delete the persisted device snapshot when the config entry is removed."""
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{config_entry.entry_id}").async_remove()
+    log_debug(_LOGGER, "async_remove_entry", "Removed persisted device snapshot")
+
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Migrate old config entries.
 
@@ -0,0 +1,77 @@
+"""Adaptive poll interval for 4-noks Elios4You.
+
+With adaptive polling enabled, the coordinator does not poll on a fixed
+``scan_interval`` but on an interval that follows how fast the measured
+power moves:
+
+* a tracked power leaving its band (a cloud passing, an appliance switching)
+  drops the interval to the ``floor``, so the transient is followed closely.
+  The band is centred on the power's value when it last left the band, and
+  is ``power_ratio`` of that value wide on each side, at least ``power_delta``
+  kW: household noise around a flat load stays inside it, and the band only
+  moves once the power really did
+* every stable cycle stretches the interval by ``GROWTH``, up to the
+  ``ceiling``
+* at night, once nothing is produced, the interval goes straight to the
+  ceiling; a consumption change still drops it back to the floor
+
+A failed poll resets the interval to the configured ``scan_interval``, so
+recovery is neither rushed nor delayed by the adaptation.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+
+class AdaptiveInterval:
+    """Poll interval that shrinks on power changes and stretches while stable."""
+
+    __slots__ = ("_centres", "base", "ceiling", "floor", "interval", "power_delta", "power_ratio")
+
+    GROWTH = 1.5
+
+    def __init__(
+        self,
+        base: float,
+        *,
+        floor: float,
+        ceiling: float,
+        power_delta: float,
+        power_ratio: float = 0.0,
+    ) -> None:
+        """Initialize at the ``base`` interval, with no cycle seen yet."""
+        self.base = base
+        self.floor = min(floor, base)
+        self.ceiling = max(ceiling, base)
+        self.power_delta = power_delta
+        self.power_ratio = power_ratio
+        self.interval = base
+        self._centres: tuple[float, ...] | None = None
+
+    def update(self, powers: tuple[float, ...], *, night: bool = False) -> float:
+        """Fold in the powers of one successful cycle and return the next interval.
+
+        ``powers`` starts with the produced power, followed by any other
+        powers to watch (in the same order every cycle).
+        """
+        if self._centres is None:
+            self._centres = powers
+        elif any(
+            abs(now - centre) >= max(self.power_delta, self.power_ratio * abs(centre))
+            for now, centre in zip(powers, self._centres, strict=True)
+        ):
+            self._centres = powers
+            self.interval = self.floor
+            return self.interval
+        if night and not powers[0]:
+            self.interval = self.ceiling
+        else:
+            self.interval = min(self.interval * self.GROWTH, self.ceiling)
+        return self.interval
+
+    def reset(self) -> float:
+        """Forget the power bands and return to the ``base`` interval."""
+        self._centres = None
+        self.interval = self.base
+        return self.interval
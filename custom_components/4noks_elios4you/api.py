@@ -5,28 +5,62 @@ It owns no sockets and no retry/backoff logic — that all lives in the
 manager. What lives here:
 
 * The well-known set of commands (``@dat``, ``@sta``, ``@inf``, ``@rel``)
-  and how to parse each one.
-* The high-level read cycle (``async_get_data``) and the relay setter
-  (``telnet_set_relay``) used by the coordinator and the switch entity.
-* The data dictionary that backs every sensor entity in the integration.
+  and how to parse each one. Parsing is done by :class:`ResponseParser`,
+  which the manager feeds while the response is still being read.
+* The high-level read cycle (``async_get_data``), the relay setter
+  (``telnet_set_relay``) and the relay-only refresh (``async_read_relay``)
+  used by the coordinator and the switch entity. Relay requests are
+  coalesced: the first is written at once, and those arriving while it is
+  in flight or within ``relay_window`` after it become one follow-up write
+  of the last requested state (none if the device already confirmed it).
+* The refresh tiers: ``@dat`` is read every cycle, ``@sta`` on a slower
+  cadence, and the static ``@inf`` block only when it is first needed, after
+  the connection recovered from a failure, or once its TTL has expired.
+  Commands of a cycle succeed or fail on their own, and every key records
+  which command last read it and when, so consumers can judge each value's
+  age instead of the cycle's outcome.
+* Single-flight reads: concurrent callers asking for the same read cycle
+  (or the same read-only command) share one in-flight request and its
+  result instead of each sending their own traffic to the device.
+* The data dictionary that backs every sensor entity in the integration,
+  and the snapshot of it that is persisted across restarts.
 
 https://github.com/alexdelprete/ha-4noks-elios4you
 """
 
 from __future__ import annotations
 
+import asyncio
+from collections import ChainMap
+from collections.abc import Callable, Coroutine, Hashable, Mapping, MutableMapping, Sequence
 import logging
+import time
+from typing import Any
 
 from homeassistant.core import HomeAssistant
 
 from .connection_manager import (
     ConnectionManager,
+    ConnectionManagerError,
+    ConnectionState,
     ConnectionUnavailableError,
     TelnetCommandError,
     TelnetConnectionError,
 )
-from .const import MANUFACTURER, MODEL
+from .const import (
+    DEFAULT_DIAGNOSTIC_INTERVAL,
+    DEFAULT_RELAY_WINDOW,
+    DEFAULT_STATUS_INTERVAL,
+    MANUFACTURER,
+    MODEL,
+    RELAY_CONFIRMED_MAX_AGE,
+    STATIC_INFO_TTL,
+    TIER_DUE_SLACK,
+)
 from .helpers import log_debug
+from .model import DeviceSnapshot
+from .parser import ResponseParser, parse_response
+from .scheduler import CommandPriority
 
 # Re-export the exception types so existing callers
 # (``coordinator``, ``config_flow``, tests) don't need to change imports.
@@ -39,6 +73,9 @@ __all__ = [
 
 _LOGGER = logging.getLogger(__name__)
 
+# Freshness stamp of a key the device has not reported yet (see updated_at)
+_NEVER_READ = ("", 0.0)
+
 
 class Elios4YouAPI:
     """Protocol-level API for an Elios4you device.
@@ -48,16 +85,70 @@ class Elios4YouAPI:
     the device's responses.
     """
 
-    def __init__(self, hass: HomeAssistant, name: str, host: str, port: int) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        host: str,
+        port: int,
+        *,
+        status_interval: float = DEFAULT_STATUS_INTERVAL,
+        static_info_ttl: float = STATIC_INFO_TTL,
+        diagnostic_interval: float = DEFAULT_DIAGNOSTIC_INTERVAL,
+        relay_window: float = DEFAULT_RELAY_WINDOW,
+    ) -> None:
         """Initialize the API."""
         self._hass = hass
         self._name = name
         self._host = host
         self._port = port
+        self._status_interval = status_interval
+        self._static_info_ttl = static_info_ttl
+        self._diagnostic_interval = diagnostic_interval
+        self._relay_window = relay_window
+        # Flat dict view of the device values. It is never modified in place:
+        # every change builds a new dict that is swapped in whole (see _swap),
+        # so a reader never sees a half-merged cycle.
         self.data: dict[str, int | float | str] = {}
+        # Bumped by every swap; stamps the snapshots built from ``data``.
+        self.generation = 0
+        self.captured_at = 0.0
+        self._snapshot: DeviceSnapshot | None = None
+
+        # Wall-clock start of the last cycle that read each command; 0.0 means
+        # "never read", which makes a tiered command due immediately.
+        self._refreshed_at: dict[str, float] = {"@dat": 0.0, "@sta": 0.0, "@inf": 0.0}
+        # Outcome of the last attempt per command: "ok" or the error
+        self.command_status: dict[str, str] = {}
+        # Per key: the command that last read it and when (wall-clock time)
+        self.updated_at: dict[str, tuple[str, float]] = {}
+
+        # Shared in-flight reads, keyed by what they fetch (see _single_flight).
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+        # Bumped by every write command, so a read started before a write is
+        # never shared with one that must observe the write.
+        self._write_generation = 0
+
+        # Relay requests: the last requested state, the write still collecting
+        # requests (joined by new ones), the latest write (the next one waits
+        # for it) and when a write last finished (monotonic).
+        self._relay_target = 0
+        self._relay_pending: asyncio.Task[bool] | None = None
+        self._relay_last: asyncio.Task[bool] | None = None
+        self._relay_written_at = float("-inf")
+        # (state, time) of the last live @rel read-back; never restored
+        self._relay_confirmed: tuple[int, float] | None = None
+        # Number of @rel read-backs published, so a caller can tell whether a
+        # relay write changed api.data (even when it failed)
+        self.relay_reads = 0
 
         self.connection_manager = ConnectionManager(host=host, port=port)
 
+        # Diagnostics channel: when the cm_ values were last published (monotonic)
+        # and the connection state they showed.
+        self._diagnostics_published_at = 0.0
+        self._diagnostics_state: ConnectionState | None = None
+
         self._init_data_keys()
 
     # ------------------------------------------------------------------ #
@@ -81,49 +172,163 @@ class Elios4YouAPI:
     async def close(self) -> None:
         """Close the underlying connection (called on integration unload)."""
         await self.connection_manager.close()
-        self._update_diagnostic_data()
+        self._update_diagnostic_data(force=True)
 
     async def async_get_data(self) -> bool:
-        """Run one full read cycle: ``@dat`` + ``@sta`` + ``@inf``.
+        """Run one read cycle: ``@dat`` plus whichever tiers are due, in one batch.
+
+        Concurrent callers (e.g. a scheduled refresh and a switch's forced
+        update) join the cycle already in flight rather than starting another.
 
         Raises:
             TelnetConnectionError: device unreachable.
             TelnetCommandError: a command failed after retries.
             ConnectionUnavailableError: manager is in backoff.
 
+        """
+        return await self._single_flight(("cycle", self._write_generation), self._read_cycle)
+
+    async def _read_cycle(self) -> bool:
+        """Run the read cycle behind ``async_get_data``.
+
+        Only a failed ``@dat`` fails the cycle. When ``@sta`` or ``@inf``
+        fails, the values of the commands that succeeded are still published
+        and the failed command stays due, so the next cycle retries just that.
         """
         log_debug(_LOGGER, "async_get_data", "========== READ CYCLE START ==========")
 
+        # Tiers are stamped with the cycle start: a cycle's duration must not
+        # push an @sta due every poll back to every other poll.
+        started = time.time()
+        cmds = self._due_commands(started)
         try:
-            dat = await self._command("@dat")
-            self._merge_dat(dat)
+            parsed, failed = await self._command_batch(cmds)
+            # Merge into a copy and swap it in once the whole cycle is in.
+            data = dict(self.data)
+            merged = self._merge_responses(data, parsed, failed)
+            self.command_status.update(
+                (cmd, str(failed[cmd]) if cmd in failed else "ok") for cmd in cmds
+            )
+            if "@dat" in failed:
+                raise failed["@dat"]
+            calculated: dict[str, int | float | str] = {}
+            self._update_calculated(ChainMap(calculated, data))
+            data.update(calculated)
+            merged["@dat"].update(calculated)
+        except BaseException:
+            # Nothing of a failed cycle is published, except its metrics.
+            self._update_diagnostic_data()
+            raise
+
+        now = time.time()
+        for cmd, values in merged.items():
+            self._refreshed_at[cmd] = started
+            self.updated_at.update(dict.fromkeys(values, (cmd, now)))
+        if diagnostics := self._diagnostic_values():
+            data.update(diagnostics)
+        self._swap(data)
+
+        if failed:
+            log_debug(
+                _LOGGER,
+                "async_get_data",
+                "========== READ CYCLE END (partial) ==========",
+                failed=sorted(failed),
+            )
+        else:
+            log_debug(_LOGGER, "async_get_data", "========== READ CYCLE END (success) ==========")
+        return True
 
-            sta = await self._command("@sta")
-            self._merge_sta(sta)
+    def stale_keys(self, now: float, max_age: Mapping[str, float]) -> set[str]:
+        """Return the keys whose value is too old to show.
 
-            inf = await self._command("@inf")
-            self._merge_inf(inf)
+        A key is stale when the device has not reported it yet, or when the
+        command that last read it has an entry in ``max_age`` (seconds) and
+        that read is older. Restored values and keys read by other commands
+        only go stale by the first rule.
+        """
+        return {
+            key
+            for key, (cmd, at) in self.updated_at.items()
+            if not at or (cmd in max_age and now - at > max_age[cmd])
+        }
 
-            self._update_calculated()
-        finally:
-            self._update_diagnostic_data()
+    def device_snapshot(self) -> DeviceSnapshot:
+        """Return an immutable, typed snapshot of the current ``data``.
 
-        log_debug(_LOGGER, "async_get_data", "========== READ CYCLE END (success) ==========")
-        return True
+        Snapshots are stamped with the ``generation`` of the data they were
+        built from, and only rebuilt once a newer one was swapped in.
+        """
+        if self._snapshot is None or self._snapshot.generation != self.generation:
+            self._snapshot = DeviceSnapshot.from_data(
+                self.data, generation=self.generation, captured_at=self.captured_at
+            )
+        return self._snapshot
 
     async def telnet_set_relay(self, state: str) -> bool:
         """Set the device relay to ``"on"`` or ``"off"``.
 
-        Returns True if the device confirms the requested state, False
-        otherwise. Never raises — caller wants a boolean for the UI.
+        A request is written at once unless a write is in flight or finished
+        less than ``relay_window`` seconds ago. Then it waits for both, and
+        every request made meanwhile is coalesced into it: only the last
+        requested state is written and verified, and every caller gets that
+        result.
+
+        Returns True if the device confirms the state that was written,
+        False otherwise. Never raises — caller wants a boolean for the UI.
         """
         if state.lower() == "on":
-            to_state = 1
+            self._relay_target = 1
         elif state.lower() == "off":
-            to_state = 0
+            self._relay_target = 0
         else:
             return False
 
+        task = self._relay_pending
+        if task is None:
+            task = asyncio.create_task(self._coalesced_relay_write(self._relay_last))
+            self._relay_pending = self._relay_last = task
+        else:
+            log_debug(
+                _LOGGER,
+                "telnet_set_relay",
+                "Relay request coalesced",
+                to_state=self._relay_target,
+            )
+        return await asyncio.shield(task)
+
+    async def _coalesced_relay_write(self, previous: asyncio.Task[bool] | None) -> bool:
+        """Write the last requested relay state once the previous write and its window are over."""
+        if previous is not None:
+            await asyncio.wait([previous])
+        if (delay := self._relay_written_at + self._relay_window - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        # From here on, new requests start the next write
+        self._relay_pending = None
+        to_state = self._relay_target
+
+        # Skip the write only if an @rel read-back just confirmed this state
+        # (and no poll reported otherwise since)
+        confirmed = self._relay_confirmed
+        if (
+            confirmed is not None
+            and confirmed[0] == to_state == self.data["relay_state"]
+            and time.time() - confirmed[1] <= RELAY_CONFIRMED_MAX_AGE
+        ):
+            log_debug(
+                _LOGGER,
+                "telnet_set_relay",
+                "Relay already in requested state, write skipped",
+                to_state=to_state,
+            )
+            return True
+        try:
+            return await self._write_relay(to_state)
+        finally:
+            self._relay_written_at = time.monotonic()
+
+    async def _write_relay(self, to_state: int) -> bool:
+        """Send ``@rel 0 <to_state>`` and verify it with a single ``@rel`` read."""
         try:
             log_debug(
                 _LOGGER,
@@ -131,24 +336,28 @@ class Elios4YouAPI:
                 "Sending relay command",
                 to_state=to_state,
             )
-            await self._command(f"@rel 0 {to_state}")
-            rel_parsed = await self._command("@rel")
+            # Relay writes come from a user action: let them jump ahead of any
+            # queued poll.
+            await self._command(f"@rel 0 {to_state}", priority=CommandPriority.INTERACTIVE)
+            rel_parsed = await self._command("@rel", priority=CommandPriority.INTERACTIVE)
             out_mode = int(rel_parsed["rel"])
         except (TelnetConnectionError, TelnetCommandError, ConnectionUnavailableError) as err:
             log_debug(_LOGGER, "telnet_set_relay", "Relay command failed", error=str(err))
+            self._relay_confirmed = None
             self._update_diagnostic_data()
             return False
         except (ValueError, KeyError) as err:
             # Malformed / unexpected response — fail the service call rather
             # than crash the caller.
             log_debug(_LOGGER, "telnet_set_relay", "Relay response malformed", error=str(err))
+            self._relay_confirmed = None
             self._update_diagnostic_data()
             return False
 
         success = out_mode == to_state
-        if success:
-            # Refresh relay_state immediately to avoid waiting for the next poll.
-            self.data["relay_state"] = out_mode
+        # Publish the read-back state at once (even if it is not the requested
+        # one) rather than waiting for the next poll.
+        self._publish_relay(out_mode)
         log_debug(
             _LOGGER,
             "telnet_set_relay",
@@ -160,22 +369,159 @@ class Elios4YouAPI:
         self._update_diagnostic_data()
         return success
 
+    async def async_read_relay(self) -> int:
+        """Re-read only the relay state (``@rel``) and publish it; return the state.
+
+        A single round trip instead of a full read cycle, for refreshing the
+        relay after a write.
+
+        Raises:
+            TelnetConnectionError, TelnetCommandError, ConnectionUnavailableError:
+                propagated from the manager.
+            TelnetCommandError: when the response has no valid relay state.
+
+        """
+        parsed = await self._command("@rel", priority=CommandPriority.INTERACTIVE)
+        try:
+            state = int(parsed["rel"])
+        except (KeyError, ValueError) as err:
+            raise TelnetCommandError("@rel", f"parse_error: {err}") from err
+        self._publish_relay(state)
+        return state
+
+    def _publish_relay(self, state: int) -> None:
+        """Publish a relay state read back with ``@rel``."""
+        now = time.time()
+        self._publish({"relay_state": state})
+        self.updated_at["relay_state"] = ("@rel", now)
+        self._relay_confirmed = (state, now)
+        self.relay_reads += 1
+
+    # ------------------------------------------------------------------ #
+    # Internal: single-flight
+    # ------------------------------------------------------------------ #
+
+    async def _single_flight[T](
+        self, key: Hashable, factory: Callable[[], Coroutine[Any, Any, T]]
+    ) -> T:
+        """Run ``factory()`` once per ``key`` at a time; concurrent callers share it.
+
+        The shared task is shielded, so a caller that gets cancelled does not
+        abort the request for everyone else. Its result or exception is
+        delivered to every caller.
+        """
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._single_flight_done(key, done))
+        else:
+            log_debug(_LOGGER, "_single_flight", "Joining in-flight request", key=key)
+        return await asyncio.shield(task)
+
+    def _single_flight_done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Forget a finished shared task and mark its exception as retrieved."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    # ------------------------------------------------------------------ #
+    # Internal: refresh tiers
+    # ------------------------------------------------------------------ #
+
+    def _due_commands(self, now: float) -> tuple[str, ...]:
+        """Return the commands to send this cycle, always starting with ``@dat``."""
+        cmds = ["@dat"]
+        if now - self._refreshed_at["@sta"] >= self._status_interval - TIER_DUE_SLACK:
+            cmds.append("@sta")
+
+        inf_at = self._refreshed_at["@inf"]
+        # A failure since the last @inf read means the device may have been
+        # power-cycled or re-flashed, so re-read its static info.
+        recovered = self.connection_manager.metrics.last_failure_at > inf_at
+        if not inf_at or recovered or now - inf_at >= self._static_info_ttl - TIER_DUE_SLACK:
+            cmds.append("@inf")
+
+        log_debug(_LOGGER, "_due_commands", "Commands due this cycle", cmds=cmds)
+        return tuple(cmds)
+
     # ------------------------------------------------------------------ #
     # Internal: command + parse
     # ------------------------------------------------------------------ #
 
-    async def _command(self, cmd: str) -> dict[str, str]:
+    async def _command(
+        self, cmd: str, *, priority: CommandPriority = CommandPriority.POLL
+    ) -> dict[str, str]:
         """Send ``cmd`` and parse its response into a key/value dict.
 
+        Read-only commands (no arguments) are single-flight: a concurrent
+        identical read at the same priority, started since the last write,
+        shares this one's response. Commands with arguments are writes and
+        always go to the device.
+
         Raises:
             TelnetConnectionError, TelnetCommandError, ConnectionUnavailableError:
                 propagated from the manager.
             TelnetCommandError: when the response cannot be parsed.
 
         """
-        raw = await self.connection_manager.execute(cmd)
+        if " " in cmd:
+            self._write_generation += 1
+            return await self._send_command(cmd, priority)
+        return await self._single_flight(
+            (cmd, priority, self._write_generation),
+            lambda: self._send_command(cmd, priority),
+        )
+
+    async def _send_command(self, cmd: str, priority: CommandPriority) -> dict[str, str]:
+        """Send one command to the device and parse the response."""
+        parser = ResponseParser(cmd)
+        raw = await self.connection_manager.execute(cmd, parser=parser, priority=priority)
+        return self._parse_checked(cmd, raw, parser)
+
+    async def _command_batch(
+        self, cmds: tuple[str, ...]
+    ) -> tuple[dict[str, dict[str, str]], dict[str, ConnectionManagerError]]:
+        """Send ``cmds`` as one pipelined batch and parse the responses.
+
+        Returns the parsed response of every command that succeeded and the
+        error of every one that did not. When the batch fails part-way, the
+        commands answered before the failure still count as succeeded; the
+        manager's error (``TelnetConnectionError``, ``TelnetCommandError``
+        or ``ConnectionUnavailableError``) is the error of the rest. A
+        response that cannot be parsed fails its command with a
+        ``TelnetCommandError``.
+        """
+        parsers = [ResponseParser(cmd) for cmd in cmds]
+        failed: dict[str, ConnectionManagerError] = {}
         try:
-            return self._parse(cmd, raw)
+            raws: Sequence[str] = await self.connection_manager.execute_batch(cmds, parsers=parsers)
+        except ConnectionManagerError as err:
+            raws = err.replies
+            failed.update(dict.fromkeys(cmds[len(raws) :], err))
+
+        parsed: dict[str, dict[str, str]] = {}
+        for cmd, raw, parser in zip(cmds, raws, parsers, strict=False):
+            try:
+                parsed[cmd] = self._parse_checked(cmd, raw, parser)
+            except TelnetCommandError as err:
+                failed[cmd] = err
+        return parsed, failed
+
+    @classmethod
+    def _parse_checked(
+        cls, cmd: str, raw: str, parser: ResponseParser | None = None
+    ) -> dict[str, str]:
+        """Return the parsed response, turning malformed lines into ``TelnetCommandError``.
+
+        Uses the streamed result from ``parser`` when the manager has fed it
+        the whole response, and falls back to parsing ``raw`` otherwise.
+        """
+        try:
+            if parser is not None and parser.complete:
+                return parser.result()
+            return cls._parse(cmd, raw)
         except (ValueError, IndexError) as err:
             log_debug(
                 _LOGGER,
@@ -188,53 +534,59 @@ class Elios4YouAPI:
 
     @staticmethod
     def _parse(cmd: str, raw: str) -> dict[str, str]:
-        """Parse a raw device response into a dict.
-
-        The device emits one record per line. Format depends on the command:
-
-        * ``@dat`` / ``@sta``: ``index;key;value;...`` — semicolon-separated
-        * ``@inf`` / ``@rel`` / ``@hwr``: ``key=value`` — equals-separated
+        """Parse a complete raw device response into a dict.
 
-        The response ends with a line containing ``RESPONSE_SEPARATOR``
-        (preceded by a blank line). The first line is often the echoed
-        command, but sometimes a stray line-feed precedes it.
+        See :mod:`.parser` for the line formats; this is the one-shot path for
+        responses that were not streamed through a :class:`ResponseParser`.
         """
-        cmd_main = cmd[0:4].lower()
-        lines = raw.splitlines()
-
-        # First useful line index — skip the echoed command, or one extra if
-        # the device prepended a LF.
-        if lines and lines[0].lower() in ("@dat", "@sta", "@inf", "@rel", "@hwr"):
-            lines_start = 1
-        else:
-            lines_start = 2
-
-        # Last two lines are the blank line and the separator marker.
-        lines_end = -2
-
-        output: dict[str, str] = {}
-        for line in lines[lines_start:lines_end]:
-            if cmd_main in ("@inf", "@rel", "@hwr"):
-                key, value = line.split("=")
-            else:
-                key, value = line.split(";")[1:3]
-            output[key.lower().replace(" ", "_")] = value.strip()
-        return output
+        return parse_response(cmd, raw)
 
     # ------------------------------------------------------------------ #
     # Internal: data merging
     # ------------------------------------------------------------------ #
 
-    def _merge_dat(self, parsed: dict[str, str]) -> None:
-        """Merge a parsed ``@dat`` response into ``self.data``."""
+    def _merge_responses(
+        self,
+        data: dict[str, int | float | str],
+        parsed: Mapping[str, dict[str, str]],
+        failed: dict[str, ConnectionManagerError],
+    ) -> dict[str, dict[str, int | float | str]]:
+        """Merge each parsed response into ``data`` and return the values per command.
+
+        A response the merge rejects fails its command in ``failed`` and
+        leaves ``data`` untouched.
+        """
+        merged: dict[str, dict[str, int | float | str]] = {}
+        for cmd, merge in (
+            ("@dat", self._merge_dat),
+            ("@sta", self._merge_sta),
+            ("@inf", self._merge_inf),
+        ):
+            if cmd not in parsed:
+                continue
+            values: dict[str, int | float | str] = {}
+            try:
+                # Writes land in ``values``; reads fall back to ``data``
+                merge(ChainMap(values, data), parsed[cmd])
+            except (KeyError, ValueError) as err:
+                failed[cmd] = TelnetCommandError(cmd, f"merge_error: {err}")
+                continue
+            data.update(values)
+            merged[cmd] = values
+        return merged
+
+    def _merge_dat(
+        self, data: MutableMapping[str, int | float | str], parsed: dict[str, str]
+    ) -> None:
+        """Merge a parsed ``@dat`` response into ``data``."""
         for key, value in parsed.items():
             try:
                 if "energy" in key or "power" in key:
-                    self.data[key] = round(float(value), 2)
+                    data[key] = round(float(value), 2)
                 elif key == "utc_time":
                     continue
                 else:
-                    self.data[key] = int(value)
+                    data[key] = int(value)
             except ValueError:
                 log_debug(
                     _LOGGER,
@@ -244,11 +596,13 @@ class Elios4YouAPI:
                     value=value,
                 )
 
-    def _merge_sta(self, parsed: dict[str, str]) -> None:
-        """Merge a parsed ``@sta`` response into ``self.data``."""
+    def _merge_sta(
+        self, data: MutableMapping[str, int | float | str], parsed: dict[str, str]
+    ) -> None:
+        """Merge a parsed ``@sta`` response into ``data``."""
         for key, value in parsed.items():
             try:
-                self.data[key] = round(float(value), 2)
+                data[key] = round(float(value), 2)
             except ValueError:
                 log_debug(
                     _LOGGER,
@@ -258,40 +612,108 @@ class Elios4YouAPI:
                     value=value,
                 )
 
-    def _merge_inf(self, parsed: dict[str, str]) -> None:
-        """Merge a parsed ``@inf`` response into ``self.data``."""
+    def _merge_inf(
+        self, data: MutableMapping[str, int | float | str], parsed: dict[str, str]
+    ) -> None:
+        """Merge a parsed ``@inf`` response into ``data``."""
         for key, value in parsed.items():
-            self.data[key] = str(value)
-
-    def _update_calculated(self) -> None:
-        """Recompute derived sensors (self-consumption, software version)."""
-        self.data["swver"] = f"{self.data['fwtop']} / {self.data['fwbtm']}"
+            data[key] = str(value)
+        data["swver"] = f"{data['fwtop']} / {data['fwbtm']}"
 
-        self.data["self_consumed_power"] = round(
-            float(self.data["produced_power"]) - float(self.data["sold_power"]),
+    def _update_calculated(self, data: MutableMapping[str, int | float | str]) -> None:
+        """Recompute derived self-consumption sensors in ``data``."""
+        data["self_consumed_power"] = round(
+            float(data["produced_power"]) - float(data["sold_power"]),
             2,
         )
-        self.data["self_consumed_energy"] = round(
-            float(self.data["produced_energy"]) - float(self.data["sold_energy"]),
+        data["self_consumed_energy"] = round(
+            float(data["produced_energy"]) - float(data["sold_energy"]),
             2,
         )
         for tariff in ("f1", "f2", "f3"):
-            self.data[f"self_consumed_energy_{tariff}"] = round(
-                float(self.data[f"produced_energy_{tariff}"])
-                - float(self.data[f"sold_energy_{tariff}"]),
+            data[f"self_consumed_energy_{tariff}"] = round(
+                float(data[f"produced_energy_{tariff}"]) - float(data[f"sold_energy_{tariff}"]),
                 2,
             )
 
-    def _update_diagnostic_data(self) -> None:
-        """Copy current ConnectionManager metrics into ``self.data``.
+    def _swap(self, data: dict[str, int | float | str]) -> None:
+        """Make ``data`` the current values, as a new generation."""
+        self.data = data
+        self.generation += 1
+        self.captured_at = time.time()
+
+    def _publish(self, changes: Mapping[str, int | float | str]) -> None:
+        """Swap in a copy of ``data`` with ``changes`` applied."""
+        self._swap({**self.data, **changes})
+
+    def _update_diagnostic_data(self, *, force: bool = False) -> None:
+        """Publish the current ConnectionManager metrics, if due (see below)."""
+        if diagnostics := self._diagnostic_values(force=force):
+            self._publish(diagnostics)
+
+    def _diagnostic_values(self, *, force: bool = False) -> dict[str, int | float | str] | None:
+        """Return the ConnectionManager metrics to publish, or None if not due.
 
         Sensors read straight from ``api.data``, so exposing diagnostics is
         as simple as making sure every metric we want visible lives there
         under the ``cm_`` prefix.
+
+        This is a separate, slower channel than the device values: the
+        metrics are published at most once per ``diagnostic_interval``, or
+        right away when the connection state changed (or ``force``). In
+        between, the ``cm_`` values stay as they are and the coordinator does
+        not wake their sensors.
         """
-        snapshot = self.connection_manager.metrics_snapshot()
-        for key, value in snapshot.items():
-            self.data[f"cm_{key}"] = value
+        now = time.monotonic()
+        state = self.connection_manager.metrics.state
+        if (
+            not force
+            and state is self._diagnostics_state
+            and now - self._diagnostics_published_at < self._diagnostic_interval
+        ):
+            return None
+        self._diagnostics_published_at = now
+        self._diagnostics_state = state
+        return {
+            f"cm_{key}": value for key, value in self.connection_manager.metrics_snapshot().items()
+        }
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    def snapshot(self) -> dict[str, int | float | str]:
+        """Return the device values worth persisting (live ``cm_`` metrics excluded)."""
+        return {key: value for key, value in self.data.items() if not key.startswith("cm_")}
+
+    def restore(
+        self, snapshot: Mapping[str, Any], updated_at: Mapping[str, Any] | None = None
+    ) -> None:
+        """Seed ``self.data`` with the values of a persisted ``snapshot()``.
+
+        Only plain values are taken and the ``cm_`` metrics stay live. The
+        refresh tiers are left untouched, so the next read cycle still reads
+        ``@sta`` and ``@inf`` from the device.
+
+        ``updated_at`` holds the persisted freshness stamps (``[command,
+        time]`` per key), so restored values keep aging from when they were
+        read. A value without one counts as read now, by no command.
+        """
+        values = {
+            key: value
+            for key, value in snapshot.items()
+            if not key.startswith("cm_") and isinstance(value, int | float | str)
+        }
+        self._publish(values)
+
+        stamps = updated_at or {}
+        now = time.time()
+        for key in values:
+            match stamps.get(key):
+                case [str(cmd), int() | float() as at]:
+                    self.updated_at[key] = (cmd, float(at))
+                case _:
+                    self.updated_at[key] = ("", now)
 
     # ------------------------------------------------------------------ #
     # Initialization
@@ -359,8 +781,13 @@ class Elios4YouAPI:
         for key in string_keys:
             self.data[key] = ""
 
+        # Device values stay stale until the device reported them (see stale_keys)
+        self.updated_at.update(
+            (key, _NEVER_READ) for key in (*numeric_keys, *string_keys) if key != "utc_time"
+        )
+
         self.data["manufact"] = MANUFACTURER
         self.data["model"] = MODEL
 
         # Initial diagnostic snapshot so sensors created at startup have values.
-        self._update_diagnostic_data()
+        self._update_diagnostic_data(force=True)
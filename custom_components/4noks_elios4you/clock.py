@@ -0,0 +1,77 @@
+"""Time source for the connection manager.
+
+Every clock read in ``ConnectionManager`` (timestamps, reuse window, backoff
+window, read deadlines, latency samples) and its retry-delay sleep go through
+a ``Clock``, so the whole state machine can run on simulated time:
+
+* ``time()``: wall-clock seconds since the epoch, for timestamps and windows
+  that are reported to the user (``backoff_until``, ``last_*_at``)
+* ``monotonic()``: seconds from an arbitrary origin, for durations and
+  deadlines
+* ``sleep()``: wait for a number of seconds
+
+``SYSTEM_CLOCK`` is the real thing. ``ManualClock`` only moves when it is
+advanced (``sleep()`` advances it instantly), which lets tests play days of
+polling in seconds. ``asyncio.wait_for`` timeouts still run on the event
+loop, so a transport used with a manual clock must resolve its reads itself.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class Clock:
+    """Real time: ``time.time()``, ``time.monotonic()`` and ``asyncio.sleep()``."""
+
+    __slots__ = ()
+
+    def time(self) -> float:
+        """Return wall-clock seconds since the epoch."""
+        return time.time()
+
+    def monotonic(self) -> float:
+        """Return monotonic seconds, for durations and deadlines."""
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        """Wait ``seconds``."""
+        await asyncio.sleep(seconds)
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class ManualClock(Clock):
+    """Simulated time that only moves when advanced."""
+
+    __slots__ = ("_epoch", "_now")
+
+    def __init__(self, epoch: float = 1_700_000_000.0) -> None:
+        """Start at monotonic 0.0, i.e. wall-clock ``epoch``."""
+        self._epoch = epoch
+        self._now = 0.0
+
+    def time(self) -> float:
+        """Return the simulated wall-clock time."""
+        return self._epoch + self._now
+
+    def monotonic(self) -> float:
+        """Return the simulated seconds since the clock was created."""
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward by ``seconds``."""
+        self._now += max(0.0, seconds)
+
+    def advance_to(self, wall: float) -> None:
+        """Move the clock forward to wall-clock time ``wall`` (never backwards)."""
+        self._now = max(self._now, wall - self._epoch)
+
+    async def sleep(self, seconds: float) -> None:
+        """Advance by ``seconds`` at once, then let other tasks run."""
+        self.advance(seconds)
+        await asyncio.sleep(0)
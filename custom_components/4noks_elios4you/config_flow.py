@@ -27,26 +27,46 @@ from homeassistant.helpers.selector import (
 
 from .api import Elios4YouAPI, TelnetCommandError, TelnetConnectionError
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_ALIGNED_POLLING,
+    CONF_DIAGNOSTIC_INTERVAL,
     CONF_ENABLE_REPAIR_NOTIFICATION,
     CONF_FAILURES_THRESHOLD,
     CONF_HOST,
+    CONF_MAX_DATA_AGE,
     CONF_NAME,
     CONF_PORT,
     CONF_RECOVERY_SCRIPT,
+    CONF_RELAY_WINDOW,
     CONF_SCAN_INTERVAL,
+    CONF_STATUS_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_ALIGNED_POLLING,
+    DEFAULT_DIAGNOSTIC_INTERVAL,
     DEFAULT_ENABLE_REPAIR_NOTIFICATION,
     DEFAULT_FAILURES_THRESHOLD,
+    DEFAULT_MAX_DATA_AGE,
     DEFAULT_NAME,
     DEFAULT_PORT,
     DEFAULT_RECOVERY_SCRIPT,
+    DEFAULT_RELAY_WINDOW,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
     DOMAIN,
+    MAX_DIAGNOSTIC_INTERVAL,
     MAX_FAILURES_THRESHOLD,
+    MAX_MAX_DATA_AGE,
     MAX_PORT,
+    MAX_RELAY_WINDOW,
     MAX_SCAN_INTERVAL,
+    MAX_STATUS_INTERVAL,
+    MIN_DIAGNOSTIC_INTERVAL,
     MIN_FAILURES_THRESHOLD,
+    MIN_MAX_DATA_AGE,
     MIN_PORT,
+    MIN_RELAY_WINDOW,
     MIN_SCAN_INTERVAL,
+    MIN_STATUS_INTERVAL,
 )
 from .helpers import host_valid, log_debug, log_error
 
@@ -262,6 +282,12 @@ class Elios4YouOptionsFlow(OptionsFlowWithReload):
                 enable_repair_notification=user_input.get(CONF_ENABLE_REPAIR_NOTIFICATION),
                 failures_threshold=user_input.get(CONF_FAILURES_THRESHOLD),
                 recovery_script=user_input.get(CONF_RECOVERY_SCRIPT),
+                status_interval=user_input.get(CONF_STATUS_INTERVAL),
+                diagnostic_interval=user_input.get(CONF_DIAGNOSTIC_INTERVAL),
+                max_data_age=user_input.get(CONF_MAX_DATA_AGE),
+                adaptive_polling=user_input.get(CONF_ADAPTIVE_POLLING),
+                relay_window=user_input.get(CONF_RELAY_WINDOW),
+                aligned_polling=user_input.get(CONF_ALIGNED_POLLING),
             )
             return self.async_create_entry(data=user_input)
 
@@ -314,6 +340,69 @@ class Elios4YouOptionsFlow(OptionsFlowWithReload):
                             unit_of_measurement="seconds",
                         )
                     ),
+                    # 5. Slower refresh tier for the @sta counters
+                    vol.Required(
+                        CONF_STATUS_INTERVAL,
+                        default=current_options.get(CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=MIN_STATUS_INTERVAL,
+                            max=MAX_STATUS_INTERVAL,
+                            mode=NumberSelectorMode.BOX,
+                            unit_of_measurement="seconds",
+                        )
+                    ),
+                    # 6. Publish period of the connection diagnostic sensors
+                    vol.Required(
+                        CONF_DIAGNOSTIC_INTERVAL,
+                        default=current_options.get(
+                            CONF_DIAGNOSTIC_INTERVAL, DEFAULT_DIAGNOSTIC_INTERVAL
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=MIN_DIAGNOSTIC_INTERVAL,
+                            max=MAX_DIAGNOSTIC_INTERVAL,
+                            mode=NumberSelectorMode.BOX,
+                            unit_of_measurement="seconds",
+                        )
+                    ),
+                    # 7. How long a sensor keeps its last value while its reads fail
+                    vol.Required(
+                        CONF_MAX_DATA_AGE,
+                        default=current_options.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=MIN_MAX_DATA_AGE,
+                            max=MAX_MAX_DATA_AGE,
+                            mode=NumberSelectorMode.BOX,
+                            unit_of_measurement="seconds",
+                        )
+                    ),
+                    # 8. Let the polling period follow the power dynamics
+                    vol.Required(
+                        CONF_ADAPTIVE_POLLING,
+                        default=current_options.get(
+                            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                        ),
+                    ): cv.boolean,
+                    # 9. Relay requests within this window become one write
+                    vol.Required(
+                        CONF_RELAY_WINDOW,
+                        default=current_options.get(CONF_RELAY_WINDOW, DEFAULT_RELAY_WINDOW),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=MIN_RELAY_WINDOW,
+                            max=MAX_RELAY_WINDOW,
+                            step=0.1,
+                            mode=NumberSelectorMode.BOX,
+                            unit_of_measurement="seconds",
+                        )
+                    ),
+                    # 10. Poll on wall-clock boundaries of the polling period
+                    vol.Required(
+                        CONF_ALIGNED_POLLING,
+                        default=current_options.get(CONF_ALIGNED_POLLING, DEFAULT_ALIGNED_POLLING),
+                    ): cv.boolean,
                 },
             ),
         )
@@ -1,6 +1,6 @@
 """Connection manager for 4-noks Elios4you telnet device.
 
-Owns the single TCP/telnet connection to the device, serializes all command
+Owns the single TCP connection to the device, serializes all command
 execution, implements adaptive backoff to spare the fragile embedded device,
 and exposes metrics for diagnostic entities.
 
@@ -26,10 +26,74 @@ State machine
 Concurrency
 -----------
 
-A single asyncio.Lock serializes the entire send-and-receive cycle.
-Polling, switch presses, and any future callers all queue on the same lock.
-Within the lock, the connection may be reused if the previous activity is
-within the reuse window — this avoids churning sockets at the device.
+A single-slot ``CommandScheduler`` serializes the entire send-and-receive
+cycle, so exactly one command is ever in flight. Waiters are served by
+``CommandPriority`` rather than FIFO: relay writes first, then data polls,
+then static info / diagnostic probes. A command that is waiting out its retry
+delay hands the slot to any more urgent waiter before trying again. While the
+slot is held, the connection may be reused if the previous activity is within
+the reuse window — this avoids churning sockets at the device.
+
+Pipelining
+----------
+
+``execute_batch()`` sends several commands in a single write while holding
+the lock once, then splits the replies on ``RESPONSE_SEPARATOR`` as they
+arrive. If the device answers some of the pipelined commands but stalls on
+the rest, the socket is reset and the unanswered commands are replayed one at
+a time. If it answers none of them, the retry sends the batch one command at a
+time. Either way, a batch answered sequentially after failing pipelined is a
+strike against pipelining; ``pipeline_strikes`` consecutive strikes switch it
+off. A silent timeout is routine on this device, so a single one never does.
+After ``pipeline_reprobe`` seconds pipelining is tried again, and one more
+strike switches it off for another period.
+
+Transport
+---------
+
+The socket itself sits behind the ``DeviceTransport`` interface from
+``transport.py``. The default backend is a raw ``asyncio.Protocol`` that
+works on bytes and skips telnet option negotiation entirely (the device
+never negotiates); the telnetlib3 backend remains available as a fallback.
+Replies are framed on the bytes level and decoded once per response.
+Callers may pass a ``ResponseParser`` per command; the manager feeds it each
+chunk of that command's response as it arrives and finishes it the moment the
+separator is framed, so parsing overlaps with the network read.
+
+Latency
+-------
+
+Every exchange is timed per phase (connect, write/drain, time to first byte,
+time to separator) into the fixed-bucket histograms of ``latency.py``, per
+command and in aggregate. ``metrics_snapshot()`` exposes the headline
+percentiles; ``latency_snapshot()`` returns every histogram for diagnostics.
+
+Timeouts
+--------
+
+Read and connect timeouts are not fixed. Each command (and the connect) has
+an RFC 6298-style ``RttEstimator``: the timeout is ``SRTT + 4 * RTTVAR`` of
+the observed round trips, clamped between a floor and the configured
+``read_timeout`` / ``connect_timeout`` (now ceilings), and doubled after each
+timeout until a reply comes back. Until the first sample the ceiling
+applies. A deaf device is therefore given up on after a small multiple of
+its usual response time instead of the full ceiling on every attempt.
+
+Time
+----
+
+The manager never reads the system clock directly: timestamps, the reuse
+and backoff windows, read deadlines, latency samples and the retry delay all
+come from an injectable ``Clock`` (``clock.py``). Tests drive it with a
+``ManualClock`` to soak the state machine through days of simulated polling.
+
+Trace
+-----
+
+The last ``trace_size`` events (executes, connects, bytes written, replies as
+received, RST / FIN closes, state transitions, results) are kept in the
+preallocated ring buffer of ``trace.py`` and exported by ``trace_snapshot()``
+for diagnostics, with enough context to replay them deterministically.
 
 Failure handling
 ----------------
@@ -51,24 +115,33 @@ https://github.com/alexdelprete/ha-4noks-elios4you
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Sequence
 from contextlib import suppress
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import StrEnum
 import logging
-import time
-from typing import cast
-
-import telnetlib3
+from operator import attrgetter
+from typing import Any
 
 from homeassistant.exceptions import HomeAssistantError
 
+from .clock import SYSTEM_CLOCK, Clock
 from .const import DOMAIN
 from .helpers import log_debug, log_info, log_warning
+from .latency import ALL_COMMANDS, LatencyPhase, LatencyTracker, RttEstimator
+from .parser import ResponseParser
+from .scheduler import CommandPriority, CommandScheduler
+from .trace import RECV_OK, RECV_SILENT, ExchangeTrace, TraceKind
+from .transport import DeviceTransport, TransportBackend, open_transport
 
 _LOGGER = logging.getLogger(__name__)
 
 LOG_PREFIX = "ConnMgr"
 RESPONSE_SEPARATOR = "ready..."
+_SEPARATOR_BYTES = RESPONSE_SEPARATOR.encode()
+
+# Histogram label for the single shared write of a pipelined batch.
+PIPELINE_LABEL = "pipeline"
 
 
 class ConnectionState(StrEnum):
@@ -84,6 +157,10 @@ class ConnectionState(StrEnum):
 class ConnectionManagerError(HomeAssistantError):
     """Base error from the connection manager."""
 
+    # Responses to the leading commands of a batch that were answered before
+    # it failed, in command order (see ``execute_batch``)
+    replies: tuple[str, ...] = ()
+
 
 class ConnectionUnavailableError(ConnectionManagerError):
     """Raised when the manager refuses to talk to the device (backoff / closed)."""
@@ -132,9 +209,13 @@ class TelnetCommandError(ConnectionManagerError):
 class _RetryableError(Exception):
     """Internal: a soft failure that should trigger an in-execute retry."""
 
-    def __init__(self, reason: str) -> None:
-        """Store the human-readable reason."""
+    def __init__(self, reason: str, *, pipeline_silent: bool = False) -> None:
+        """Store the human-readable reason.
+
+        ``pipeline_silent`` marks a pipelined write that got no reply at all.
+        """
         self.reason = reason
+        self.pipeline_silent = pipeline_silent
         super().__init__(reason)
 
 
@@ -143,7 +224,7 @@ class ConnectionMetrics:
     """Cumulative + point-in-time diagnostics. Reset on integration reload."""
 
     state: ConnectionState = ConnectionState.DISCONNECTED
-    state_since: float = field(default_factory=time.time)
+    state_since: float = 0.0
 
     # Lifetime counters (since manager creation)
     connect_attempts: int = 0
@@ -157,6 +238,8 @@ class ConnectionMetrics:
     graceful_closes: int = 0
     reuse_hits: int = 0
     backoff_entries: int = 0
+    pipeline_fallbacks: int = 0
+    priority_yields: int = 0
 
     # Streak / current
     consecutive_failures: int = 0
@@ -171,14 +254,30 @@ class ConnectionMetrics:
     last_success_at: float = 0.0
     last_failure_at: float = 0.0
 
+    # Per-command, per-phase latency histograms (not a flat metric)
+    latency: LatencyTracker = field(default_factory=LatencyTracker, repr=False, compare=False)
+
+
+# Flat metrics copied into metrics_snapshot(), looked up once rather than per call
+_METRIC_FIELDS = tuple(f.name for f in fields(ConnectionMetrics) if f.name != "latency")
+_metric_values = attrgetter(*_METRIC_FIELDS)
+
+
+def _ms(seconds: float) -> float:
+    """Return ``seconds`` as milliseconds rounded for display."""
+    return round(seconds * 1000, 1)
+
 
 class ConnectionManager:
-    """Owns the single telnetlib3 connection to one Elios4you device."""
+    """Owns the single TCP connection to one Elios4you device."""
 
     # Defaults tuned for the Elios4You's fragile TCP stack and a 60 s scan
     # interval. See module docstring for rationale.
     DEFAULT_CONNECT_TIMEOUT: float = 5.0
     DEFAULT_READ_TIMEOUT: float = 5.0
+    DEFAULT_CONNECT_TIMEOUT_FLOOR: float = 1.0
+    DEFAULT_READ_TIMEOUT_FLOOR: float = 1.0
+    DEFAULT_ADAPTIVE_TIMEOUTS: bool = True
     DEFAULT_CLOSE_TIMEOUT: float = 2.0
     DEFAULT_REUSE_WINDOW: float = 90.0
     DEFAULT_MAX_RETRIES: int = 1
@@ -186,11 +285,14 @@ class ConnectionManager:
     DEFAULT_BACKOFF_THRESHOLD: int = 3
     DEFAULT_BACKOFF_INITIAL: float = 5.0
     DEFAULT_BACKOFF_MAX: float = 60.0
+    DEFAULT_PIPELINING: bool = True
+    DEFAULT_PIPELINE_STRIKES: int = 3
+    DEFAULT_PIPELINE_REPROBE: float = 3600.0
+    DEFAULT_TRANSPORT: TransportBackend = TransportBackend.RAW
+    DEFAULT_TRACE_SIZE: int = 256
 
-    # telnetlib3 negotiation timings — Elios4You doesn't really negotiate, so
-    # keep these short to avoid adding latency to every connect.
-    CONNECT_MINWAIT: float = 0.1
-    CONNECT_MAXWAIT: float = 0.5
+    # Largest chunk pulled from the transport per read.
+    READ_CHUNK_SIZE: int = 4096
 
     def __init__(
         self,
@@ -199,6 +301,9 @@ class ConnectionManager:
         *,
         connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
         read_timeout: float = DEFAULT_READ_TIMEOUT,
+        connect_timeout_floor: float = DEFAULT_CONNECT_TIMEOUT_FLOOR,
+        read_timeout_floor: float = DEFAULT_READ_TIMEOUT_FLOOR,
+        adaptive_timeouts: bool = DEFAULT_ADAPTIVE_TIMEOUTS,
         close_timeout: float = DEFAULT_CLOSE_TIMEOUT,
         reuse_window: float = DEFAULT_REUSE_WINDOW,
         max_retries: int = DEFAULT_MAX_RETRIES,
@@ -206,12 +311,31 @@ class ConnectionManager:
         backoff_threshold: int = DEFAULT_BACKOFF_THRESHOLD,
         backoff_initial: float = DEFAULT_BACKOFF_INITIAL,
         backoff_max: float = DEFAULT_BACKOFF_MAX,
+        pipelining: bool = DEFAULT_PIPELINING,
+        pipeline_strikes: int = DEFAULT_PIPELINE_STRIKES,
+        pipeline_reprobe: float = DEFAULT_PIPELINE_REPROBE,
+        transport: TransportBackend = DEFAULT_TRANSPORT,
+        clock: Clock = SYSTEM_CLOCK,
+        trace_size: int = DEFAULT_TRACE_SIZE,
     ) -> None:
-        """Initialize the manager (does not open the connection)."""
+        """Initialize the manager (does not open the connection).
+
+        ``connect_timeout`` and ``read_timeout`` are the ceilings of the
+        adaptive timeouts; with ``adaptive_timeouts=False`` they are used as
+        fixed timeouts. ``clock`` is the time source for every timestamp,
+        window, deadline and retry delay (see ``clock.py``). ``trace_size``
+        is the number of events kept in the exchange trace (0 disables it).
+        """
+        self._clock = clock
         self._host = host
         self._port = port
         self._connect_timeout = connect_timeout
         self._read_timeout = read_timeout
+        self._read_timeout_floor = read_timeout_floor
+        self._adaptive_timeouts = adaptive_timeouts
+        self._connect_rtt = RttEstimator(connect_timeout_floor, connect_timeout)
+        # One estimator per command label, created on first use.
+        self._read_rtt: dict[str, RttEstimator] = {}
         self._close_timeout = close_timeout
         self._reuse_window = reuse_window
         self._max_retries = max_retries
@@ -219,17 +343,25 @@ class ConnectionManager:
         self._backoff_threshold = backoff_threshold
         self._backoff_initial = backoff_initial
         self._backoff_max = backoff_max
-
-        # We pass ``encoding="utf-8"`` to ``open_connection`` so the runtime
-        # types are the Unicode variants (str-based). ``open_connection`` is
-        # typed to return the byte-based base classes, so we cast at the
-        # assignment site (see ``_ensure_connected``).
-        self._reader: telnetlib3.TelnetReaderUnicode | None = None
-        self._writer: telnetlib3.TelnetWriterUnicode | None = None
+        # Cleared after pipeline_strikes consecutive pipelined batches had to
+        # be answered sequentially; set again pipeline_reprobe seconds later.
+        self._pipelining_enabled = pipelining
+        self._pipelining = pipelining
+        self._pipeline_strikes_max = pipeline_strikes
+        self._pipeline_reprobe = pipeline_reprobe
+        self._pipeline_strikes = 0
+        self._pipelining_off_at = 0.0
+        self._backend = TransportBackend(transport)
+
+        self._transport: DeviceTransport | None = None
         self._last_activity: float = 0.0
 
-        self._lock = asyncio.Lock()
-        self._metrics = ConnectionMetrics()
+        self._scheduler = CommandScheduler()
+        self._trace = ExchangeTrace(trace_size)
+        self._metrics = ConnectionMetrics(state_since=clock.time())
+        # Latency percentiles of metrics_snapshot(), cached by sample count
+        self._latency_view_samples = -1
+        self._latency_view_cache: dict[str, float] = {}
 
         log_debug(
             _LOGGER,
@@ -240,6 +372,9 @@ class ConnectionManager:
             reuse_window=reuse_window,
             max_retries=max_retries,
             backoff_threshold=backoff_threshold,
+            pipelining=pipelining,
+            transport=self._backend.value,
+            adaptive_timeouts=adaptive_timeouts,
         )
 
     # ------------------------------------------------------------------ #
@@ -256,26 +391,91 @@ class ConnectionManager:
         """Return a live reference to the metrics dataclass."""
         return self._metrics
 
+    @property
+    def pipelining(self) -> bool:
+        """Return True while batched commands are still pipelined."""
+        return self._pipelining
+
     def metrics_snapshot(self) -> dict[str, int | float | str]:
         """Return a dict suitable for exposing as diagnostic sensors.
 
         Timestamps are converted to seconds-since (float) so they're easy to
         render. Use ``backoff_seconds_remaining`` for the UI rather than the
-        raw deadline.
+        raw deadline. Latency percentiles are in milliseconds: ``connect_*``
+        for opening the socket, ``ttfb_*`` and ``response_*`` from the end of
+        the write to the first byte and to the separator, over all commands.
         """
-        now = time.time()
-        m = asdict(self._metrics)
+        now = self._clock.time()
+        m: dict[str, int | float | str] = dict(
+            zip(_METRIC_FIELDS, _metric_values(self._metrics), strict=True)
+        )
         # Replace enum with its value
         m["state"] = self._metrics.state.value
         m["backoff_seconds_remaining"] = max(0.0, round(self._metrics.backoff_until - now, 1))
         m["state_age_seconds"] = round(now - self._metrics.state_since, 1)
+        m.update(self._latency_view())
+
+        m["connect_timeout_seconds"] = round(self._current_connect_timeout(), 2)
+        m["read_timeout_seconds"] = round(
+            max(
+                (self._current_read_timeout(label) for label in self._read_rtt),
+                default=self._read_timeout,
+            ),
+            2,
+        )
         return m
 
-    async def execute(self, cmd: str) -> str:
+    def _latency_view(self) -> dict[str, float]:
+        """Return the latency percentiles of ``metrics_snapshot()``.
+
+        Walking the histograms is the costly part of a snapshot, so the
+        percentiles are only recomputed once new samples were recorded.
+        """
+        latency = self._metrics.latency
+        ttfb = latency.histogram(ALL_COMMANDS, LatencyPhase.TTFB)
+        response = latency.histogram(ALL_COMMANDS, LatencyPhase.SEPARATOR)
+        samples = latency.connect.count + ttfb.count + response.count
+        if samples != self._latency_view_samples:
+            self._latency_view_samples = samples
+            self._latency_view_cache = {
+                "connect_p95_ms": _ms(latency.connect.percentile(95)),
+                "ttfb_p95_ms": _ms(ttfb.percentile(95)),
+                **{f"response_p{pct}_ms": _ms(response.percentile(pct)) for pct in (50, 95, 99)},
+            }
+        return self._latency_view_cache
+
+    def latency_snapshot(self) -> dict[str, dict[str, dict[str, float | int]]]:
+        """Return every non-empty latency histogram summary, keyed phase → command."""
+        return self._metrics.latency.snapshot()
+
+    def trace_snapshot(self) -> dict[str, Any]:
+        """Return the exchange trace and the settings needed to replay it."""
+        return {
+            "settings": {
+                "max_retries": self._max_retries,
+                "retry_delay": self._retry_delay,
+                "reuse_window": self._reuse_window,
+                "backoff_threshold": self._backoff_threshold,
+                "backoff_initial": self._backoff_initial,
+                "backoff_max": self._backoff_max,
+            },
+            **self._trace.snapshot(),
+        }
+
+    async def execute(
+        self,
+        cmd: str,
+        *,
+        parser: ResponseParser | None = None,
+        priority: CommandPriority = CommandPriority.POLL,
+    ) -> str:
         """Send a command and return the raw response string.
 
         The returned string is guaranteed to contain the response separator
         (``"ready..."``); callers can split on lines and parse from there.
+        If ``parser`` is given it is fed the response while it is read and is
+        ``complete`` on return. ``priority`` decides the order in which queued
+        commands get the device.
 
         Raises:
             ConnectionUnavailableError: manager is in BACKOFF or CLOSED.
@@ -283,22 +483,64 @@ class ConnectionManager:
             TelnetCommandError: command failed after all retries.
 
         """
-        async with self._lock:
+        return (
+            await self.execute_batch(
+                [cmd],
+                parsers=None if parser is None else [parser],
+                priority=priority,
+            )
+        )[0]
+
+    async def execute_batch(
+        self,
+        cmds: Sequence[str],
+        *,
+        parsers: Sequence[ResponseParser] | None = None,
+        priority: CommandPriority = CommandPriority.POLL,
+    ) -> list[str]:
+        """Send several commands in one scheduler slot and return their raw responses.
+
+        While pipelining is enabled, all commands go out in a single write and
+        the replies are split on the response separator as they arrive. A
+        retry only re-sends the commands that have not been answered yet.
+
+        Responses are returned in the same order as ``cmds``. ``parsers``, if
+        given, holds one parser per command; each is reset whenever its
+        response is (re-)read and fed the response bytes as they arrive.
+
+        Raises:
+            ConnectionUnavailableError: manager is in BACKOFF or CLOSED.
+            TelnetConnectionError: cannot open the connection after retries.
+            TelnetCommandError: a command failed after all retries.
+
+        When the retries are exhausted, the raised error's ``replies`` hold
+        the responses of the commands answered before the failing one.
+
+        """
+        if not cmds:
+            return []
+
+        async with self._scheduler.slot(priority) as slot:
+            self._traced(TraceKind.EXECUTE, "+".join(cmds), detail=self._trace_context())
             self._enforce_availability()
 
-            self._metrics.commands_sent += 1
-            self._metrics.last_command = cmd
+            self._metrics.commands_sent += len(cmds)
+            self._metrics.last_command = "+".join(cmds)
 
             log_debug(
                 _LOGGER,
                 f"{LOG_PREFIX}.execute",
                 "Command requested",
-                cmd=cmd,
+                cmd=self._metrics.last_command,
                 state=self._metrics.state.value,
                 attempts=self._max_retries + 1,
+                priority=priority.name,
             )
 
+            replies: list[str] = []
             last_reason = "unknown"
+            # Cleared for the retries once a pipelined write got no reply at all
+            pipelined = True
             # If the final failure was a connect-level problem, re-raise the
             # original TelnetConnectionError so the coordinator categorises it
             # correctly (device_unreachable vs device_not_responding). Cleared
@@ -307,15 +549,24 @@ class ConnectionManager:
 
             for attempt in range(self._max_retries + 1):
                 try:
-                    raw = await self._attempt(cmd)
+                    await self._attempt(
+                        cmds[len(replies) :],
+                        replies,
+                        None if parsers is None else parsers[len(replies) :],
+                        pipelined=pipelined,
+                    )
                 except _RetryableError as err:
                     last_reason = err.reason
                     last_connect_err = None
+                    if err.pipeline_silent:
+                        # The device may not take pipelined commands at all:
+                        # retry them one at a time.
+                        pipelined = False
                     log_debug(
                         _LOGGER,
                         f"{LOG_PREFIX}.execute",
                         "Attempt failed (retryable)",
-                        cmd=cmd,
+                        cmd=cmds[len(replies)],
                         attempt=attempt + 1,
                         max_attempts=self._max_retries + 1,
                         reason=err.reason,
@@ -327,26 +578,42 @@ class ConnectionManager:
                         _LOGGER,
                         f"{LOG_PREFIX}.execute",
                         "Attempt failed (connect)",
-                        cmd=cmd,
+                        cmd=cmds[len(replies)],
                         attempt=attempt + 1,
                         max_attempts=self._max_retries + 1,
                         reason=last_reason,
                     )
                 else:
+                    if not pipelined and self._pipelining:
+                        # Answered one at a time what went unanswered pipelined.
+                        self._pipeline_strike(
+                            "Device ignored pipelined commands, answered sequentially",
+                            answered=0,
+                            pending=len(cmds),
+                        )
                     self._record_success()
-                    return raw
+                    self._traced(TraceKind.RESULT, detail="ok")
+                    return replies
 
                 if attempt < self._max_retries:
                     self._metrics.commands_retried += 1
-                    await asyncio.sleep(self._retry_delay)
+                    await self._clock.sleep(self._retry_delay)
+                    # The failed socket is already closed, so nothing is in
+                    # flight: let a more urgent command (e.g. a relay write)
+                    # go first instead of making it wait out our retries.
+                    if await slot.yield_to_higher():
+                        self._metrics.priority_yields += 1
+                        self._enforce_availability()
 
             # All attempts exhausted
+            failed_cmd = cmds[len(replies)]
             self._record_failure(last_reason)
+            self._traced(TraceKind.RESULT, failed_cmd, detail=f"failed: {last_reason}")
             log_warning(
                 _LOGGER,
                 f"{LOG_PREFIX}.execute",
                 "Command failed after retries",
-                cmd=cmd,
+                cmd=failed_cmd,
                 attempts=self._max_retries + 1,
                 reason=last_reason,
                 consecutive_failures=self._metrics.consecutive_failures,
@@ -354,13 +621,47 @@ class ConnectionManager:
             if last_connect_err is not None:
                 # Connect-level failure: surface as TelnetConnectionError. Don't
                 # bump commands_failed — connect failures live in their own counter.
+                last_connect_err.replies = tuple(replies)
                 raise last_connect_err
             self._metrics.commands_failed += 1
-            raise TelnetCommandError(cmd, last_reason)
+            err = TelnetCommandError(failed_cmd, last_reason)
+            err.replies = tuple(replies)
+            raise err
+
+    def cancel_queued(
+        self,
+        *,
+        min_priority: CommandPriority = CommandPriority.INTERACTIVE,
+        reason: str = "cancelled while queued",
+    ) -> int:
+        """Reject queued commands at ``min_priority`` or less urgent.
+
+        The command currently talking to the device is not interrupted.
+        Rejected callers get ``ConnectionUnavailableError(reason)``. Returns
+        how many were rejected.
+        """
+        cancelled = self._scheduler.cancel_queued(
+            lambda: ConnectionUnavailableError(reason), min_priority=min_priority
+        )
+        if cancelled:
+            log_debug(
+                _LOGGER,
+                f"{LOG_PREFIX}.cancel_queued",
+                "Queued commands cancelled",
+                count=cancelled,
+                min_priority=min_priority.name,
+                reason=reason,
+            )
+        return cancelled
 
     async def close(self) -> None:
-        """Permanently close the connection (called on integration unload)."""
-        async with self._lock:
+        """Permanently close the connection (called on integration unload).
+
+        Commands still waiting for the device are rejected right away; the
+        one in flight (if any) is allowed to finish first.
+        """
+        self.cancel_queued(reason="manager closed")
+        async with self._scheduler.slot(CommandPriority.INTERACTIVE):
             log_debug(
                 _LOGGER,
                 f"{LOG_PREFIX}.close",
@@ -380,7 +681,8 @@ class ConnectionManager:
         if old == new_state:
             return
         self._metrics.state = new_state
-        self._metrics.state_since = time.time()
+        self._metrics.state_since = self._clock.time()
+        self._traced(TraceKind.TRANSITION, new_state.value, detail=f"{old.value}: {reason}")
         log_debug(
             _LOGGER,
             f"{LOG_PREFIX}.transition",
@@ -393,10 +695,11 @@ class ConnectionManager:
     def _enforce_availability(self) -> None:
         """Raise if the manager is currently refusing requests."""
         if self._metrics.state is ConnectionState.CLOSED:
+            self._traced(TraceKind.RESULT, detail="refused: manager closed")
             raise ConnectionUnavailableError("manager closed")
 
         if self._metrics.state is ConnectionState.BACKOFF:
-            remaining = self._metrics.backoff_until - time.time()
+            remaining = self._metrics.backoff_until - self._clock.time()
             if remaining > 0:
                 log_debug(
                     _LOGGER,
@@ -405,6 +708,7 @@ class ConnectionManager:
                     remaining_seconds=round(remaining, 1),
                     consecutive_failures=self._metrics.consecutive_failures,
                 )
+                self._traced(TraceKind.RESULT, detail="refused: in backoff")
                 raise ConnectionUnavailableError(
                     f"in backoff ({remaining:.1f}s remaining)",
                     retry_after=remaining,
@@ -420,7 +724,7 @@ class ConnectionManager:
 
     def _record_success(self) -> None:
         """Reset failure streak and exit BACKOFF if applicable."""
-        now = time.time()
+        now = self._clock.time()
         self._metrics.last_success_at = now
         if self._metrics.consecutive_failures > 0:
             log_info(
@@ -435,7 +739,7 @@ class ConnectionManager:
 
     def _record_failure(self, reason: str) -> None:
         """Increment failure streak; enter BACKOFF if threshold reached."""
-        now = time.time()
+        now = self._clock.time()
         self._metrics.consecutive_failures += 1
         self._metrics.last_failure_at = now
         self._metrics.last_error = reason
@@ -466,29 +770,145 @@ class ConnectionManager:
     # Internal: one command attempt
     # ------------------------------------------------------------------ #
 
-    async def _attempt(self, cmd: str) -> str:
-        """One full attempt: ensure connected, send, read response.
-
-        Returns the raw response on success. Raises ``_RetryableError`` on
-        recoverable failures (silent timeout, transport error mid-command)
-        or ``TelnetConnectionError`` on a hard connect failure.
+    async def _attempt(
+        self,
+        cmds: Sequence[str],
+        replies: list[str],
+        parsers: Sequence[ResponseParser] | None,
+        *,
+        pipelined: bool = True,
+    ) -> None:
+        """One full attempt: ensure connected, send, read the responses.
+
+        Each response is appended to ``replies`` as soon as it is complete, so
+        a later retry only has to re-send what is still unanswered. With
+        ``pipelined`` False the commands are sent one at a time. Raises
+        ``_RetryableError`` on recoverable failures (silent timeout, transport
+        error mid-command) or ``TelnetConnectionError`` on a hard connect
+        failure.
         """
         await self._ensure_connected()
 
+        pending = cmds
+        if pipelined and self._pipelining_active() and len(pending) > 1:
+            received = await self._exchange_pipelined(pending, replies, parsers)
+            if received == len(pending):
+                self._pipeline_strikes = 0
+                return
+            # The reply that never completed timed out (or hit EOF).
+            self._rtt_for(LatencyTracker.label(pending[received])).backoff()
+            if received == 0:
+                # Nothing came back at all: either a plain silent timeout or a
+                # device ignoring pipelined commands; the retry tells them apart.
+                self._metrics.silent_timeouts += 1
+                await self._close_safely(force_abort=True)
+                raise _RetryableError("silent_timeout", pipeline_silent=True)
+
+            # The device answered the head of the pipeline and then stalled.
+            self._pipeline_strike(
+                "Device stalled mid-pipeline, replaying sequentially",
+                answered=received,
+                pending=len(pending) - received,
+            )
+            await self._close_safely(force_abort=True)
+            await self._ensure_connected()
+            pending = pending[received:]
+            if parsers is not None:
+                parsers = parsers[received:]
+
+        for i, cmd in enumerate(pending):
+            parser = None if parsers is None else parsers[i]
+            # Append one by one so answered commands survive a later failure.
+            replies.append(await self._exchange(cmd, parser))
+
+    def _pipelining_active(self) -> bool:
+        """Return True if batches are pipelined, re-probing once the cool-down is over."""
+        if (
+            not self._pipelining
+            and self._pipelining_enabled
+            and self._clock.time() - self._pipelining_off_at >= self._pipeline_reprobe
+        ):
+            self._pipelining = True
+            # On probation: the next strike switches it off again
+            self._pipeline_strikes = self._pipeline_strikes_max - 1
+            log_info(_LOGGER, f"{LOG_PREFIX}._attempt", "Re-probing pipelined commands")
+        return self._pipelining
+
+    def _pipeline_strike(self, message: str, **kwargs: Any) -> None:
+        """Count a pipelined batch that had to be answered sequentially.
+
+        After ``pipeline_strikes`` consecutive ones, pipelining is switched
+        off until the re-probe.
+        """
+        self._pipeline_strikes += 1
+        if self._pipeline_strikes < self._pipeline_strikes_max:
+            log_debug(
+                _LOGGER,
+                f"{LOG_PREFIX}._attempt",
+                message,
+                strikes=self._pipeline_strikes,
+                **kwargs,
+            )
+            return
+        self._pipelining = False
+        self._pipelining_off_at = self._clock.time()
+        self._metrics.pipeline_fallbacks += 1
+        log_warning(
+            _LOGGER,
+            f"{LOG_PREFIX}._attempt",
+            f"{message}, falling back to sequential commands",
+            strikes=self._pipeline_strikes,
+            reprobe_seconds=self._pipeline_reprobe,
+            **kwargs,
+        )
+
+    async def _exchange(self, cmd: str, parser: ResponseParser | None = None) -> str:
+        """Send one command on the open connection and return its response."""
         try:
-            raw = await self._send_raw(cmd)
+            raw = await self._send_raw(cmd, parser)
         except (TimeoutError, OSError) as err:
+            self._traced(TraceKind.RECV, cmd, detail=f"error: {err}")
             await self._close_safely(force_abort=True)
             raise _RetryableError(f"transport_error: {err}") from err
 
-        if not raw or RESPONSE_SEPARATOR not in raw:
+        complete = RESPONSE_SEPARATOR in raw
+        self._traced(TraceKind.RECV, cmd, raw, RECV_OK if complete else RECV_SILENT)
+        if not complete:
+            self._rtt_for(LatencyTracker.label(cmd)).backoff()
             self._metrics.silent_timeouts += 1
             await self._close_safely(force_abort=True)
             raise _RetryableError("silent_timeout")
 
-        self._last_activity = time.time()
+        self._last_activity = self._clock.time()
         return raw
 
+    async def _exchange_pipelined(
+        self,
+        cmds: Sequence[str],
+        replies: list[str],
+        parsers: Sequence[ResponseParser] | None = None,
+    ) -> int:
+        """Write every command at once and collect as many responses as arrive.
+
+        Returns the number of responses appended to ``replies``; anything
+        short of ``len(cmds)`` means the read timed out or hit EOF.
+        """
+        before = len(replies)
+        try:
+            received = await self._send_pipelined(cmds, replies, parsers)
+        except (TimeoutError, OSError) as err:
+            received = self._trace_replies(cmds, replies, before)
+            self._traced(TraceKind.RECV, cmds[received], detail=f"error: {err}")
+            await self._close_safely(force_abort=True)
+            raise _RetryableError(f"transport_error: {err}") from err
+
+        self._trace_replies(cmds, replies, before)
+        if received < len(cmds):
+            self._traced(TraceKind.RECV, cmds[received], detail=RECV_SILENT)
+        if received:
+            self._last_activity = self._clock.time()
+        return received
+
     # ------------------------------------------------------------------ #
     # Internal: connection lifecycle
     # ------------------------------------------------------------------ #
@@ -497,7 +917,7 @@ class ConnectionManager:
         """Open the connection if needed, or reuse a fresh one."""
         if self._can_reuse():
             self._metrics.reuse_hits += 1
-            age = time.time() - self._last_activity
+            age = self._clock.time() - self._last_activity
             log_debug(
                 _LOGGER,
                 f"{LOG_PREFIX}._ensure_connected",
@@ -508,39 +928,33 @@ class ConnectionManager:
             return
 
         # Drop any stale connection without ceremony before opening anew.
-        if self._writer is not None:
+        if self._transport is not None:
             await self._close_safely(force_abort=True)
 
         self._transition(ConnectionState.CONNECTING, reason="open_new")
         self._metrics.connect_attempts += 1
+        timeout = self._current_connect_timeout()
         log_debug(
             _LOGGER,
             f"{LOG_PREFIX}._ensure_connected",
             "Opening new connection",
             host=self._host,
             port=self._port,
-            timeout=self._connect_timeout,
+            timeout=round(timeout, 2),
+            transport=self._backend.value,
         )
 
+        started = self._clock.monotonic()
         try:
-            reader, writer = await asyncio.wait_for(
-                telnetlib3.open_connection(
-                    host=self._host,
-                    port=self._port,
-                    encoding="utf-8",
-                    encoding_errors="replace",
-                    connect_minwait=self.CONNECT_MINWAIT,
-                    connect_maxwait=self.CONNECT_MAXWAIT,
-                ),
-                timeout=self._connect_timeout,
+            self._transport = await asyncio.wait_for(
+                open_transport(self._backend, self._host, self._port),
+                timeout=timeout,
             )
-            # encoding="utf-8" guarantees the Unicode variants at runtime
-            self._reader = cast(telnetlib3.TelnetReaderUnicode, reader)
-            self._writer = cast(telnetlib3.TelnetWriterUnicode, writer)
         except (TimeoutError, OSError) as err:
+            if isinstance(err, TimeoutError):
+                self._connect_rtt.backoff()
             self._metrics.connect_failures += 1
-            self._writer = None
-            self._reader = None
+            self._transport = None
             self._transition(ConnectionState.DISCONNECTED, reason=f"connect_failed: {err}")
             log_warning(
                 _LOGGER,
@@ -550,14 +964,22 @@ class ConnectionManager:
                 port=self._port,
                 error=str(err),
             )
+            self._traced(
+                TraceKind.CONNECT_FAILED,
+                detail="timeout" if isinstance(err, TimeoutError) else f"error: {err}",
+            )
             raise TelnetConnectionError(
                 self._host,
                 self._port,
-                self._connect_timeout,
+                timeout,
                 f"Connection failed: {err}",
             ) from err
 
-        now = time.time()
+        elapsed = self._clock.monotonic() - started
+        self._traced(TraceKind.CONNECT)
+        self._metrics.latency.connect.record(elapsed)
+        self._connect_rtt.sample(elapsed)
+        now = self._clock.time()
         self._last_activity = now
         self._metrics.connects_succeeded += 1
         self._metrics.last_connect_at = now
@@ -572,18 +994,10 @@ class ConnectionManager:
 
     def _can_reuse(self) -> bool:
         """Return True if the current connection is healthy and within the reuse window."""
-        if self._writer is None:
-            return False
-        try:
-            if hasattr(self._writer, "is_closing") and self._writer.is_closing():
-                return False
-            transport = self._writer.get_extra_info("transport")
-            if transport is not None and transport.is_closing():
-                return False
-        except (AttributeError, OSError):
+        if self._transport is None or self._transport.is_closing():
             return False
 
-        age = time.time() - self._last_activity
+        age = self._clock.time() - self._last_activity
         if age > self._reuse_window:
             log_debug(
                 _LOGGER,
@@ -599,43 +1013,35 @@ class ConnectionManager:
         """Close the connection. RST on error paths, FIN on graceful unload.
 
         ``force_abort=True`` calls ``transport.abort()`` which sends a TCP
-        RST immediately — critical on the Elios4You because graceful FIN
+        RST immediately (the raw backend sets ``SO_LINGER=0`` first) — critical on the Elios4You because graceful FIN
         leaves the device's socket slot in CLOSE_WAIT for its (long) idle
         timeout, eventually exhausting the socket table.
 
-        ``wait_closed()`` is always bounded by ``self._close_timeout`` so a
+        The graceful close is always bounded by ``self._close_timeout`` so a
         misbehaving device can never hang the integration.
         """
-        if self._writer is None:
+        if self._transport is None:
             return
 
-        writer = self._writer
+        transport = self._transport
         was_state = self._metrics.state
         try:
             if force_abort:
                 self._metrics.forced_aborts += 1
-                transport = None
-                with suppress(AttributeError, OSError):
-                    transport = writer.get_extra_info("transport")
-                if transport is not None:
-                    with suppress(Exception):
-                        transport.abort()
-                    log_debug(
-                        _LOGGER,
-                        f"{LOG_PREFIX}._close_safely",
-                        "Connection aborted (RST sent)",
-                        previous_state=was_state.value,
-                    )
-                else:
-                    # No transport to abort — fall back to writer.close().
-                    with suppress(Exception):
-                        writer.close()
+                self._traced(TraceKind.ABORT)
+                with suppress(Exception):
+                    transport.abort()
+                log_debug(
+                    _LOGGER,
+                    f"{LOG_PREFIX}._close_safely",
+                    "Connection aborted (RST sent)",
+                    previous_state=was_state.value,
+                )
             else:
                 self._metrics.graceful_closes += 1
+                self._traced(TraceKind.CLOSE)
                 with suppress(Exception):
-                    writer.close()
-                with suppress(Exception):
-                    await asyncio.wait_for(writer.wait_closed(), timeout=self._close_timeout)
+                    await transport.close(self._close_timeout)
                 log_debug(
                     _LOGGER,
                     f"{LOG_PREFIX}._close_safely",
@@ -643,20 +1049,71 @@ class ConnectionManager:
                     previous_state=was_state.value,
                 )
         finally:
-            self._writer = None
-            self._reader = None
+            self._transport = None
             self._last_activity = 0.0
-            self._metrics.last_disconnect_at = time.time()
+            self._metrics.last_disconnect_at = self._clock.time()
             if self._metrics.state not in (ConnectionState.BACKOFF, ConnectionState.CLOSED):
                 self._transition(ConnectionState.DISCONNECTED, reason="close")
 
+    # ------------------------------------------------------------------ #
+    # Internal: exchange trace
+    # ------------------------------------------------------------------ #
+
+    def _traced(self, kind: TraceKind, command: str = "", data: str = "", detail: str = "") -> None:
+        """Record one event in the exchange trace."""
+        self._trace.record(self._clock.time(), kind, command, data, detail)
+
+    def _trace_context(self) -> str:
+        """Describe the state an ``execute`` starts from, for replaying the trace."""
+        m = self._metrics
+        context = (
+            f"state={m.state.value} failures={m.consecutive_failures} "
+            f"pipelining={int(self._pipelining)}"
+        )
+        if m.state is ConnectionState.BACKOFF:
+            context += f" backoff_until={m.backoff_until:.3f}"
+        if self._transport is not None and not self._transport.is_closing():
+            context += f" idle={self._clock.time() - self._last_activity:.3f}"
+        return context
+
+    def _trace_replies(self, cmds: Sequence[str], replies: list[str], before: int) -> int:
+        """Trace the pipelined replies appended since ``before``; return their count."""
+        received = len(replies) - before
+        for cmd, reply in zip(cmds, replies[before:], strict=False):
+            self._traced(TraceKind.RECV, cmd, reply, RECV_OK)
+        return received
+
+    # ------------------------------------------------------------------ #
+    # Internal: adaptive timeouts
+    # ------------------------------------------------------------------ #
+
+    def _rtt_for(self, label: str) -> RttEstimator:
+        """Return the round-trip estimator for command ``label``."""
+        estimator = self._read_rtt.get(label)
+        if estimator is None:
+            estimator = RttEstimator(self._read_timeout_floor, self._read_timeout)
+            self._read_rtt[label] = estimator
+        return estimator
+
+    def _current_read_timeout(self, label: str) -> float:
+        """Return the read timeout for command ``label``."""
+        if not self._adaptive_timeouts:
+            return self._read_timeout
+        return self._rtt_for(label).timeout
+
+    def _current_connect_timeout(self) -> float:
+        """Return the connect timeout."""
+        if not self._adaptive_timeouts:
+            return self._connect_timeout
+        return self._connect_rtt.timeout
+
     # ------------------------------------------------------------------ #
     # Internal: framed send / receive
     # ------------------------------------------------------------------ #
 
-    async def _send_raw(self, cmd: str) -> str:
+    async def _send_raw(self, cmd: str, parser: ResponseParser | None = None) -> str:
         """Write the command and read until the response separator."""
-        assert self._writer is not None  # noqa: S101  # ensured by caller
+        assert self._transport is not None  # noqa: S101  # ensured by caller
 
         log_debug(
             _LOGGER,
@@ -664,10 +1121,21 @@ class ConnectionManager:
             "Writing command",
             cmd=cmd,
         )
-        self._writer.write(cmd.lower() + "\n")
-        await self._writer.drain()
-
-        response = await self._read_until(RESPONSE_SEPARATOR, self._read_timeout)
+        label = LatencyTracker.label(cmd)
+        line = f"{cmd.lower()}\n"
+        self._traced(TraceKind.SEND, cmd, line)
+        started = self._clock.monotonic()
+        self._transport.write(line.encode())
+        await self._transport.drain()
+        self._metrics.latency.record(label, LatencyPhase.WRITE, self._clock.monotonic() - started)
+
+        response = str(
+            await self._read_until(
+                _SEPARATOR_BYTES, self._current_read_timeout(label), parser, label=label
+            ),
+            "utf-8",
+            "replace",
+        )
         log_debug(
             _LOGGER,
             f"{LOG_PREFIX}._send_raw",
@@ -678,27 +1146,196 @@ class ConnectionManager:
         )
         return response
 
-    async def _read_until(self, separator: str, timeout: float) -> str:
-        """Read chunks until ``separator`` is in the buffer or timeout/EOF."""
-        assert self._reader is not None  # noqa: S101  # ensured by caller
+    async def _read_until(
+        self,
+        separator: bytes,
+        timeout: float,
+        parser: ResponseParser | None = None,
+        *,
+        label: str | None = None,
+    ) -> memoryview:
+        """Read chunks until ``separator`` is in the buffer or timeout/EOF.
+
+        Each new chunk is scanned together with the last ``len(separator) - 1``
+        bytes before it, never the whole buffer again, so the read stays
+        linear in the response size. Returns a read-only view over the
+        receive buffer (partial on timeout/EOF) that can be decoded or parsed
+        without another copy.
+
+        ``parser`` is fed every chunk as it arrives and finished as soon as
+        the separator has been found. With a ``label``, the time to the first
+        byte and to the separator are recorded under that command, and the
+        latter also feeds the command's round-trip estimator.
+        """
+        assert self._transport is not None  # noqa: S101  # ensured by caller
+
+        buffer = bytearray()
+        scan_from = 0
+        end_time = self._clock.monotonic() + timeout
+        fed = 0
+        started = self._clock.monotonic()
+        if parser is not None:
+            parser.reset()
+
+        while (idx := buffer.find(separator, scan_from)) < 0:
+            if parser is not None and fed < len(buffer):
+                # No separator yet, so everything buffered belongs to this response.
+                with memoryview(buffer) as view:
+                    parser.feed(view[fed:])
+                fed = len(buffer)
+            scan_from = max(0, len(buffer) - len(separator) + 1)
+            remaining = end_time - self._clock.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                chunk = await asyncio.wait_for(
+                    self._transport.read(self.READ_CHUNK_SIZE),
+                    timeout=remaining,
+                )
+            except TimeoutError:
+                break
+            if not chunk:
+                break  # EOF
+            if label is not None and not buffer:
+                self._metrics.latency.record(
+                    label, LatencyPhase.TTFB, self._clock.monotonic() - started
+                )
+            buffer += chunk
+        else:
+            if label is not None:
+                elapsed = self._clock.monotonic() - started
+                self._metrics.latency.record(label, LatencyPhase.SEPARATOR, elapsed)
+                self._rtt_for(label).sample(elapsed)
+            if parser is not None:
+                with memoryview(buffer) as view:
+                    parser.feed(view[fed : idx + len(separator)])
+                parser.finish()
+
+        return memoryview(buffer).toreadonly()
+
+    async def _send_pipelined(
+        self,
+        cmds: Sequence[str],
+        replies: list[str],
+        parsers: Sequence[ResponseParser] | None = None,
+    ) -> int:
+        """Write all commands in a single write and read their responses in order."""
+        assert self._transport is not None  # noqa: S101  # ensured by caller
+
+        log_debug(
+            _LOGGER,
+            f"{LOG_PREFIX}._send_pipelined",
+            "Writing pipelined commands",
+            cmds="+".join(cmds),
+        )
+        lines = "".join(f"{cmd.lower()}\n" for cmd in cmds)
+        self._traced(TraceKind.SEND, "+".join(cmds), lines)
+        started = self._clock.monotonic()
+        self._transport.write(lines.encode())
+        await self._transport.drain()
+        self._metrics.latency.record(
+            PIPELINE_LABEL, LatencyPhase.WRITE, self._clock.monotonic() - started
+        )
 
-        buffer = ""
-        loop = asyncio.get_event_loop()
-        end_time = loop.time() + timeout
+        labels = [LatencyTracker.label(cmd) for cmd in cmds]
+        received = await self._read_replies(
+            _SEPARATOR_BYTES,
+            len(cmds),
+            # One budget per reply, so the slowest command sets it.
+            max(self._current_read_timeout(label) for label in labels),
+            replies,
+            parsers,
+            labels=labels,
+        )
+        log_debug(
+            _LOGGER,
+            f"{LOG_PREFIX}._send_pipelined",
+            "Responses received",
+            cmds="+".join(cmds),
+            received=received,
+        )
+        return received
 
-        while separator not in buffer:
-            remaining = end_time - loop.time()
+    async def _read_replies(
+        self,
+        separator: bytes,
+        count: int,
+        timeout: float,
+        replies: list[str],
+        parsers: Sequence[ResponseParser] | None = None,
+        *,
+        labels: Sequence[str] | None = None,
+    ) -> int:
+        """Read up to ``count`` separator-terminated responses into ``replies``.
+
+        Each response is cut off at the end of its separator as soon as it is
+        complete; the timeout budget restarts after every response. Returns
+        the number of responses read before timeout/EOF.
+
+        Like ``_read_until``, only the unscanned tail (plus separator overlap)
+        is searched per chunk, and completed responses are decoded straight
+        from a view of the buffer instead of being sliced off its front.
+        ``parsers[i]`` is fed the i-th response as its bytes arrive, and with
+        ``labels`` the i-th response's latencies are recorded under
+        ``labels[i]``, measured from the end of the shared write. Its
+        round-trip sample is measured from the end of the previous response
+        instead, matching the per-response timeout budget.
+        """
+        assert self._transport is not None  # noqa: S101  # ensured by caller
+
+        buffer = bytearray()
+        start = 0  # first byte of the response being assembled
+        fed = 0  # first byte not yet handed to a parser
+        scan_from = 0
+        received = 0
+        end_time = self._clock.monotonic() + timeout
+        started = reply_started = self._clock.monotonic()
+        first_byte_at = 0.0  # arrival of the current response's first byte
+        if parsers is not None:
+            for parser in parsers:
+                parser.reset()
+
+        while received < count:
+            idx = buffer.find(separator, scan_from)
+            if idx >= 0:
+                cut = idx + len(separator)
+                with memoryview(buffer) as view:
+                    if parsers is not None:
+                        parsers[received].feed(view[fed:cut])
+                        parsers[received].finish()
+                    replies.append(str(view[start:cut], "utf-8", "replace"))
+                if labels is not None:
+                    now = self._clock.monotonic()
+                    latency = self._metrics.latency
+                    latency.record(labels[received], LatencyPhase.TTFB, first_byte_at - started)
+                    latency.record(labels[received], LatencyPhase.SEPARATOR, now - started)
+                    self._rtt_for(labels[received]).sample(now - reply_started)
+                    reply_started = now
+                    # Bytes past the cut are the next response's first bytes.
+                    first_byte_at = now if len(buffer) > cut else 0.0
+                start = scan_from = fed = cut
+                received += 1
+                end_time = self._clock.monotonic() + timeout
+                continue
+            if parsers is not None and fed < len(buffer):
+                with memoryview(buffer) as view:
+                    parsers[received].feed(view[fed:])
+                fed = len(buffer)
+            scan_from = max(start, len(buffer) - len(separator) + 1)
+            remaining = end_time - self._clock.monotonic()
             if remaining <= 0:
-                return buffer
+                break
             try:
                 chunk = await asyncio.wait_for(
-                    self._reader.read(1024),
+                    self._transport.read(self.READ_CHUNK_SIZE),
                     timeout=remaining,
                 )
             except TimeoutError:
-                return buffer
+                break
             if not chunk:
-                return buffer  # EOF
+                break  # EOF
+            if len(buffer) == start:
+                first_byte_at = self._clock.monotonic()
             buffer += chunk
 
-        return buffer
+        return received
@@ -27,6 +27,60 @@ MAX_SCAN_INTERVAL = 600
 MIN_PORT = 1
 MAX_PORT = 65535
 CONN_TIMEOUT = 5
+# Refresh tiers: @dat every poll, @sta on its own (slower) cadence, @inf only
+# at startup, after the connection recovered from a failure, or once per TTL.
+CONF_STATUS_INTERVAL = "status_interval"
+DEFAULT_STATUS_INTERVAL = 60
+MIN_STATUS_INTERVAL = 10
+MAX_STATUS_INTERVAL = 3600
+STATIC_INFO_TTL = 3600
+# A tier is due this early, so poll-start jitter never pushes it to the next poll
+TIER_DUE_SLACK = 1.0
+# Connection diagnostics (cm_* sensors) are published on their own channel: at
+# most once per period, and at once when the connection state changes.
+CONF_DIAGNOSTIC_INTERVAL = "diagnostic_interval"
+DEFAULT_DIAGNOSTIC_INTERVAL = 300
+MIN_DIAGNOSTIC_INTERVAL = 10
+MAX_DIAGNOSTIC_INTERVAL = 3600
+# Entities go unavailable once their own value was last read longer ago than
+# its command's refresh period plus this age (0 = whenever a poll fails).
+CONF_MAX_DATA_AGE = "max_data_age"
+DEFAULT_MAX_DATA_AGE = 0
+MIN_MAX_DATA_AGE = 0
+MAX_MAX_DATA_AGE = 3600
+# Adaptive polling: the poll interval drops to ADAPTIVE_FLOOR_RATIO of the scan
+# interval (at least MIN_SCAN_INTERVAL) when a power moves by ADAPTIVE_POWER_RATIO
+# of its value (at least ADAPTIVE_POWER_DELTA kW), and stretches toward
+# ADAPTIVE_MAX_INTERVAL while stable (straight to it at night without production).
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = False
+ADAPTIVE_FLOOR_RATIO = 0.25
+ADAPTIVE_POWER_RATIO = 0.2
+ADAPTIVE_POWER_DELTA = 0.1
+ADAPTIVE_MAX_INTERVAL = 300
+SUN_ENTITY_ID = "sun.sun"
+SUN_BELOW_HORIZON = "below_horizon"
+# Aligned polling: polls fire on wall-clock multiples of the poll interval,
+# shifted by the device's slot of the period (see schedule.PollScheduler).
+CONF_ALIGNED_POLLING = "aligned_polling"
+DEFAULT_ALIGNED_POLLING = False
+# Read cycles running at once across all config entries; more wait their turn
+MAX_CONCURRENT_SESSIONS = 2
+# A relay request is written at once; requests arriving while it is in flight or
+# within this window (seconds) after it are coalesced into one follow-up write of
+# the last requested state.
+CONF_RELAY_WINDOW = "relay_window"
+DEFAULT_RELAY_WINDOW = 0.5
+MIN_RELAY_WINDOW = 0.0
+MAX_RELAY_WINDOW = 5.0
+# A relay request for the state an @rel read-back confirmed at most this many
+# seconds ago is not written again (polled or restored values never count).
+RELAY_CONFIRMED_MAX_AGE = 5.0
+# Last-known device values, persisted so entities come up from them at startup
+# while the first poll runs in the background. Saved at most once per delay.
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 300
 # Retry configuration for transient failures
 COMMAND_RETRY_COUNT: int = 3  # Retry each command up to 3 times
 COMMAND_RETRY_DELAY: float = 0.3  # 300ms delay between retries
@@ -587,4 +641,49 @@ SENSOR_ENTITIES = [
         "unit": None,
         "enabled_default": False,
     },
+    {
+        "name": "Connection Connect Latency p95",
+        "key": "cm_connect_p95_ms",
+        "icon": "mdi:lan-connect",
+        "device_class": None,
+        "state_class": None,
+        "unit": "ms",
+        "enabled_default": False,
+    },
+    {
+        "name": "Connection First Byte Latency p95",
+        "key": "cm_ttfb_p95_ms",
+        "icon": "mdi:timer-sand",
+        "device_class": None,
+        "state_class": None,
+        "unit": "ms",
+        "enabled_default": False,
+    },
+    {
+        "name": "Connection Response Latency p50",
+        "key": "cm_response_p50_ms",
+        "icon": "mdi:timer-outline",
+        "device_class": None,
+        "state_class": None,
+        "unit": "ms",
+        "enabled_default": False,
+    },
+    {
+        "name": "Connection Response Latency p95",
+        "key": "cm_response_p95_ms",
+        "icon": "mdi:timer-outline",
+        "device_class": None,
+        "state_class": None,
+        "unit": "ms",
+        "enabled_default": False,
+    },
+    {
+        "name": "Connection Response Latency p99",
+        "key": "cm_response_p99_ms",
+        "icon": "mdi:timer-alert-outline",
+        "device_class": None,
+        "state_class": None,
+        "unit": "ms",
+        "enabled_default": False,
+    },
 ]
@@ -3,41 +3,75 @@
 https://github.com/alexdelprete/ha-4noks-elios4you
 """
 
+from collections.abc import Callable, Container
 from datetime import UTC, datetime, timedelta
 import logging
 import time
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from .api import Elios4YouAPI, TelnetCommandError, TelnetConnectionError
+from .adaptive import AdaptiveInterval
+from .api import ConnectionUnavailableError, Elios4YouAPI, TelnetCommandError, TelnetConnectionError
 from .const import (
+    ADAPTIVE_FLOOR_RATIO,
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_POWER_DELTA,
+    ADAPTIVE_POWER_RATIO,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ALIGNED_POLLING,
+    CONF_DIAGNOSTIC_INTERVAL,
     CONF_ENABLE_REPAIR_NOTIFICATION,
     CONF_FAILURES_THRESHOLD,
     CONF_HOST,
+    CONF_MAX_DATA_AGE,
     CONF_NAME,
     CONF_PORT,
     CONF_RECOVERY_SCRIPT,
+    CONF_RELAY_WINDOW,
     CONF_SCAN_INTERVAL,
+    CONF_STATUS_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_ALIGNED_POLLING,
+    DEFAULT_DIAGNOSTIC_INTERVAL,
     DEFAULT_ENABLE_REPAIR_NOTIFICATION,
     DEFAULT_FAILURES_THRESHOLD,
+    DEFAULT_MAX_DATA_AGE,
     DEFAULT_RECOVERY_SCRIPT,
+    DEFAULT_RELAY_WINDOW,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
     DOMAIN,
     MIN_SCAN_INTERVAL,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    SUN_BELOW_HORIZON,
+    SUN_ENTITY_ID,
 )
 from .helpers import log_debug, log_info, log_warning
+from .model import DeviceSnapshot
 from .repairs import create_connection_issue, create_recovery_notification, delete_connection_issue
+from .schedule import get_scheduler, next_aligned_delay
 
 _LOGGER = logging.getLogger(__name__)
 
+# Marks a key that has not been published to listeners yet
+_UNPUBLISHED = object()
 
-class Elios4YouCoordinator(DataUpdateCoordinator[bool]):
-    """Class to manage fetching data from the API."""
+
+class Elios4YouCoordinator(DataUpdateCoordinator[DeviceSnapshot]):
+    """Class to manage fetching data from the API.
+
+    ``data`` is the typed, immutable snapshot of the last successful cycle;
+    ``api.data`` remains as its flat dict view.
+    """
 
     config_entry: ConfigEntry
 
@@ -68,10 +102,14 @@ class Elios4YouCoordinator(DataUpdateCoordinator[bool]):
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name=f"{DOMAIN} ({config_entry.unique_id})",
             update_method=self.async_update_data,
             update_interval=update_interval,
         )
+        # Nominal poll interval (adapted with adaptive polling); update_interval
+        # holds the delay until the next poll (see _schedule_refresh)
+        self.poll_interval = update_interval
 
         self.last_update_time = datetime.now(tz=UTC)
         self.last_update_success = True
@@ -79,6 +117,7 @@ class Elios4YouCoordinator(DataUpdateCoordinator[bool]):
         self._repair_issue_created = False
         self._recovery_script_executed = False
         self._entry_id = config_entry.entry_id
+        self._unique_id = config_entry.unique_id
 
         # Device trigger tracking
         self.device_id: str | None = None
@@ -106,12 +145,65 @@ class Elios4YouCoordinator(DataUpdateCoordinator[bool]):
             recovery_script=self._recovery_script,
         )
 
+        # @sta refresh cadence (the @dat tier follows scan_interval)
+        self.status_interval = int(
+            config_entry.options.get(CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL)
+        )
+        # Publish period of the cm_* connection diagnostics
+        self.diagnostic_interval = int(
+            config_entry.options.get(CONF_DIAGNOSTIC_INTERVAL, DEFAULT_DIAGNOSTIC_INTERVAL)
+        )
+        # Grace on top of each command's refresh period before a value goes
+        # stale; 0 keeps entities tied to the outcome of the last poll
+        self.max_data_age = int(config_entry.options.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE))
+        # Window within which relay requests are coalesced into one write
+        self.relay_window = float(config_entry.options.get(CONF_RELAY_WINDOW, DEFAULT_RELAY_WINDOW))
+        # Poll interval following the power dynamics instead of scan_interval
+        self._adaptive: AdaptiveInterval | None = None
+        if config_entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING):
+            self._adaptive = AdaptiveInterval(
+                self.scan_interval,
+                floor=max(self.scan_interval * ADAPTIVE_FLOOR_RATIO, MIN_SCAN_INTERVAL),
+                ceiling=ADAPTIVE_MAX_INTERVAL,
+                power_delta=ADAPTIVE_POWER_DELTA,
+                power_ratio=ADAPTIVE_POWER_RATIO,
+            )
+        # Poll on wall-clock boundaries instead of after the previous refresh
+        self.aligned_polling = bool(
+            config_entry.options.get(CONF_ALIGNED_POLLING, DEFAULT_ALIGNED_POLLING)
+        )
+        # Domain-wide scheduler spreading polls and capping concurrent sessions
+        self._scheduler = get_scheduler(hass)
+        self._poll_key = config_entry.unique_id or config_entry.entry_id
+        self._scheduler.register(self._poll_key)
+        # Set after setup until the next poll ran (see async_schedule_first_refresh)
+        self._first_poll_in_slot = False
+
         self.api = Elios4YouAPI(
             hass,
             self.conf_name,
             self.conf_host,
             self.conf_port,
+            status_interval=self.status_interval,
+            diagnostic_interval=self.diagnostic_interval,
+            relay_window=self.relay_window,
         )
+        # api.data keys whose value is too old to show (see _update_stale_keys)
+        self.stale_keys: frozenset[str] = frozenset()
+        self._update_stale_keys()
+
+        # Last-known device values, restored at startup (see async_restore_snapshot)
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{config_entry.entry_id}"
+        )
+        self._snapshot_save_pending = False
+
+        # The api.data keys whose listeners the current update wakes (None: all),
+        # and the values / availability listeners were last notified of
+        self._woken: Container[str] | None = None
+        self._published: dict[str, Any] = {}
+        self._published_success: bool | None = None
+        self._published_generation = -1
 
         log_debug(_LOGGER, "__init__", "Coordinator config data", data=config_entry.data)
         log_debug(
@@ -121,13 +213,284 @@ class Elios4YouCoordinator(DataUpdateCoordinator[bool]):
             host=self.conf_host,
             port=self.conf_port,
             scan_interval=self.scan_interval,
+            status_interval=self.status_interval,
+            diagnostic_interval=self.diagnostic_interval,
+            max_data_age=self.max_data_age,
+            adaptive_polling=self._adaptive is not None,
+            aligned_polling=self.aligned_polling,
+            relay_window=self.relay_window,
+        )
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates of ``context`` (the api.data key).
+
+        The listener is only run when its key is among the keys being woken;
+        listeners without a context are woken on every update.
+        """
+
+        @callback
+        def _update_if_woken() -> None:
+            if context is None or self._woken is None or context in self._woken:
+                update_callback()
+
+        return super().async_add_listener(_update_if_woken, context)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Wake only the listeners whose api.data key changed since the last update.
+
+        Everything is woken when availability changed (the first update
+        included), as every entity's state depends on it.
+        """
+        data = self.api.data
+        published = self._published
+        if self.last_update_success != self._published_success:
+            self._published_success = self.last_update_success
+            self._published_generation = self.api.generation
+            published.clear()
+            published.update(data)
+            self._wake_listeners(None)
+            return
+
+        changed = self._changed_keys()
+        log_debug(
+            _LOGGER,
+            "async_update_listeners",
+            "Notifying listeners of changed keys",
+            changed=len(changed),
+        )
+        self._wake_listeners(changed)
+
+    def _changed_keys(self) -> frozenset[str]:
+        """Return the api.data keys whose value changed since they were last published."""
+        # Same generation of api.data as last time: nothing to compare
+        if self.api.generation == self._published_generation:
+            return frozenset()
+        self._published_generation = self.api.generation
+        published = self._published
+        changed = [
+            key for key, value in self.api.data.items() if published.get(key, _UNPUBLISHED) != value
+        ]
+        for key in changed:
+            published[key] = self.api.data[key]
+        return frozenset(changed)
+
+    @callback
+    def _wake_listeners(self, keys: Container[str] | None) -> None:
+        """Run the listeners of ``keys`` and those without a key; ``None`` wakes everyone."""
+        self._woken = keys
+        try:
+            super().async_update_listeners()
+        finally:
+            self._woken = None
+
+    def _update_stale_keys(self) -> frozenset[str]:
+        """Recompute ``stale_keys`` and return the keys that went stale or fresh.
+
+        With a ``max_data_age``, a value read by ``@dat`` is stale once it is
+        older than the polling period plus that age, and one read by ``@sta``
+        once older than the status period plus that age. With adaptive
+        polling, the polling period is its ceiling. Values the device has
+        not reported yet are always stale.
+        """
+        max_ages: dict[str, float] = {}
+        if self.max_data_age:
+            poll = self.scan_interval if self._adaptive is None else self._adaptive.ceiling
+            max_ages["@dat"] = poll + self.max_data_age
+            max_ages["@sta"] = max(self.status_interval, poll) + self.max_data_age
+        stale = frozenset(self.api.stale_keys(time.time(), max_ages))
+        flipped = stale ^ self.stale_keys
+        self.stale_keys = stale
+        return flipped
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Wake the listeners of keys that went stale or fresh with this refresh (and unkeyed ones).
+
+        Runs after every refresh, failed ones included: a value can age out
+        while polls keep failing, when listeners are otherwise left alone.
+        A failed poll still publishes the connection metrics, so the
+        listeners of the values it changed are woken too.
+        """
+        woken = self._update_stale_keys()
+        # Home Assistant only notifies listeners of the first failure in a row
+        if not self.last_update_success and self._published_success is False:
+            woken |= self._changed_keys()
+        if woken:
+            self._wake_listeners(woken)
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll; with aligned polling, on the next wall-clock boundary.
+
+        The base class waits ``update_interval`` from the loop clock's whole
+        second, so it is set here to the delay until the next poll (see
+        _next_poll_delay); ``poll_interval`` keeps the nominal interval.
+        """
+        delay = self._next_poll_delay()
+        self.update_interval = (
+            self.poll_interval
+            if delay is None
+            else timedelta(seconds=delay + self.hass.loop.time() % 1)
+        )
+        super()._schedule_refresh()
+
+    def _next_poll_delay(self) -> float | None:
+        """Return the seconds until the next poll, or None for one ``poll_interval`` from now.
+
+        The first scheduled poll lands in this device's slot of the period:
+        counted from now after a restore (nothing polled yet), or in the next
+        period after setup's own first refresh. With aligned polling, polls
+        fire on the wall-clock boundaries of the period shifted by that slot,
+        computed afresh every time so the cycle duration and retries do not
+        accumulate as drift.
+        """
+        interval = self.poll_interval.total_seconds()
+        phase = self._scheduler.phase(self._poll_key, interval)
+        if self._first_poll_in_slot and self.data is None:
+            return phase
+        if self.aligned_polling:
+            return next_aligned_delay(time.time(), interval, phase)
+        if self._first_poll_in_slot:
+            return interval + phase
+        return None
+
+    @callback
+    def async_schedule_first_refresh(self) -> None:
+        """Schedule the first poll after setup in this device's slot of the period.
+
+        It waits until Home Assistant has started, so all entries set up
+        together are registered with the scheduler and do not poll at once.
+        """
+
+        @callback
+        def _schedule(_hass: HomeAssistant) -> None:
+            self._first_poll_in_slot = True
+            self._schedule_refresh()
+
+        self.config_entry.async_on_unload(async_at_started(self.hass, _schedule))
+
+    async def async_shutdown(self) -> None:
+        """Leave the shared scheduler and stop polling."""
+        self._scheduler.unregister(self._poll_key)
+        await super().async_shutdown()
+
+    def _adapt_update_interval(self, *, failed: bool = False) -> None:
+        """Set the next poll interval from this cycle's powers (adaptive polling only).
+
+        A failed cycle returns to the configured ``scan_interval``.
+        """
+        if self._adaptive is None:
+            return
+        if failed:
+            seconds = self._adaptive.reset()
+        else:
+            measurements = self.api.device_snapshot().measurements
+            sun = self.hass.states.get(SUN_ENTITY_ID)
+            seconds = self._adaptive.update(
+                (measurements.produced_power, measurements.consumed_power),
+                night=sun is not None and sun.state == SUN_BELOW_HORIZON,
+            )
+        update_interval = timedelta(seconds=seconds)
+        if update_interval != self.poll_interval:
+            log_debug(
+                _LOGGER,
+                "_adapt_update_interval",
+                "Poll interval adapted",
+                update_interval=update_interval,
+            )
+            self.poll_interval = self.update_interval = update_interval
+
+    @callback
+    def async_publish(self) -> None:
+        """Publish values the API changed outside a poll (e.g. a relay write).
+
+        Goes through the normal listener path, so only the entities whose
+        value changed are woken. Unlike ``async_set_updated_data`` it leaves
+        ``last_update_success`` and the poll schedule alone: a relay read-back
+        says nothing about the last poll, and must not postpone the next one.
+        """
+        self.data = self.api.device_snapshot()
+        self.async_update_listeners()
+
+    async def async_refresh_relay(self) -> None:
+        """Re-read only the relay state and publish it, instead of a full poll.
+
+        A failure is logged and left to the next poll to report.
+        """
+        try:
+            await self.api.async_read_relay()
+        except (TelnetConnectionError, TelnetCommandError, ConnectionUnavailableError) as err:
+            log_debug(_LOGGER, "async_refresh_relay", "Relay refresh failed", error=str(err))
+            return
+        self.async_publish()
+
+    async def async_restore_snapshot(self) -> bool:
+        """Seed the API with the persisted last-known device values.
+
+        Returns True if a snapshot of this device was restored, so entities
+        can be created from it without waiting for the first poll. A snapshot
+        without a serial number, or of a different device than the config
+        entry's, is ignored.
+        """
+        stored = await self._store.async_load()
+        if not stored or not isinstance(stored.get("data"), dict):
+            return False
+        serial = stored["data"].get("sn")
+        if not serial or (self._unique_id is not None and serial != self._unique_id):
+            log_debug(
+                _LOGGER,
+                "async_restore_snapshot",
+                "Ignoring snapshot of another device",
+                serial=serial,
+                unique_id=self._unique_id,
+            )
+            return False
+
+        self.api.restore(stored["data"], stored.get("updated_at"))
+        self._update_stale_keys()
+        log_info(
+            _LOGGER,
+            "async_restore_snapshot",
+            "Restored last-known device values",
+            saved_at=dt_util.utc_from_timestamp(stored.get("saved_at", 0)),
         )
+        return True
 
-    async def async_update_data(self) -> bool:
-        """Update data method."""
+    def _schedule_snapshot_save(self) -> None:
+        """Persist the device values, at most once per ``SNAPSHOT_SAVE_DELAY``.
+
+        Every further call before the write would push a delayed save out
+        again, so one is only scheduled when none is pending. The store
+        flushes a pending save when Home Assistant stops.
+        """
+        if self._snapshot_save_pending:
+            return
+        self._snapshot_save_pending = True
+        self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the data to persist; called by the store at write time."""
+        self._snapshot_save_pending = False
+        return {
+            "saved_at": time.time(),
+            "data": self.api.snapshot(),
+            "updated_at": dict(self.api.updated_at),
+        }
+
+    async def async_update_data(self) -> DeviceSnapshot:
+        """Update data method; returns the snapshot of the new device values."""
         log_debug(_LOGGER, "async_update_data", "Update started", time=datetime.now(tz=UTC))
+        self._first_poll_in_slot = False
         try:
-            self.last_update_status = await self.api.async_get_data()
+            # Devices whose data is stale get the next free session first
+            async with self._scheduler.session(
+                stale=not self.last_update_success or bool(self.stale_keys)
+            ):
+                self.last_update_status = await self.api.async_get_data()
             self.last_update_time = datetime.now(tz=UTC)
             log_debug(
                 _LOGGER,
@@ -205,9 +568,12 @@ class Elios4YouCoordinator(DataUpdateCoordinator[bool]):
 
             # Reset failure counter on success
             self._consecutive_failures = 0
+            self._schedule_snapshot_save()
+            self._adapt_update_interval()
         except Exception as ex:
             self.last_update_status = False
             self._consecutive_failures += 1
+            self._adapt_update_interval(failed=True)
 
             # Determine error type for device trigger
             if isinstance(ex, TelnetConnectionError):
@@ -269,7 +635,7 @@ class Elios4YouCoordinator(DataUpdateCoordinator[bool]):
 
             raise UpdateFailed from ex
 
-        return self.last_update_status
+        return self.api.device_snapshot()
 
     async def _execute_recovery_script(self) -> None:
         """Execute the configured recovery script."""
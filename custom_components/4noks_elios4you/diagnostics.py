@@ -3,6 +3,7 @@
 https://github.com/alexdelprete/ha-4noks-elios4you
 """
 
+import re
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
@@ -20,6 +21,21 @@ TO_REDACT = {
     "ip",
 }
 
+# ``key=value`` records of redacted keys inside traced device replies
+_REDACT_RECORDS = re.compile(
+    rf"^({'|'.join(re.escape(key) for key in sorted(TO_REDACT))})=[^\r\n]*",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+
+def _redact_trace(trace: dict[str, Any]) -> dict[str, Any]:
+    """Return ``trace`` with redacted record values masked in every reply."""
+    events = [
+        {**event, "data": _REDACT_RECORDS.sub(r"\1=**REDACTED**", event["data"])}
+        for event in trace.get("events", [])
+    ]
+    return {**trace, "events": events}
+
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, config_entry: Elios4YouConfigEntry
@@ -51,9 +67,14 @@ async def async_get_config_entry_diagnostics(
     # Gather coordinator state
     coordinator_data = {
         "last_update_success": coordinator.last_update_success,
-        "update_interval_seconds": coordinator.update_interval.total_seconds()
-        if coordinator.update_interval
+        "update_interval_seconds": coordinator.poll_interval.total_seconds()
+        if coordinator.poll_interval
         else None,
+        "data_generation": coordinator.api.generation,
+        "data_captured_at": coordinator.api.captured_at,
+        # Outcome of the last attempt per command, and the values too old to show
+        "command_status": dict(coordinator.api.command_status),
+        "stale_keys": sorted(coordinator.stale_keys),
     }
 
     # Gather sensor data (redact sensitive values)
@@ -67,11 +88,17 @@ async def async_get_config_entry_diagnostics(
 
     # Gather connection manager metrics (state, counters, last error, etc.)
     connection_manager_data = coordinator.api.connection_manager.metrics_snapshot()
+    # Per-command, per-phase latency histograms (percentiles in ms)
+    latency_data = coordinator.api.connection_manager.latency_snapshot()
+    # Recent wire-level exchanges (ring buffer), for replaying a failure
+    trace_data = _redact_trace(coordinator.api.connection_manager.trace_snapshot())
 
     return {
         "config": config_data,
         "device": device_data,
         "coordinator": coordinator_data,
         "connection_manager": connection_manager_data,
+        "latency": latency_data,
+        "trace": trace_data,
         "sensors": sensor_data,
     }
@@ -0,0 +1,187 @@
+"""Latency histograms for the connection manager.
+
+Every exchange with the device is timed per phase:
+
+* ``connect``: opening the TCP connection
+* ``write``: writing the command(s) and draining the socket
+* ``ttfb``: end of the write to the first byte of the reply
+* ``separator``: end of the write to the ``ready...`` separator
+
+``connect`` is tracked once; the other phases are tracked per command (the
+first token, so ``@rel 0 1`` counts as ``@rel``) plus an ``all`` aggregate.
+Pipelined commands share one write, so their reply phases are measured from
+the end of that write.
+
+Each histogram is a fixed set of log-scaled buckets stored in a preallocated
+``array``; recording a sample is a bisect plus an in-place increment, with no
+per-sample containers, so the histograms can stay on in production. Reported
+percentiles are the upper bound of the bucket holding the percentile, i.e.
+accurate to within one bucket (~19 %).
+
+``RttEstimator`` turns the same measurements into timeouts the way TCP does
+for its retransmission timer (RFC 6298): a smoothed round-trip time and its
+mean deviation give ``SRTT + 4 * RTTVAR``, clamped between a floor and a
+ceiling and doubled after every timeout until the next good sample.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from enum import StrEnum
+
+# Bucket upper bounds in seconds: 1 ms * 2^(i/4), i.e. four buckets per
+# doubling, from 1 ms up to ~65 s. One extra overflow bucket sits past the end.
+_BUCKETS_PER_DOUBLING = 4
+_BOUNDS: tuple[float, ...] = tuple(0.001 * 2 ** (i / _BUCKETS_PER_DOUBLING) for i in range(65))
+
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+ALL_COMMANDS = "all"
+
+
+class LatencyPhase(StrEnum):
+    """Timed phases of an exchange with the device."""
+
+    CONNECT = "connect"
+    WRITE = "write"
+    TTFB = "ttfb"
+    SEPARATOR = "separator"
+
+
+class LatencyHistogram:
+    """Fixed-bucket, log-scaled histogram of durations in seconds."""
+
+    __slots__ = ("_counts", "count", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self._counts = array("Q", bytes(8 * (len(_BOUNDS) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one sample."""
+        self._counts[bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, pct: float) -> float:
+        """Return the ``pct`` percentile in seconds (0.0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for index, bucket in enumerate(self._counts):
+            seen += bucket
+            if seen >= rank and bucket:
+                # The overflow bucket has no upper bound: report the maximum.
+                return _BOUNDS[index] if index < len(_BOUNDS) else self.max
+        return self.max
+
+    def summary(self) -> dict[str, float | int]:
+        """Return count, mean, max and the standard percentiles in milliseconds."""
+        out: dict[str, float | int] = {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 1),
+        }
+        for pct in PERCENTILES:
+            out[f"p{pct}_ms"] = round(self.percentile(pct) * 1000, 1)
+        return out
+
+
+class LatencyTracker:
+    """Connect histogram plus per-command, per-phase histograms."""
+
+    def __init__(self) -> None:
+        """Initialize with the connect and aggregate histograms in place."""
+        self.connect = LatencyHistogram()
+        self._commands: dict[str, dict[LatencyPhase, LatencyHistogram]] = {}
+        self._all = self._phases(ALL_COMMANDS)
+
+    def _phases(self, label: str) -> dict[LatencyPhase, LatencyHistogram]:
+        phases = self._commands.get(label)
+        if phases is None:
+            # First time this command is seen: the only allocation it ever causes.
+            phases = {
+                phase: LatencyHistogram()
+                for phase in LatencyPhase
+                if phase is not LatencyPhase.CONNECT
+            }
+            self._commands[label] = phases
+        return phases
+
+    @staticmethod
+    def label(cmd: str) -> str:
+        """Return the histogram label for ``cmd`` (its first token, lower-cased)."""
+        return cmd.split(" ", 1)[0].lower()
+
+    def record(self, label: str, phase: LatencyPhase, seconds: float) -> None:
+        """Record one sample for command ``label`` and the aggregate."""
+        self._phases(label)[phase].record(seconds)
+        self._all[phase].record(seconds)
+
+    def histogram(self, label: str, phase: LatencyPhase) -> LatencyHistogram:
+        """Return the histogram for ``label`` / ``phase`` (``connect`` ignores the label)."""
+        if phase is LatencyPhase.CONNECT:
+            return self.connect
+        return self._phases(label)[phase]
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, float | int]]]:
+        """Return every non-empty histogram summary, for diagnostics."""
+        out: dict[str, dict[str, dict[str, float | int]]] = {}
+        if self.connect.count:
+            out[LatencyPhase.CONNECT.value] = {ALL_COMMANDS: self.connect.summary()}
+        for label, phases in self._commands.items():
+            for phase, hist in phases.items():
+                if hist.count:
+                    out.setdefault(phase.value, {})[label] = hist.summary()
+        return out
+
+
+class RttEstimator:
+    """SRTT/RTTVAR round-trip estimator that derives a bounded timeout."""
+
+    __slots__ = ("_backoff", "ceiling", "floor", "rttvar", "samples", "srtt")
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+    MAX_BACKOFF = 64
+
+    def __init__(self, floor: float, ceiling: float) -> None:
+        """Initialize with no samples: the timeout starts at ``ceiling``."""
+        self.floor = floor
+        self.ceiling = ceiling
+        self.srtt = 0.0
+        self.rttvar = 0.0
+        self.samples = 0
+        self._backoff = 1
+
+    @property
+    def timeout(self) -> float:
+        """Return the current timeout in seconds."""
+        if not self.samples:
+            return self.ceiling
+        rto = max(self.floor, self.srtt + self.K * self.rttvar)
+        return min(self.ceiling, rto * self._backoff)
+
+    def sample(self, rtt: float) -> None:
+        """Fold in one measured round trip and clear any timeout backoff."""
+        if not self.samples:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self.samples += 1
+        self._backoff = 1
+
+    def backoff(self) -> None:
+        """Double the timeout after it expired (up to the ceiling)."""
+        self._backoff = min(self._backoff * 2, self.MAX_BACKOFF)
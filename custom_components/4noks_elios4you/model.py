@@ -0,0 +1,201 @@
+"""Typed device snapshot for 4-noks Elios4You.
+
+Each successful read cycle is published by the coordinator as one immutable
+``DeviceSnapshot`` with three typed sections:
+
+* ``measurements``: the ``@dat`` / ``@sta`` readings and the values derived
+  from them (floats for power and energy, ints for alarms and relay flags)
+* ``static``: the ``@inf`` device information, which rarely changes
+* ``diagnostics``: the connection metrics exposed as ``cm_*`` sensors
+
+The section classes are the schema: their annotated fields decide which keys
+are read from ``Elios4YouAPI.data`` and how each value is coerced, once per
+cycle rather than on every read. ``Elios4YouAPI.data`` remains as a flat dict
+view of the same values (``cm_`` prefixed for diagnostics), and
+``DeviceSnapshot.as_dict()`` rebuilds that view from a snapshot.
+
+The API never modifies its dict view in place; every change swaps in a new
+dict as a new generation. A snapshot is stamped with that ``generation`` and
+the time it was captured, so consumers can tell whether anything changed
+since the snapshot they last handled by comparing one integer.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Any, cast, get_type_hints
+
+# Prefix of the diagnostics section's keys in the flat dict view
+DIAGNOSTIC_PREFIX = "cm_"
+
+type SnapshotValue = int | float | str
+
+
+@dataclass(frozen=True, slots=True)
+class Measurements:
+    """Readings of one cycle, plus the self-consumption values derived from them."""
+
+    produced_power: float
+    consumed_power: float
+    self_consumed_power: float
+    bought_power: float
+    sold_power: float
+    daily_peak: float
+    monthly_peak: float
+    produced_energy: float
+    produced_energy_f1: float
+    produced_energy_f2: float
+    produced_energy_f3: float
+    consumed_energy: float
+    consumed_energy_f1: float
+    consumed_energy_f2: float
+    consumed_energy_f3: float
+    self_consumed_energy: float
+    self_consumed_energy_f1: float
+    self_consumed_energy_f2: float
+    self_consumed_energy_f3: float
+    bought_energy: float
+    bought_energy_f1: float
+    bought_energy_f2: float
+    bought_energy_f3: float
+    sold_energy: float
+    sold_energy_f1: float
+    sold_energy_f2: float
+    sold_energy_f3: float
+    alarm_1: int
+    alarm_2: int
+    power_alarm: int
+    relay_state: int
+    pwm_mode: int
+    pr_ssv: int
+    rel_ssv: int
+    rel_mode: int
+    rel_warning: int
+    rcap: int
+
+
+@dataclass(frozen=True, slots=True)
+class StaticInfo:
+    """Device information from ``@inf``, plus the constant manufacturer and model."""
+
+    sn: str
+    fwtop: str
+    fwbtm: str
+    swver: str
+    hwver: str
+    btver: str
+    hw_wifi: str
+    s2w_app_version: str
+    s2w_geps_version: str
+    s2w_wlan_version: str
+    manufact: str
+    model: str
+
+
+@dataclass(frozen=True, slots=True)
+class Diagnostics:
+    """Connection metrics shown as diagnostic sensors (``cm_`` prefixed in the dict view)."""
+
+    state: str
+    consecutive_failures: int
+    backoff_seconds_remaining: float
+    connects_succeeded: int
+    connect_failures: int
+    reuse_hits: int
+    commands_sent: int
+    commands_failed: int
+    commands_retried: int
+    silent_timeouts: int
+    forced_aborts: int
+    last_error: str
+    connect_p95_ms: float
+    ttfb_p95_ms: float
+    response_p50_ms: float
+    response_p95_ms: float
+    response_p99_ms: float
+
+
+type _Section = Measurements | StaticInfo | Diagnostics
+
+
+def _schema(cls: type[_Section]) -> tuple[tuple[str, Callable[..., SnapshotValue]], ...]:
+    """Return ``(field, coerce)`` pairs of a section, in declaration order."""
+    hints = get_type_hints(cls)
+    return tuple((f.name, hints[f.name]) for f in fields(cls))
+
+
+_MEASUREMENTS = _schema(Measurements)
+_STATIC = _schema(StaticInfo)
+_DIAGNOSTICS = _schema(Diagnostics)
+
+
+def _section[S: _Section](
+    cls: type[S],
+    schema: tuple[tuple[str, Callable[..., SnapshotValue]], ...],
+    data: Mapping[str, Any],
+    prefix: str = "",
+) -> S:
+    """Build a section from the dict view; a missing key gets its type's zero value."""
+    # The schema comes from the class's own fields, so the coerced values match
+    # its signature positionally; the cast only hides that from the type checker.
+    factory = cast("Callable[..., S]", cls)
+    return factory(
+        *(
+            coerce(value) if (value := data.get(prefix + name)) is not None else coerce()
+            for name, coerce in schema
+        )
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceSnapshot:
+    """Immutable, typed view of the device after one read cycle."""
+
+    measurements: Measurements
+    static: StaticInfo
+    diagnostics: Diagnostics
+    # Generation of the API data it was built from (increases with every change)
+    generation: int = 0
+    # Wall-clock time that data was captured at
+    captured_at: float = 0.0
+
+    @classmethod
+    def from_data(
+        cls, data: Mapping[str, Any], *, generation: int = 0, captured_at: float = 0.0
+    ) -> DeviceSnapshot:
+        """Build a snapshot from the flat dict view (``Elios4YouAPI.data``)."""
+        return cls(
+            _section(Measurements, _MEASUREMENTS, data),
+            _section(StaticInfo, _STATIC, data),
+            _section(Diagnostics, _DIAGNOSTICS, data, DIAGNOSTIC_PREFIX),
+            generation,
+            captured_at,
+        )
+
+    def as_dict(self) -> dict[str, SnapshotValue]:
+        """Return the snapshot as the flat dict view, diagnostics ``cm_`` prefixed."""
+        view: dict[str, SnapshotValue] = {
+            name: getattr(self.measurements, name) for name, _ in _MEASUREMENTS
+        }
+        view.update((name, getattr(self.static, name)) for name, _ in _STATIC)
+        view.update(
+            (DIAGNOSTIC_PREFIX + name, getattr(self.diagnostics, name)) for name, _ in _DIAGNOSTICS
+        )
+        return view
+
+
+# Dict-view key -> reader of that value from a snapshot
+_READERS: dict[str, Callable[[DeviceSnapshot], SnapshotValue]] = {
+    **{name: attrgetter(f"measurements.{name}") for name, _ in _MEASUREMENTS},
+    **{name: attrgetter(f"static.{name}") for name, _ in _STATIC},
+    **{DIAGNOSTIC_PREFIX + name: attrgetter(f"diagnostics.{name}") for name, _ in _DIAGNOSTICS},
+}
+
+
+def snapshot_reader(key: str) -> Callable[[DeviceSnapshot], SnapshotValue] | None:
+    """Return a function reading dict-view ``key`` from a snapshot, or None if it has none."""
+    return _READERS.get(key)
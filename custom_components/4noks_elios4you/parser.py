@@ -0,0 +1,144 @@
+"""Incremental response parser for 4-noks Elios4you.
+
+The device answers every command with one record per line, followed by a
+blank line and the ``ready...`` marker:
+
+* ``@dat`` / ``@sta``: ``index;key;value;...`` — semicolon-separated
+* ``@inf`` / ``@rel`` / ``@hwr``: ``key=value`` — equals-separated
+
+The first line is usually the echoed command, but sometimes a stray
+line-feed precedes it.
+
+``ResponseParser`` is push-style: the connection manager feeds it the bytes
+of one response as they come off the socket and calls ``finish()`` as soon
+as it has framed the ``ready...`` line. Records are parsed while the rest of
+the response is still in flight, so no full-response ``splitlines()`` pass or
+intermediate line lists are needed.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+from collections.abc import Buffer
+
+# Commands the device may echo back as the first line of a response.
+ECHOED_COMMANDS = frozenset({"@dat", "@sta", "@inf", "@rel", "@hwr"})
+
+# Commands whose records are ``key=value`` rather than ``index;key;value``.
+KEY_VALUE_COMMANDS = frozenset({"@inf", "@rel", "@hwr"})
+
+# The blank line and the separator marker that close every response.
+_TRAILER_LINES = 2
+
+
+class ResponseParser:
+    """Parse one device response incrementally, line by line."""
+
+    __slots__ = (
+        "_complete",
+        "_error",
+        "_held",
+        "_index",
+        "_key_value",
+        "_output",
+        "_pending",
+        "_skip",
+        "cmd",
+    )
+
+    def __init__(self, cmd: str) -> None:
+        """Initialize a parser for the response to ``cmd``."""
+        self.cmd = cmd
+        self._key_value = cmd[0:4].lower() in KEY_VALUE_COMMANDS
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard everything fed so far (the response is being re-read)."""
+        self._pending = bytearray()
+        self._held: list[str] = []
+        self._index = 0
+        self._skip = 1
+        self._output: dict[str, str] = {}
+        self._error: ValueError | None = None
+        self._complete = False
+
+    @property
+    def complete(self) -> bool:
+        """Return True once the whole response has been fed."""
+        return self._complete
+
+    def feed(self, data: Buffer) -> None:
+        """Consume the next bytes of the response, parsing every complete line."""
+        pending = self._pending
+        pending += data
+        start = 0
+        while (end := pending.find(b"\n", start)) >= 0:
+            self._line(pending[start:end])
+            start = end + 1
+        if start:
+            del pending[:start]
+
+    def finish(self) -> None:
+        """Mark the response complete; a trailing unterminated line is the last line."""
+        if self._pending:
+            self._line(self._pending)
+            self._pending = bytearray()
+        # Whatever is still held back is the blank line and the separator.
+        self._held.clear()
+        self._complete = True
+
+    def result(self) -> dict[str, str]:
+        """Return the parsed records.
+
+        Raises:
+            ValueError: a record line could not be split into key and value.
+
+        """
+        if self._error is not None:
+            raise self._error
+        return self._output
+
+    def _line(self, raw: bytearray) -> None:
+        """Handle one complete line, holding back the last two until the next arrives."""
+        line = raw.decode("utf-8", "replace").rstrip("\r")
+        index = self._index
+        self._index += 1
+        if index == 0:
+            # Skip the echoed command, or one extra line if the device
+            # prepended a LF.
+            self._skip = 1 if line.lower() in ECHOED_COMMANDS else 2
+        if index < self._skip:
+            return
+
+        held = self._held
+        held.append(line)
+        if len(held) > _TRAILER_LINES:
+            self._record(held.pop(0))
+
+    def _record(self, line: str) -> None:
+        """Split one record line into the output dict."""
+        if self._error is not None:
+            return
+        try:
+            if self._key_value:
+                key, value = line.split("=")
+            else:
+                key, value = line.split(";")[1:3]
+        except ValueError as err:
+            self._error = err
+            return
+        self._output[key.lower().replace(" ", "_")] = value.strip()
+
+
+def parse_response(cmd: str, raw: str) -> dict[str, str]:
+    """Parse a complete response string in one go.
+
+    Raises:
+        ValueError: a record line could not be split into key and value.
+
+    """
+    parser = ResponseParser(cmd)
+    parser.feed(raw.encode())
+    parser.finish()
+    return parser.result()
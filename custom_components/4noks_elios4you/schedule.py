@@ -0,0 +1,131 @@
+"""Poll scheduling for 4-noks Elios4You.
+
+``DataUpdateCoordinator`` schedules each poll one interval after the
+previous refresh finished, so poll times drift by the cycle duration (and any
+retries) every cycle, and every config entry polls on its own.
+
+``PollScheduler`` is shared by all config entries through ``hass.data``:
+
+* each registered device gets a phase, its slot of the polling period; the
+  devices' slots are spread evenly across the period
+* at most ``max_sessions`` read cycles run at once; further ones wait for a
+  session, devices with stale data first, then in arrival order
+
+With aligned polling enabled, polls fire on wall-clock multiples of the poll
+interval (e.g. :00, :10, :20 for 10 s), shifted by the device's phase:
+
+* every boundary is computed afresh from the wall clock, so neither the cycle
+  duration, retries, timer jitter nor clock adjustments accumulate as drift
+* a boundary closer than ``MIN_DELAY`` is skipped, so a cycle finishing just
+  before a boundary is not followed by a back-to-back poll
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import insort
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+import heapq
+from itertools import count
+import math
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, MAX_CONCURRENT_SESSIONS
+
+# Minimum time between the end of a cycle and the next aligned poll
+MIN_DELAY = 1.0
+
+
+def next_aligned_delay(now: float, interval: float, phase: float = 0.0) -> float:
+    """Return the seconds from ``now`` to the next boundary of ``interval`` shifted by ``phase``.
+
+    Boundaries are the wall-clock times ``k * interval + phase``; one closer
+    than ``MIN_DELAY`` is skipped for the following one.
+    """
+    boundary = (math.floor((now - phase) / interval) + 1) * interval + phase
+    delay = boundary - now
+    if delay < MIN_DELAY:
+        delay += interval
+    return delay
+
+
+class PollScheduler:
+    """Spread the polls of all devices over the period and cap concurrent sessions."""
+
+    def __init__(self, max_sessions: int) -> None:
+        """Initialize with no device registered and no session open."""
+        self.max_sessions = max_sessions
+        self.active = 0
+        self._devices: list[str] = []
+        # (not stale, arrival, future) of the cycles waiting for a session
+        self._waiting: list[tuple[bool, int, asyncio.Future[None]]] = []
+        self._arrivals = count()
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of cycles waiting for a session."""
+        return sum(not future.done() for _, _, future in self._waiting)
+
+    def register(self, key: str) -> None:
+        """Add device ``key`` to the devices sharing the polling period."""
+        if key not in self._devices:
+            insort(self._devices, key)
+
+    def unregister(self, key: str) -> None:
+        """Remove device ``key``; the remaining devices are spread over the period again."""
+        if key in self._devices:
+            self._devices.remove(key)
+
+    def phase(self, key: str, interval: float) -> float:
+        """Return the offset of ``key``'s slot within a period of ``interval`` seconds."""
+        if key not in self._devices:
+            return 0.0
+        return interval * self._devices.index(key) / len(self._devices)
+
+    @asynccontextmanager
+    async def session(self, *, stale: bool = False) -> AsyncGenerator[None]:
+        """Hold one of the ``max_sessions`` sessions for the duration of a read cycle."""
+        await self._acquire(stale)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, stale: bool) -> None:
+        """Take a free session, or wait until one is handed over."""
+        if self.active < self.max_sessions and not self.waiting:
+            self.active += 1
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (not stale, next(self._arrivals), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Handed a session just as it was cancelled: pass it on.
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the session to the first waiting cycle, or free it."""
+        while self._waiting:
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+DATA_SCHEDULER: HassKey[PollScheduler] = HassKey(DOMAIN)
+
+
+def get_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Return the scheduler shared by all config entries, creating it on first use."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = PollScheduler(MAX_CONCURRENT_SESSIONS)
+    return scheduler
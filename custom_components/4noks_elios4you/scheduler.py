@@ -0,0 +1,141 @@
+"""Priority command scheduler for 4-noks Elios4you.
+
+The device can only handle one command at a time, so every exchange with it
+runs while holding the single slot handed out by ``CommandScheduler``. Unlike
+a FIFO ``asyncio.Lock``, waiters are served by priority: a relay switch press
+queued behind a data poll is let through first, and a poll that is between
+retries hands the slot to any waiting higher-priority command before it
+tries again.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
+from enum import IntEnum
+import heapq
+import itertools
+
+
+class CommandPriority(IntEnum):
+    """Scheduling priority of a device command; lower values are served first."""
+
+    INTERACTIVE = 0  # relay writes triggered by the user
+    POLL = 1  # the coordinator's read cycle (@dat with @sta / @inf when due)
+
+
+class SchedulerSlot:
+    """Handle for a held scheduler slot."""
+
+    __slots__ = ("_scheduler", "held", "priority")
+
+    def __init__(self, scheduler: CommandScheduler, priority: CommandPriority) -> None:
+        """Initialize a handle for a slot that has just been acquired."""
+        self._scheduler = scheduler
+        self.priority = priority
+        self.held = True
+
+    async def yield_to_higher(self) -> bool:
+        """Let more urgent waiters run, then re-acquire the slot at the same priority.
+
+        The slot comes back to this holder ahead of waiters of its own
+        priority, which queued after it. Returns True if the slot was actually given away. If re-acquiring
+        fails (cancellation, ``cancel_queued``), the slot is no longer held
+        and the error propagates.
+        """
+        if not self._scheduler.has_waiter_before(self.priority):
+            return False
+        self.held = False
+        self._scheduler.release()
+        await self._scheduler.acquire(self.priority, resume=True)
+        self.held = True
+        return True
+
+
+class CommandScheduler:
+    """Single-slot gate that serves waiters by priority, then arrival order."""
+
+    def __init__(self) -> None:
+        """Initialize an idle scheduler."""
+        self._busy = False
+        self._queue: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count(1)
+
+    @property
+    def busy(self) -> bool:
+        """Return True while a caller holds the slot."""
+        return self._busy
+
+    @property
+    def queued(self) -> int:
+        """Return the number of callers waiting for the slot."""
+        return sum(1 for _, _, fut in self._queue if not fut.done())
+
+    @asynccontextmanager
+    async def slot(self, priority: CommandPriority) -> AsyncGenerator[SchedulerSlot]:
+        """Hold the slot for the duration of the ``async with`` block."""
+        await self.acquire(priority)
+        lease = SchedulerSlot(self, priority)
+        try:
+            yield lease
+        finally:
+            if lease.held:
+                self.release()
+
+    async def acquire(self, priority: CommandPriority, *, resume: bool = False) -> None:
+        """Wait until the slot is granted to this caller.
+
+        ``resume`` queues the caller ahead of every waiter of the same
+        priority (used by a holder that temporarily yielded the slot).
+        """
+        if not self._busy and not self.queued:
+            self._busy = True
+            return
+
+        seq = next(self._seq)
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, -seq if resume else seq, fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # Granted just before we were cancelled: pass the slot on.
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Hand the slot to the most urgent waiter, or mark it free."""
+        while self._queue:
+            _, _, fut = heapq.heappop(self._queue)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._busy = False
+
+    def has_waiter_before(self, priority: CommandPriority) -> bool:
+        """Return True if a caller with a strictly higher priority is waiting."""
+        return any(prio < priority and not fut.done() for prio, _, fut in self._queue)
+
+    def cancel_queued(
+        self,
+        exc_factory: Callable[[], Exception],
+        *,
+        min_priority: CommandPriority | None = None,
+    ) -> int:
+        """Fail waiting callers (at ``min_priority`` or less urgent) with ``exc_factory()``.
+
+        The current holder is not affected. Returns the number of callers
+        that were cancelled.
+        """
+        cancelled = 0
+        for prio, _, fut in self._queue:
+            if fut.done() or (min_priority is not None and prio < min_priority):
+                continue
+            fut.set_exception(exc_factory())
+            cancelled += 1
+        self._queue = [entry for entry in self._queue if not entry[2].done()]
+        heapq.heapify(self._queue)
+        return cancelled
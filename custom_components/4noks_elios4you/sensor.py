@@ -7,7 +7,7 @@ import logging
 from typing import Any, cast
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -17,6 +17,7 @@ from . import Elios4YouConfigEntry
 from .const import CONF_NAME, DOMAIN, SENSOR_ENTITIES
 from .coordinator import Elios4YouCoordinator
 from .helpers import log_debug
+from .model import DIAGNOSTIC_PREFIX, snapshot_reader
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -79,9 +80,15 @@ class Elios4YouSensor(CoordinatorEntity[Elios4YouCoordinator], SensorEntity):
         enabled_default: bool,
     ) -> None:
         """Class Initializitation."""
-        super().__init__(coordinator)
+        # The key is the coordinator context: the entity is only woken when it changes
+        super().__init__(coordinator, context=key)
         self._coordinator = coordinator
         self._key = key
+        # Connection metrics are also published by failed polls, which leave the
+        # coordinator's snapshot alone: those sensors read api.data directly.
+        self._diagnostic = key.startswith(DIAGNOSTIC_PREFIX)
+        # Typed accessor of this sensor's value in the coordinator's snapshot
+        self._read_snapshot = None if self._diagnostic else snapshot_reader(key)
         self._icon = icon
         self._device_class = device_class
         self._state_class = state_class
@@ -98,19 +105,6 @@ class Elios4YouSensor(CoordinatorEntity[Elios4YouCoordinator], SensorEntity):
         # Entity registry enabled default (False = disabled by default in UI)
         self._attr_entity_registry_enabled_default = enabled_default
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Fetch new state data for the sensor."""
-        self._state = self._coordinator.api.data[self._key]
-        self.async_write_ha_state()
-        # write debug log only on first sensor to avoid spamming the log
-        if self._key == "rcap":
-            log_debug(
-                _LOGGER,
-                "_handle_coordinator_update",
-                "Sensors state written to state machine",
-            )
-
     @property
     def native_unit_of_measurement(self) -> str | None:
         """Return the unit of measurement."""
@@ -138,9 +132,29 @@ class Elios4YouSensor(CoordinatorEntity[Elios4YouCoordinator], SensorEntity):
             return EntityCategory.DIAGNOSTIC
         return None
 
+    @property
+    def available(self) -> bool:
+        """Return True if the sensor's own value is fresh enough to show.
+
+        A value the device has not reported yet is never shown. With a
+        maximum data age configured, availability follows the age of this
+        sensor's value rather than the outcome of the last poll. Connection
+        metrics stay available through failed polls, which keep them current.
+        """
+        if self._diagnostic:
+            return self._key in self._coordinator.api.data
+        if self._key in self._coordinator.stale_keys:
+            return False
+        return bool(self._coordinator.max_data_age) or super().available
+
     @property
     def native_value(self) -> int | float | str | None:
         """Return the state of the sensor."""
+        # Before the first refresh (e.g. values restored at startup) there is
+        # no snapshot yet: fall back to the dict view.
+        snapshot = self._coordinator.data
+        if snapshot is not None and self._read_snapshot is not None:
+            return self._read_snapshot(snapshot)
         if self._key in self._coordinator.api.data:
             return self._coordinator.api.data[self._key]
         return None
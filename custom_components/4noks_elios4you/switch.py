@@ -67,7 +67,8 @@ class Elios4YouSwitch(CoordinatorEntity[Elios4YouCoordinator], SwitchEntity):
         device_class: SwitchDeviceClass,
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        # Only woken by the coordinator when the relay state changes
+        super().__init__(coordinator, context="relay_state")
         self._coordinator = coordinator
         self._key = key
         self._icon = icon
@@ -91,16 +92,16 @@ class Elios4YouSwitch(CoordinatorEntity[Elios4YouCoordinator], SwitchEntity):
         )
 
     async def async_force_update(self, delay: int = 0) -> None:
-        """Force Switch State Update."""
+        """Force Switch State Update (re-reads only the relay, not a full poll)."""
         log_debug(
             _LOGGER,
             "async_force_update",
-            "Coordinator forced update initiated",
+            "Relay refresh initiated",
             key=self._key,
         )
         if delay:
             await asyncio.sleep(delay)
-        await self._coordinator.async_update_data()
+        await self._coordinator.async_refresh_relay()
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -143,23 +144,28 @@ class Elios4YouSwitch(CoordinatorEntity[Elios4YouCoordinator], SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        set_response = await self._coordinator.api.telnet_set_relay("on")
-        if set_response:
+        if await self._async_set_relay("on"):
             log_debug(_LOGGER, "async_turn_on", "Switch turned on")
         else:
             log_debug(_LOGGER, "async_turn_on", "Error turning switch on")
-        # call coord update for immediate refresh state
-        self._handle_coordinator_update()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        set_response = await self._coordinator.api.telnet_set_relay("off")
-        if set_response:
+        if await self._async_set_relay("off"):
             log_debug(_LOGGER, "async_turn_off", "Switch turned off")
         else:
             log_debug(_LOGGER, "async_turn_off", "Error turning switch off")
-        # call coord update for immediate refresh state
-        self._handle_coordinator_update()
+
+    async def _async_set_relay(self, state: str) -> bool:
+        """Write the relay state and publish whatever the device read back."""
+        api = self._coordinator.api
+        reads = api.relay_reads
+        set_response = await api.telnet_set_relay(state)
+        # A read-back that does not match the request is published too, so the
+        # switch shows the relay's actual state
+        if api.relay_reads != reads:
+            self._coordinator.async_publish()
+        return set_response
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -0,0 +1,115 @@
+"""Wire-level trace of recent exchanges with the device.
+
+``ConnectionManager`` records what it does into a fixed-size ring buffer:
+each ``execute`` with the manager's state at that moment, connects and
+connect failures, the bytes written and every reply as received (with its
+outcome), RST / FIN closes, state transitions and the final result. The
+buffer is a preallocated list of slots overwritten in place, and each event is
+one small tuple referencing strings the manager already holds, so tracing
+costs a few hundred nanoseconds per event and its memory never grows. A
+capacity of 0 switches it off.
+
+The trace is included in the config entry diagnostics. Because it records the
+device's side of every exchange, a captured trace can be replayed
+deterministically through the response parser and a fresh state machine on a
+simulated clock (see ``tests/trace_replay.py``).
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+from enum import StrEnum
+from typing import Any, NamedTuple
+
+
+class TraceKind(StrEnum):
+    """Kinds of traced events."""
+
+    EXECUTE = "execute"  # command: batch joined by "+", detail: manager state
+    CONNECT = "connect"
+    CONNECT_FAILED = "connect_failed"  # detail: the error
+    SEND = "send"  # data: the bytes written
+    RECV = "recv"  # command, data: the reply, detail: "ok" / "silent" / "error: ..."
+    ABORT = "abort"  # closed with RST
+    CLOSE = "close"  # closed with FIN
+    TRANSITION = "transition"  # command: new state, detail: "old: reason"
+    RESULT = "result"  # detail: "ok" / "failed: ..." / "refused: ..."
+
+
+# Outcomes of a traced reply.
+RECV_OK = "ok"
+RECV_SILENT = "silent"  # read timed out or hit EOF before the separator
+
+
+class TraceEvent(NamedTuple):
+    """One traced event; ``at`` is wall-clock seconds from the manager's clock."""
+
+    at: float
+    kind: TraceKind
+    command: str = ""
+    data: str = ""
+    detail: str = ""
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the event as plain JSON-serializable data."""
+        return {
+            "at": self.at,
+            "kind": self.kind.value,
+            "command": self.command,
+            "data": self.data,
+            "detail": self.detail,
+        }
+
+    @classmethod
+    def from_dict(cls, event: dict[str, Any]) -> TraceEvent:
+        """Rebuild an event from ``as_dict()`` output (e.g. a diagnostics dump)."""
+        return cls(
+            float(event["at"]),
+            TraceKind(event["kind"]),
+            event.get("command", ""),
+            event.get("data", ""),
+            event.get("detail", ""),
+        )
+
+
+class ExchangeTrace:
+    """Preallocated ring buffer of the most recent ``capacity`` events."""
+
+    __slots__ = ("_next", "_slots", "capacity", "recorded")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty buffer (``capacity=0`` records nothing)."""
+        self.capacity = max(0, capacity)
+        self._slots: list[TraceEvent | None] = [None] * self.capacity
+        self._next = 0
+        self.recorded = 0
+
+    def record(
+        self,
+        at: float,
+        kind: TraceKind,
+        command: str = "",
+        data: str = "",
+        detail: str = "",
+    ) -> None:
+        """Store one event, overwriting the oldest once the buffer is full."""
+        if not self.capacity:
+            return
+        self._slots[self._next] = TraceEvent(at, kind, command, data, detail)
+        self._next = (self._next + 1) % self.capacity
+        self.recorded += 1
+
+    def events(self) -> list[TraceEvent]:
+        """Return the buffered events, oldest first."""
+        ordered = self._slots[self._next :] + self._slots[: self._next]
+        return [event for event in ordered if event is not None]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the buffer as plain data, for diagnostics."""
+        return {
+            "capacity": self.capacity,
+            "recorded": self.recorded,
+            "dropped": max(0, self.recorded - self.capacity),
+            "events": [event.as_dict() for event in self.events()],
+        }
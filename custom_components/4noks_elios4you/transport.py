@@ -0,0 +1,267 @@
+"""Byte transports used by the connection manager.
+
+The Elios4You speaks a plain line protocol over TCP port 5001: it never
+negotiates telnet options, so the telnetlib3 layer adds nothing but latency
+(``connect_minwait``/``connect_maxwait`` on every connect) and per-chunk
+decoding. ``ConnectionManager`` therefore talks to a small ``DeviceTransport``
+interface that moves bytes, with two backends:
+
+* ``RawTcpTransport`` (default): a lean ``asyncio.Protocol`` that buffers
+  incoming bytes in a ``bytearray`` and sends a real TCP RST on abort by
+  setting ``SO_LINGER`` to zero right before dropping the socket.
+* ``TelnetlibTransport`` (fallback): the previous telnetlib3 reader/writer
+  pair, kept for devices or firmware that turn out to need it.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+from contextlib import suppress
+from enum import StrEnum
+import socket
+import struct
+from typing import cast
+
+import telnetlib3
+
+# ``struct linger`` with l_onoff=1, l_linger=0: close() drops the socket with RST.
+_LINGER_ABORT = struct.pack("ii", 1, 0)
+
+
+class TransportBackend(StrEnum):
+    """Selectable transport implementations."""
+
+    RAW = "raw"
+    TELNETLIB3 = "telnetlib3"
+
+
+class DeviceTransport(abc.ABC):
+    """Minimal byte-stream interface the connection manager relies on."""
+
+    @abc.abstractmethod
+    def write(self, data: bytes) -> None:
+        """Queue ``data`` for sending."""
+
+    @abc.abstractmethod
+    async def drain(self) -> None:
+        """Wait until the write buffer has been flushed to the OS."""
+
+    @abc.abstractmethod
+    async def read(self, n: int) -> bytes:
+        """Return up to ``n`` bytes as soon as any are available (``b""`` on EOF)."""
+
+    @abc.abstractmethod
+    def is_closing(self) -> bool:
+        """Return True if the connection is closed or being closed."""
+
+    @abc.abstractmethod
+    def abort(self) -> None:
+        """Drop the connection immediately with a TCP RST."""
+
+    @abc.abstractmethod
+    async def close(self, timeout: float) -> None:
+        """Close gracefully (FIN), waiting at most ``timeout`` seconds."""
+
+
+class RawTcpTransport(asyncio.Protocol, DeviceTransport):
+    """Plain TCP transport built directly on ``asyncio.Protocol``."""
+
+    def __init__(self) -> None:
+        """Initialize an unconnected protocol (see ``open``)."""
+        self._transport: asyncio.Transport | None = None
+        self._buffer = bytearray()
+        self._eof = False
+        self._paused = False
+        self._data_waiter: asyncio.Future[None] | None = None
+        self._drain_waiter: asyncio.Future[None] | None = None
+        self._closed: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> RawTcpTransport:
+        """Open a TCP connection to ``host:port``."""
+        loop = asyncio.get_running_loop()
+        _, protocol = await loop.create_connection(cls, host, port)
+        return protocol
+
+    # ------------------------------------------------------------------ #
+    # asyncio.Protocol callbacks
+    # ------------------------------------------------------------------ #
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Keep the transport; asyncio already enables TCP_NODELAY."""
+        self._transport = cast(asyncio.Transport, transport)
+
+    def data_received(self, data: bytes) -> None:
+        """Append incoming bytes and wake a pending ``read``."""
+        self._buffer += data
+        self._wake(self._data_waiter)
+
+    def eof_received(self) -> bool:
+        """Mark EOF; returning False lets asyncio close the transport."""
+        self._eof = True
+        self._wake(self._data_waiter)
+        return False
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Mark EOF and release anyone waiting on data, drain or close."""
+        self._eof = True
+        self._wake(self._data_waiter)
+        self._wake(self._drain_waiter)
+        self._wake(self._closed)
+
+    def pause_writing(self) -> None:
+        """Flow control: the OS send buffer is full."""
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        """Flow control: the OS send buffer has room again."""
+        self._paused = False
+        self._wake(self._drain_waiter)
+
+    @staticmethod
+    def _wake(waiter: asyncio.Future[None] | None) -> None:
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    # ------------------------------------------------------------------ #
+    # DeviceTransport
+    # ------------------------------------------------------------------ #
+
+    def write(self, data: bytes) -> None:
+        """Queue ``data`` on the socket."""
+        if self._transport is None or self._transport.is_closing():
+            raise ConnectionResetError("transport is closed")
+        self._transport.write(data)
+
+    async def drain(self) -> None:
+        """Wait while asyncio has paused writing."""
+        if self._transport is None or self._transport.is_closing():
+            raise ConnectionResetError("connection lost")
+        if not self._paused:
+            return
+        self._drain_waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._drain_waiter
+        finally:
+            self._drain_waiter = None
+
+    async def read(self, n: int) -> bytes:
+        """Return up to ``n`` buffered bytes, waiting for data if none are buffered."""
+        while not self._buffer and not self._eof:
+            self._data_waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._data_waiter
+            finally:
+                self._data_waiter = None
+        data = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return data
+
+    def is_closing(self) -> bool:
+        """Return True once the socket is closing or the peer sent EOF."""
+        return self._transport is None or self._eof or self._transport.is_closing()
+
+    def abort(self) -> None:
+        """Set ``SO_LINGER`` to zero and drop the socket, so the kernel sends RST."""
+        if self._transport is None:
+            return
+        sock = self._transport.get_extra_info("socket")
+        if sock is not None:
+            with suppress(OSError):
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_ABORT)
+        self._transport.abort()
+
+    async def close(self, timeout: float) -> None:
+        """Close with FIN after flushing, bounded by ``timeout``."""
+        if self._transport is None:
+            return
+        self._transport.close()
+        with suppress(TimeoutError):
+            await asyncio.wait_for(asyncio.shield(self._closed), timeout=timeout)
+
+
+class TelnetlibTransport(DeviceTransport):
+    """Fallback transport wrapping a telnetlib3 Unicode reader/writer pair."""
+
+    # Elios4You doesn't really negotiate, so keep these short to avoid adding
+    # latency to every connect.
+    CONNECT_MINWAIT: float = 0.1
+    CONNECT_MAXWAIT: float = 0.5
+
+    def __init__(
+        self,
+        reader: telnetlib3.TelnetReaderUnicode,
+        writer: telnetlib3.TelnetWriterUnicode,
+    ) -> None:
+        """Wrap an already open telnetlib3 connection."""
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> TelnetlibTransport:
+        """Open a telnet connection to ``host:port``."""
+        reader, writer = await telnetlib3.open_connection(
+            host=host,
+            port=port,
+            encoding="utf-8",
+            encoding_errors="replace",
+            connect_minwait=cls.CONNECT_MINWAIT,
+            connect_maxwait=cls.CONNECT_MAXWAIT,
+        )
+        # encoding="utf-8" guarantees the Unicode variants at runtime
+        return cls(
+            cast(telnetlib3.TelnetReaderUnicode, reader),
+            cast(telnetlib3.TelnetWriterUnicode, writer),
+        )
+
+    def write(self, data: bytes) -> None:
+        """Queue ``data`` (decoded, since the writer is str-based)."""
+        self._writer.write(data.decode("utf-8"))
+
+    async def drain(self) -> None:
+        """Flush the telnet writer."""
+        await self._writer.drain()
+
+    async def read(self, n: int) -> bytes:
+        """Read up to ``n`` characters and return them UTF-8 encoded."""
+        chunk = await self._reader.read(n)
+        return chunk.encode("utf-8")
+
+    def is_closing(self) -> bool:
+        """Return True if either the writer or its transport is closing."""
+        try:
+            if self._writer.is_closing():
+                return True
+            transport = self._writer.get_extra_info("transport")
+        except (AttributeError, OSError):
+            return True
+        return transport is not None and transport.is_closing()
+
+    def abort(self) -> None:
+        """Abort the underlying transport, falling back to ``writer.close()``."""
+        transport = None
+        with suppress(AttributeError, OSError):
+            transport = self._writer.get_extra_info("transport")
+        if transport is not None:
+            with suppress(Exception):
+                transport.abort()
+        else:
+            with suppress(Exception):
+                self._writer.close()
+
+    async def close(self, timeout: float) -> None:
+        """Close the writer and wait for it, bounded by ``timeout``."""
+        with suppress(Exception):
+            self._writer.close()
+        with suppress(Exception):
+            await asyncio.wait_for(self._writer.wait_closed(), timeout=timeout)
+
+
+async def open_transport(backend: TransportBackend, host: str, port: int) -> DeviceTransport:
+    """Open a connection to ``host:port`` using the selected backend."""
+    if backend is TransportBackend.TELNETLIB3:
+        return await TelnetlibTransport.open(host, port)
+    return await RawTcpTransport.open(host, port)
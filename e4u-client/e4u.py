@@ -23,10 +23,12 @@ Patterns mirrored from ``connection_manager.py``:
 Usage::
 
     python e4u.py
+    python e4u.py --host 127.0.0.1 --port 5001   # e.g. against tests/device_simulator.py
 """
 
 from __future__ import annotations
 
+import argparse
 import asyncio
 from contextlib import suppress
 
@@ -56,28 +58,37 @@ async def _read_until(
     """Read chunks until ``separator`` appears in the buffer or timeout/EOF.
 
     Mirrors ``ConnectionManager._read_until``: returns the partial buffer
-    on either timeout or EOF rather than raising.
+    on either timeout or EOF rather than raising. Chunks are collected in a
+    list and joined once; each new chunk is only scanned together with the
+    last ``len(separator) - 1`` characters before it.
     """
-    buffer = ""
-    loop = asyncio.get_event_loop()
+    chunks: list[str] = []
+    size = 0
+    tail = ""
+    loop = asyncio.get_running_loop()
     end_time = loop.time() + timeout
 
-    while separator not in buffer:
+    while True:
         remaining = end_time - loop.time()
         if remaining <= 0:
-            print(f"timeout waiting for separator (buffer_len={len(buffer)})")  # noqa: T201
-            return buffer
+            print(f"timeout waiting for separator (buffer_len={size})")  # noqa: T201
+            break
         try:
             chunk = await asyncio.wait_for(reader.read(1024), timeout=remaining)
         except TimeoutError:
-            print(f"read timed out (buffer_len={len(buffer)})")  # noqa: T201
-            return buffer
+            print(f"read timed out (buffer_len={size})")  # noqa: T201
+            break
         if not chunk:
-            print(f"EOF received (buffer_len={len(buffer)})")  # noqa: T201
-            return buffer
-        buffer += chunk
+            print(f"EOF received (buffer_len={size})")  # noqa: T201
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        window = tail + chunk
+        if separator in window:
+            break
+        tail = window[-(len(separator) - 1) :]
 
-    return buffer
+    return "".join(chunks)
 
 
 async def _send_raw(
@@ -169,18 +180,18 @@ async def _close(
     print("connection closed gracefully (FIN)")  # noqa: T201
 
 
-async def main() -> None:
+async def main(host: str = HOST, port: int = PORT) -> None:
     """Open one connection, dump every command, close."""
     reader: telnetlib3.TelnetReaderUnicode | None = None
     writer: telnetlib3.TelnetWriterUnicode | None = None
     error_path = False
 
     try:
-        print(f"connecting to {HOST}:{PORT}...")  # noqa: T201
+        print(f"connecting to {host}:{port}...")  # noqa: T201
         reader, writer = await asyncio.wait_for(
             telnetlib3.open_connection(
-                host=HOST,
-                port=PORT,
+                host=host,
+                port=port,
                 encoding="utf-8",
                 encoding_errors="replace",
                 connect_minwait=CONNECT_MINWAIT,
@@ -208,4 +219,8 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Dump every Elios4you command once.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+    asyncio.run(main(args.host, args.port))
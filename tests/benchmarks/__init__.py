@@ -0,0 +1 @@
+"""Benchmarks for the 4-noks Elios4you integration."""
@@ -0,0 +1,37 @@
+"""Fixtures for the benchmark suite.
+
+The suite needs ``pytest-benchmark``, and the default pytest options pass
+``--benchmark-skip``, so the regular test run skips every benchmark.
+``scripts/benchmark`` opts in with ``--benchmark-only``, runs the suite
+against a saved baseline and fails on regressions.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+from custom_components.fournoks_elios4you.api import Elios4YouAPI
+from custom_components.fournoks_elios4you.latency import LatencyPhase
+import pytest
+
+from tests.conftest import TEST_HOST, TEST_NAME, TEST_PORT
+from .payloads import PAYLOADS
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture
+def api(mock_hass) -> Elios4YouAPI:
+    """Return an API whose data and metrics look like after a day of polling."""
+    api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+    api._merge_dat(api.data, Elios4YouAPI._parse("@dat", PAYLOADS["@dat"]))
+    api._merge_sta(api.data, Elios4YouAPI._parse("@sta", PAYLOADS["@sta"]))
+    api._merge_inf(api.data, Elios4YouAPI._parse("@inf", PAYLOADS["@inf"]))
+    api._update_calculated(api.data)
+
+    latency = api.connection_manager.metrics.latency
+    for i in range(1440):
+        latency.connect.record(0.02 + (i % 7) / 1000)
+        for cmd in ("@dat", "@sta", "@inf"):
+            latency.record(cmd, LatencyPhase.SEPARATOR, 0.1 + (i % 13) / 100)
+    return api
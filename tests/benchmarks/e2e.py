@@ -0,0 +1,305 @@
+"""End-to-end read-cycle harness.
+
+Starts one ``DeviceSimulator`` per device on loopback and drives a real
+``Elios4YouCoordinator`` (with its ``Elios4YouAPI`` and ``ConnectionManager``)
+against each, all devices polling concurrently on the Home Assistant event
+loop. The simulators run on their own thread and event loop, so the numbers
+below describe the integration's side only, as on a real installation:
+
+* cycle latency: ``async_refresh()`` wall time, percentiles over all devices
+* event-loop lag: how late a 5 ms sleep on the HA loop wakes up
+* CPU: event-loop thread CPU time per device and per cycle
+* memory: net blocks and bytes retained per cycle, and the traced peak
+  (``tracemalloc``, whole process; only with ``trace_allocations``)
+
+Scenarios script the device side: steady polling, a reconnect storm (every
+device drops its connections before every cycle), and a deaf window that
+drives the managers into backoff and back out.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+import logging
+import statistics
+import threading
+import time
+import tracemalloc
+from typing import Any
+
+from custom_components.fournoks_elios4you.connection_manager import ConnectionManager
+from custom_components.fournoks_elios4you.const import CONF_SCAN_INTERVAL, DOMAIN
+from custom_components.fournoks_elios4you.coordinator import Elios4YouCoordinator
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from tests.device_simulator import DeviceSimulator
+
+# Manager settings scaled down to the speed of a loopback device, so failure
+# scenarios play out in seconds. Scenarios may override any of them.
+FAST_MANAGER: dict[str, Any] = {
+    "connect_timeout": 1.0,
+    "connect_timeout_floor": 0.05,
+    "read_timeout": 1.0,
+    "read_timeout_floor": 0.05,
+    "retry_delay": 0.01,
+    "backoff_initial": 0.05,
+    "backoff_max": 0.5,
+}
+
+LAG_PROBE_INTERVAL = 0.005
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """What the devices do while the coordinators poll them."""
+
+    name: str
+    devices: int = 3
+    cycles: int = 30
+    interval: float = 0.01  # pause between two polls of one device
+    latency: float = 0.002  # simulated reply latency per command
+    drop_every: int = 0  # drop every device connection before each N-th cycle
+    deaf_cycles: tuple[int, int] | None = None  # [start, end) cycles with deaf devices
+    manager: dict[str, Any] = field(default_factory=dict)
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "steady": Scenario("steady"),
+    "reconnect_storm": Scenario("reconnect_storm", drop_every=1),
+    "backoff": Scenario("backoff", deaf_cycles=(8, 16), manager={"read_timeout": 0.25}),
+}
+
+
+@dataclass
+class E2EReport:
+    """Results of one scenario run."""
+
+    scenario: str
+    devices: int
+    cycles: int
+    ok: int
+    failed: int
+    wall_seconds: float
+    cycle_ms: dict[str, float]
+    loop_lag_ms: dict[str, float]
+    cpu_ms_per_device: float
+    cpu_ms_per_cycle: float
+    connects: int
+    forced_aborts: int
+    backoff_entries: int
+    max_slots_in_use: int
+    retained_blocks_per_cycle: float | None = None
+    retained_bytes_per_cycle: float | None = None
+    traced_peak_kib: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as plain JSON-serializable data."""
+        return asdict(self)
+
+    def format(self) -> str:
+        """Return a human-readable summary."""
+        lines = [
+            f"scenario={self.scenario} devices={self.devices} cycles/device={self.cycles}",
+            f"  ok={self.ok} failed={self.failed} wall={self.wall_seconds:.2f}s",
+            "  cycle ms:    " + _fmt(self.cycle_ms),
+            "  loop lag ms: " + _fmt(self.loop_lag_ms),
+            f"  cpu: {self.cpu_ms_per_device:.1f} ms/device, {self.cpu_ms_per_cycle:.3f} ms/cycle",
+            (
+                f"  connects={self.connects} forced_aborts={self.forced_aborts} "
+                f"backoff_entries={self.backoff_entries} max_slots_in_use={self.max_slots_in_use}"
+            ),
+        ]
+        if self.traced_peak_kib is not None:
+            lines.append(
+                f"  memory: {self.retained_blocks_per_cycle:.2f} blocks/cycle, "
+                f"{self.retained_bytes_per_cycle:.1f} B/cycle retained, "
+                f"peak {self.traced_peak_kib:.0f} KiB"
+            )
+        return "\n".join(lines)
+
+
+def _fmt(values: dict[str, float]) -> str:
+    return " ".join(f"{key}={value:.2f}" for key, value in values.items())
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    """Return p50/p95/p99/max of ``samples`` (seconds) in milliseconds."""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value, "max": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": cuts[49] * 1000,
+        "p95": cuts[94] * 1000,
+        "p99": cuts[98] * 1000,
+        "max": max(samples) * 1000,
+    }
+
+
+class SimulatorFarm:
+    """Device simulators served from a dedicated thread and event loop."""
+
+    def __init__(self, count: int, **sim_kwargs: Any) -> None:
+        """Prepare ``count`` simulators (started by ``start()``)."""
+        self.sims = [DeviceSimulator(record_commands=False, **sim_kwargs) for _ in range(count)]
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="e4u-simulators", daemon=True
+        )
+
+    async def _on_farm(self, factory: Callable[[], Awaitable[None]]) -> None:
+        future = asyncio.run_coroutine_threadsafe(factory(), self._loop)
+        await asyncio.wrap_future(future)
+
+    async def start(self) -> None:
+        """Start the thread and every simulator."""
+        self._thread.start()
+
+        async def _start() -> None:
+            await asyncio.gather(*(sim.start() for sim in self.sims))
+
+        await self._on_farm(_start)
+
+    async def stop(self) -> None:
+        """Stop every simulator and the thread."""
+
+        async def _stop() -> None:
+            await asyncio.gather(*(sim.stop() for sim in self.sims))
+
+        with suppress(RuntimeError):
+            await self._on_farm(_stop)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+        self._loop.close()
+
+    def call(self, func: Callable[..., object], *args: object) -> None:
+        """Run ``func(*args)`` on the simulators' loop."""
+        self._loop.call_soon_threadsafe(func, *args)
+
+
+async def _probe_loop_lag(lags: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lags.append(max(0.0, loop.time() - started - LAG_PROBE_INTERVAL))
+
+
+def _coordinator(hass: HomeAssistant, sim: DeviceSimulator, index: int, manager: dict[str, Any]):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=f"e2e-{index}",
+        data={CONF_NAME: f"e2e {index}", CONF_HOST: sim.host, CONF_PORT: sim.port},
+        options={CONF_SCAN_INTERVAL: 60},
+    )
+    entry.add_to_hass(hass)
+    coordinator = Elios4YouCoordinator(hass, entry)
+    coordinator.api.connection_manager = ConnectionManager(sim.host, sim.port, **manager)
+    return coordinator
+
+
+async def run_scenario(
+    hass: HomeAssistant,
+    scenario: Scenario,
+    *,
+    trace_allocations: bool = False,
+) -> E2EReport:
+    """Run ``scenario`` against freshly started simulators and return the report."""
+    # Recovery after a failure streak posts a persistent notification.
+    await async_setup_component(hass, "persistent_notification", {})
+    # Log at the default production level so formatting debug and info
+    # records does not show up as integration CPU time.
+    integration_logger = logging.getLogger(Elios4YouCoordinator.__module__.rpartition(".")[0])
+    previous_level = integration_logger.level
+    integration_logger.setLevel(logging.WARNING)
+    farm = SimulatorFarm(scenario.devices, latency=scenario.latency)
+    await farm.start()
+    manager = FAST_MANAGER | scenario.manager
+    coordinators = [_coordinator(hass, sim, i, manager) for i, sim in enumerate(farm.sims)]
+
+    cycle_times: list[float] = []
+    results = {"ok": 0, "failed": 0}
+    max_slots = 0
+
+    async def _device(coordinator: Elios4YouCoordinator, sim: DeviceSimulator) -> None:
+        nonlocal max_slots
+        for cycle in range(scenario.cycles):
+            if scenario.deaf_cycles is not None:
+                start, end = scenario.deaf_cycles
+                sim.faults.deaf = start <= cycle < end
+            if scenario.drop_every and cycle % scenario.drop_every == 0:
+                farm.call(sim.drop_connections)
+            started = time.perf_counter()
+            await coordinator.async_refresh()
+            cycle_times.append(time.perf_counter() - started)
+            results["ok" if coordinator.last_update_success else "failed"] += 1
+            max_slots = max(max_slots, sim.slots_in_use)
+            await asyncio.sleep(scenario.interval)
+
+    lags: list[float] = []
+    stop_probe = asyncio.Event()
+    probe = asyncio.create_task(_probe_loop_lag(lags, stop_probe))
+
+    if trace_allocations:
+        tracemalloc.start()
+        blocks_before = sum(
+            stat.count for stat in tracemalloc.take_snapshot().statistics("filename")
+        )
+        bytes_before = tracemalloc.get_traced_memory()[0]
+    cpu_before = time.thread_time()
+    wall_before = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(_device(coord, sim) for coord, sim in zip(coordinators, farm.sims, strict=True))
+        )
+    finally:
+        wall = time.perf_counter() - wall_before
+        cpu = time.thread_time() - cpu_before
+        stop_probe.set()
+        await probe
+        integration_logger.setLevel(previous_level)
+
+    total_cycles = scenario.devices * scenario.cycles
+    memory: dict[str, float] = {}
+    if trace_allocations:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        blocks_after = sum(stat.count for stat in snapshot.statistics("filename"))
+        memory = {
+            "retained_blocks_per_cycle": (blocks_after - blocks_before) / total_cycles,
+            "retained_bytes_per_cycle": (current - bytes_before) / total_cycles,
+            "traced_peak_kib": peak / 1024,
+        }
+
+    managers = [coord.api.connection_manager for coord in coordinators]
+    report = E2EReport(
+        scenario=scenario.name,
+        devices=scenario.devices,
+        cycles=scenario.cycles,
+        ok=results["ok"],
+        failed=results["failed"],
+        wall_seconds=wall,
+        cycle_ms=_percentiles(cycle_times),
+        loop_lag_ms=_percentiles(lags),
+        cpu_ms_per_device=cpu * 1000 / scenario.devices,
+        cpu_ms_per_cycle=cpu * 1000 / total_cycles,
+        connects=sum(mgr.metrics.connects_succeeded for mgr in managers),
+        forced_aborts=sum(mgr.metrics.forced_aborts for mgr in managers),
+        backoff_entries=sum(mgr.metrics.backoff_entries for mgr in managers),
+        max_slots_in_use=max_slots,
+        **memory,
+    )
+
+    for coordinator in coordinators:
+        await coordinator.api.close()
+    await farm.stop()
+    return report
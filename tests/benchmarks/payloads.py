@@ -0,0 +1,75 @@
+"""Full-size device responses used by the benchmarks.
+
+Each payload has the complete record set of a real reply (every key the
+integration reads, trailing units, echoed command, blank line, separator),
+with CRLF line endings so the ``\\r`` stripping is part of what is measured.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+_DAT_RECORDS = (
+    "Utc Time;2026-05-27 10:42:17",
+    "Produced Power;2.318;kW",
+    "Consumed Power;1.642;kW",
+    "Bought Power;0.000;kW",
+    "Sold Power;0.676;kW",
+    "Daily Peak;3.102;kW",
+    "Monthly Peak;4.457;kW",
+    "Produced Energy;11.47;kWh",
+    "Consumed Energy;8.92;kWh",
+    "Bought Energy;1.03;kWh",
+    "Sold Energy;3.58;kWh",
+    "Alarm 1;0",
+    "Alarm 2;0",
+    "Power Alarm;0",
+    "Relay State;0",
+    "Pwm Mode;0",
+    "Pr Ssv;0",
+    "Rel Ssv;0",
+    "Rel Mode;0",
+    "Rel Warning;0",
+    "Rcap;0",
+)
+
+_STA_RECORDS = tuple(
+    f"{kind} Energy{suffix};{value};kWh"
+    for kind, values in (
+        ("Produced", ("18234.56", "9123.40", "4567.80", "4543.36")),
+        ("Consumed", ("15678.90", "6012.30", "4821.10", "4845.50")),
+        ("Bought", ("7456.12", "2103.45", "2611.20", "2741.47")),
+        ("Sold", ("10011.78", "5214.55", "2357.89", "2439.34")),
+    )
+    for suffix, value in zip(("", " F1", " F2", " F3"), values, strict=True)
+)
+
+_INF_RECORDS = (
+    "sn=E4U00A1B2C3D4",
+    "fwtop=2.13",
+    "fwbtm=1.07",
+    "hwver=1.0",
+    "btver=1.0",
+    "hw_wifi=1.0",
+    "s2w_app_version=2.0.7",
+    "s2w_geps_version=1.4.0",
+    "s2w_wlan_version=4.1.2",
+)
+
+
+def _dat_format(cmd: str, records: tuple[str, ...]) -> str:
+    lines = [cmd, *(f"{i};{record}" for i, record in enumerate(records)), "", "ready..."]
+    return "\r\n".join(lines)
+
+
+def _inf_format(cmd: str, records: tuple[str, ...]) -> str:
+    return "\r\n".join([cmd, *records, "", "ready..."])
+
+
+PAYLOADS: dict[str, str] = {
+    "@dat": _dat_format("@dat", _DAT_RECORDS),
+    "@sta": _dat_format("@sta", _STA_RECORDS),
+    "@inf": _inf_format("@inf", _INF_RECORDS),
+    "@rel": _inf_format("@rel", ("rel=0",)),
+    "@hwr": _inf_format("@hwr", ("hwr=0",)),
+}
@@ -0,0 +1,71 @@
+"""Benchmarks for the per-poll hot path.
+
+Everything here runs on the event loop once per poll for every configured
+device: parsing each reply, merging it into ``api.data``, deriving the
+self-consumption values, copying the connection metrics for the
+diagnostic sensors, building the typed device snapshot and recording the
+exchange trace.
+"""
+
+from __future__ import annotations
+
+from custom_components.fournoks_elios4you.api import Elios4YouAPI
+from custom_components.fournoks_elios4you.trace import ExchangeTrace, TraceKind
+import pytest
+
+from .payloads import PAYLOADS
+
+
+@pytest.mark.parametrize("cmd", list(PAYLOADS))
+def test_parse(benchmark, cmd: str) -> None:
+    """Parse one complete reply of each command format."""
+    result = benchmark(Elios4YouAPI._parse, cmd, PAYLOADS[cmd])
+    assert result
+
+
+@pytest.mark.parametrize(
+    ("cmd", "merge"),
+    [("@dat", "_merge_dat"), ("@sta", "_merge_sta"), ("@inf", "_merge_inf")],
+)
+def test_merge(benchmark, api: Elios4YouAPI, cmd: str, merge: str) -> None:
+    """Merge a parsed reply into ``api.data``."""
+    parsed = Elios4YouAPI._parse(cmd, PAYLOADS[cmd])
+    benchmark(getattr(api, merge), api.data, parsed)
+
+
+def test_update_calculated(benchmark, api: Elios4YouAPI) -> None:
+    """Recompute the derived self-consumption sensors."""
+    benchmark(api._update_calculated, api.data)
+    assert api.data["self_consumed_power"] == round(2.318 - 0.676, 2)
+
+
+def test_update_diagnostic_data(benchmark, api: Elios4YouAPI) -> None:
+    """Publish the connection metrics into ``api.data``."""
+    benchmark(api._update_diagnostic_data, force=True)
+    assert "cm_response_p95_ms" in api.data
+
+
+def test_update_diagnostic_data_throttled(benchmark, api: Elios4YouAPI) -> None:
+    """Per-poll cost of the diagnostics channel between publishes."""
+    benchmark(api._update_diagnostic_data)
+    assert "cm_response_p95_ms" in api.data
+
+
+def test_metrics_snapshot(benchmark, api: Elios4YouAPI) -> None:
+    """Build the metrics snapshot, latency percentiles included."""
+    snapshot = benchmark(api.connection_manager.metrics_snapshot)
+    assert snapshot["connect_p95_ms"] > 0
+
+
+def test_trace_record(benchmark) -> None:
+    """Record one event into a full exchange trace ring buffer."""
+    trace = ExchangeTrace(256)
+    reply = PAYLOADS["@dat"]
+    benchmark(trace.record, 1.0, TraceKind.RECV, "@dat", reply, "ok")
+    assert trace.recorded > 256
+
+
+def test_device_snapshot(benchmark, api: Elios4YouAPI) -> None:
+    """Build the typed snapshot the coordinator publishes each cycle."""
+    snapshot = benchmark(api.device_snapshot)
+    assert snapshot.static.model == "Elios4you"
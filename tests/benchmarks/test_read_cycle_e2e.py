@@ -0,0 +1,70 @@
+"""End-to-end read-cycle runs against local device simulators.
+
+By default each scenario runs at a small size as a smoke test. Scale it up
+and keep the numbers with environment variables, e.g.::
+
+    E4U_E2E_DEVICES=40 E4U_E2E_CYCLES=2000 E4U_E2E_REPORT=e2e.json \\
+        pytest tests/benchmarks/test_read_cycle_e2e.py -s
+
+``E4U_E2E_TRACE=1`` adds the tracemalloc memory figures (slower).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from .e2e import SCENARIOS, run_scenario
+
+
+def _save_report(path: str, name: str, report: dict) -> None:
+    reports = Path(path)
+    existing = json.loads(reports.read_text()) if reports.exists() else {}
+    existing[name] = report
+    reports.write_text(json.dumps(existing, indent=2))
+
+
+def _scaled(name: str):
+    scenario = SCENARIOS[name]
+    changes = {}
+    if devices := os.environ.get("E4U_E2E_DEVICES"):
+        changes["devices"] = int(devices)
+    if cycles := os.environ.get("E4U_E2E_CYCLES"):
+        changes["cycles"] = int(cycles)
+        if scenario.deaf_cycles is not None:
+            # Keep the deaf window at the same relative position.
+            start, end = scenario.deaf_cycles
+            ratio = int(cycles) / scenario.cycles
+            changes["deaf_cycles"] = (int(start * ratio), int(end * ratio))
+    return dataclasses.replace(scenario, **changes)
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+async def test_read_cycle_scenario(hass: HomeAssistant, socket_enabled: None, name: str) -> None:
+    """Run one scenario and check the integration stayed well-behaved."""
+    scenario = _scaled(name)
+    report = await run_scenario(
+        hass, scenario, trace_allocations=os.environ.get("E4U_E2E_TRACE") == "1"
+    )
+    print(report.format())  # noqa: T201
+    if path := os.environ.get("E4U_E2E_REPORT"):
+        await hass.async_add_executor_job(_save_report, path, name, report.as_dict())
+
+    assert report.ok + report.failed == scenario.devices * scenario.cycles
+    # One socket per device at most: the manager never leaks connections.
+    assert report.max_slots_in_use <= 1
+    if name == "steady":
+        assert report.failed == 0
+        assert report.connects == scenario.devices  # every device reused its socket
+    elif name == "reconnect_storm":
+        assert report.failed == 0  # a dropped socket costs a retry, not a failed cycle
+        assert report.connects >= scenario.devices * (scenario.cycles - 1)
+    else:
+        assert report.failed > 0
+        assert report.backoff_entries >= scenario.devices
+        assert report.ok > 0  # the devices recovered after the deaf window
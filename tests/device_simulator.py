@@ -0,0 +1,301 @@
+"""Local Elios4you device simulator.
+
+An asyncio TCP server that speaks the device's line protocol closely enough
+to run the integration, ``e4u-client/e4u.py`` or a benchmark against
+localhost instead of real hardware:
+
+* ``@dat`` / ``@sta`` answer ``index;key;value`` records, ``@inf`` / ``@rel``
+  / ``@hwr`` answer ``key=value`` records, each followed by a blank line and
+  ``ready...``; ``@rel 0 <0|1>`` switches the relay
+* a small socket-slot table like the device's embedded TCP stack: once every
+  slot is taken, new connections are dropped straight after the accept
+* configurable per-command latency and partial (chunked) writes
+
+Faults can be switched on and off at any time through ``sim.faults``:
+
+* ``silent_commands`` / ``silent_next``: read a command but never answer it
+* ``leading_lf``: prepend the stray line feed the device sometimes sends
+* ``chunk_size`` / ``chunk_delay``: dribble replies out in small pieces
+* ``deaf``: accept connections and read commands, answer nothing
+* ``close_wait_on_fin``: on a graceful close (FIN) keep the slot occupied,
+  like the real device's sockets lingering in CLOSE_WAIT; a reset (RST)
+  frees it immediately
+
+Run standalone with ``python -m tests.device_simulator --port 5001``.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Self
+
+SEPARATOR = "ready..."
+
+DEFAULT_DAT: dict[str, str] = {
+    "Produced Power": "2.50",
+    "Consumed Power": "1.80",
+    "Bought Power": "0.10",
+    "Sold Power": "0.80",
+    "Daily Peak": "3.20",
+    "Monthly Peak": "4.50",
+    "Alarm 1": "0",
+    "Alarm 2": "0",
+    "Power Alarm": "0",
+    "Relay State": "0",
+    "PWM Mode": "0",
+    "PR SSV": "0",
+    "Rel SSV": "0",
+    "Rel Mode": "0",
+    "Rel Warning": "0",
+    "RCap": "0",
+    "UTC Time": "12:00:00",
+}
+
+DEFAULT_STA: dict[str, str] = {
+    f"{kind} Energy{suffix}": value
+    for kind, value in (
+        ("Produced", "1234.50"),
+        ("Consumed", "987.60"),
+        ("Bought", "333.30"),
+        ("Sold", "580.20"),
+    )
+    for suffix in ("", " F1", " F2", " F3")
+}
+
+DEFAULT_INF: dict[str, str] = {
+    "sn": "E4USIM000001",
+    "fwtop": "2.13",
+    "fwbtm": "1.07",
+    "hwver": "1.0",
+    "btver": "1.0",
+    "hw_wifi": "1.0",
+    "s2w_app_version": "2.0.0",
+    "s2w_geps_version": "1.0.0",
+    "s2w_wlan_version": "1.0.0",
+}
+
+DEFAULT_HWR: dict[str, str] = {"hwr": "0"}
+
+
+@dataclass
+class SimulatorFaults:
+    """Fault switches; change them on a running simulator."""
+
+    silent_commands: set[str] = field(default_factory=set)
+    silent_next: int = 0
+    leading_lf: bool = False
+    chunk_size: int = 0  # 0 = whole reply in one write
+    chunk_delay: float = 0.0
+    deaf: bool = False
+    close_wait_on_fin: bool = False
+    close_wait_hold: float | None = None  # None = until the simulator stops
+
+
+@dataclass
+class SimulatorStats:
+    """What the simulator has seen so far."""
+
+    accepted: int = 0
+    rejected: int = 0
+    fins: int = 0
+    resets: int = 0
+    commands: list[str] = field(default_factory=list)
+    unanswered: int = 0
+
+
+class DeviceSimulator:
+    """Asyncio TCP server emulating one Elios4you device."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        slots: int = 2,
+        latency: float = 0.0,
+        command_latency: dict[str, float] | None = None,
+        faults: SimulatorFaults | None = None,
+        record_commands: bool = True,
+    ) -> None:
+        """Initialize a stopped simulator; ``port=0`` picks a free port.
+
+        ``record_commands=False`` keeps ``stats.commands`` empty, for long
+        load runs.
+        """
+        self.host = host
+        self.port = port
+        self.slots = slots
+        self.latency = latency
+        self.command_latency = dict(command_latency or {})
+        self.faults = faults or SimulatorFaults()
+        self.stats = SimulatorStats()
+        self.record_commands = record_commands
+
+        self.dat = dict(DEFAULT_DAT)
+        self.sta = dict(DEFAULT_STA)
+        self.inf = dict(DEFAULT_INF)
+        self.hwr = dict(DEFAULT_HWR)
+        self.relay = 0
+
+        self._server: asyncio.Server | None = None
+        self._connections: dict[asyncio.Task[None], asyncio.StreamWriter] = {}
+        self._stopping = asyncio.Event()
+
+    @property
+    def slots_in_use(self) -> int:
+        """Return the number of occupied socket slots."""
+        return len(self._connections)
+
+    async def wait_for_slots(self, in_use: int, timeout: float = 1.0) -> None:
+        """Wait until exactly ``in_use`` slots are occupied (closes land asynchronously)."""
+        async with asyncio.timeout(timeout):
+            while self.slots_in_use != in_use:
+                await asyncio.sleep(0.005)
+
+    async def start(self) -> None:
+        """Start listening; ``self.port`` holds the bound port afterwards."""
+        self._stopping.clear()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop listening and drop every open connection."""
+        self._stopping.set()
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        for task in list(self._connections):
+            with suppress(asyncio.CancelledError):
+                await task
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    def drop_connections(self) -> None:
+        """Reset every open connection, as a device reboot or WiFi drop would."""
+        for writer in self._connections.values():
+            writer.transport.abort()
+
+    async def __aenter__(self) -> Self:
+        """Start the simulator."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop the simulator."""
+        await self.stop()
+
+    # ------------------------------------------------------------------ #
+    # Protocol
+    # ------------------------------------------------------------------ #
+
+    def response(self, line: str) -> str:
+        """Return the full reply to one command line (without latency or faults)."""
+        cmd, *args = line.lower().split()
+        if cmd == "@rel" and len(args) == 2 and args[1] in ("0", "1"):
+            self.relay = int(args[1])
+            self.dat["Relay State"] = args[1]
+            records = [f"rel={self.relay}"]
+        elif cmd == "@dat":
+            records = [f"{i};{key};{value}" for i, (key, value) in enumerate(self.dat.items())]
+        elif cmd == "@sta":
+            records = [f"{i};{key};{value}" for i, (key, value) in enumerate(self.sta.items())]
+        elif cmd == "@inf":
+            records = [f"{key}={value}" for key, value in self.inf.items()]
+        elif cmd == "@rel":
+            records = [f"rel={self.relay}"]
+        elif cmd == "@hwr":
+            records = [f"{key}={value}" for key, value in self.hwr.items()]
+        else:
+            records = []
+        return "\n".join([line, *records, "", SEPARATOR])
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection for as long as it holds a slot."""
+        if self.slots_in_use >= self.slots:
+            # Socket table full: the device drops the connection right away.
+            self.stats.rejected += 1
+            writer.transport.abort()
+            return
+
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections[task] = writer
+        self.stats.accepted += 1
+        try:
+            await self._serve(reader, writer)
+        except (ConnectionResetError, BrokenPipeError):
+            self.stats.resets += 1
+        finally:
+            self._connections.pop(task, None)
+            writer.transport.abort()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while line := await reader.readline():
+            text = line.decode("utf-8", "replace").strip()
+            if not text:
+                continue
+            if self.record_commands:
+                self.stats.commands.append(text)
+            if self._is_silent(text):
+                self.stats.unanswered += 1
+                continue
+            await self._reply(writer, text)
+
+        # EOF: the client closed gracefully (FIN).
+        self.stats.fins += 1
+        if self.faults.close_wait_on_fin:
+            # Never close our side: the slot stays in CLOSE_WAIT.
+            if self.faults.close_wait_hold is None:
+                await self._stopping.wait()
+            else:
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._stopping.wait(), self.faults.close_wait_hold)
+
+    def _is_silent(self, text: str) -> bool:
+        faults = self.faults
+        if faults.deaf or text.split(maxsplit=1)[0].lower() in faults.silent_commands:
+            return True
+        if faults.silent_next > 0:
+            faults.silent_next -= 1
+            return True
+        return False
+
+    async def _reply(self, writer: asyncio.StreamWriter, text: str) -> None:
+        delay = self.command_latency.get(text.split(maxsplit=1)[0].lower(), self.latency)
+        if delay:
+            await asyncio.sleep(delay)
+        payload = self.response(text).encode()
+        if self.faults.leading_lf:
+            payload = b"\n" + payload
+
+        size = self.faults.chunk_size or len(payload)
+        for start in range(0, len(payload), size):
+            if start and self.faults.chunk_delay:
+                await asyncio.sleep(self.faults.chunk_delay)
+            writer.write(payload[start : start + size])
+            await writer.drain()
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local Elios4you device simulator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--slots", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per reply")
+    args = parser.parse_args()
+
+    async with DeviceSimulator(args.host, args.port, slots=args.slots, latency=args.latency) as sim:
+        print(f"Elios4you simulator listening on {sim.host}:{sim.port}")  # noqa: T201
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_main())
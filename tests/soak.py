@@ -0,0 +1,275 @@
+"""Accelerated-time soak harness for ConnectionManager.
+
+Runs a real ``ConnectionManager`` on a ``ManualClock`` against an in-memory
+device whose transport answers instantly in simulated time, so days of
+polling every ``interval`` seconds play out in a few seconds. A scripted,
+daily-repeating fault schedule switches the device between healthy and
+failing modes:
+
+* ``refuse``: connection refused (device rebooting)
+* ``connect_timeout``: the connect hangs until it times out
+* ``silent``: connections are accepted, commands are never answered (deaf)
+* ``reset``: the device resets the connection mid-read
+* ``eof``: the device closes the connection instead of answering
+* ``stall``: only the first command of every write is answered, which
+  breaks pipelining
+* ``flaky``: every third command goes unanswered
+
+After every poll the harness checks the manager's invariants and records any
+violation in the report:
+
+* never more than one socket open at the device
+* no socket is opened while a backoff window is running
+* a failed poll leaves no socket open, and sockets are only ever closed with
+  RST; the single graceful close (FIN) is the final ``close()``
+* the backoff window never exceeds ``backoff_max``
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from unittest.mock import patch
+
+from custom_components.fournoks_elios4you import connection_manager as cm
+from custom_components.fournoks_elios4you.clock import ManualClock
+from custom_components.fournoks_elios4you.connection_manager import (
+    ConnectionManager,
+    ConnectionManagerError,
+    ConnectionState,
+    ConnectionUnavailableError,
+)
+from custom_components.fournoks_elios4you.transport import DeviceTransport
+
+from tests.device_simulator import DeviceSimulator
+
+DAY = 86400.0
+
+HEALTHY = "ok"
+FAULTS = ("refuse", "connect_timeout", "silent", "reset", "eof", "stall", "flaky")
+
+
+@dataclass(frozen=True)
+class FaultWindow:
+    """``fault`` is active from ``start`` for ``duration`` seconds of every day."""
+
+    start: float
+    duration: float
+    fault: str
+
+
+# One simulated day: every fault mode, including windows long enough to
+# drive the manager deep into (capped) backoff.
+DAILY_SCHEDULE: tuple[FaultWindow, ...] = (
+    FaultWindow(2 * 3600, 600, "refuse"),
+    FaultWindow(6 * 3600, 1800, "silent"),
+    FaultWindow(9 * 3600, 300, "reset"),
+    FaultWindow(12 * 3600, 120, "connect_timeout"),
+    FaultWindow(15 * 3600, 120, "stall"),
+    FaultWindow(18 * 3600, 180, "eof"),
+    FaultWindow(21 * 3600, 900, "flaky"),
+)
+
+# Manager settings: the production timeouts and backoff, in simulated seconds.
+SOAK_MANAGER: dict[str, float] = {
+    "connect_timeout": 5.0,
+    "read_timeout": 5.0,
+    "backoff_initial": 5.0,
+    "backoff_max": 60.0,
+}
+
+
+def fault_at(schedule: Sequence[FaultWindow], seconds: float) -> str:
+    """Return the fault active ``seconds`` after the start of the run."""
+    offset = seconds % DAY
+    for window in schedule:
+        if window.start <= offset < window.start + window.duration:
+            return window.fault
+    return HEALTHY
+
+
+class SoakDevice:
+    """In-memory device: opens transports and tracks every socket."""
+
+    def __init__(self, clock: ManualClock, *, latency: float = 0.05) -> None:
+        """Initialize a healthy device answering after ``latency`` simulated seconds."""
+        self.clock = clock
+        self.latency = latency
+        self.fault = HEALTHY
+        self.replies = DeviceSimulator()  # protocol only, never started
+        self.open: set[SoakTransport] = set()
+        self.max_open = 0
+        self.opened = 0
+        self.resets = 0
+        self.fins = 0
+        self.commands = 0
+        self.violations: list[str] = []
+        # Called on every open; returns a violation message or "".
+        self.open_guard: Callable[[], str] = lambda: ""
+
+    async def open_transport(self, *_args: object) -> DeviceTransport:
+        """Stand-in for ``transport.open_transport``."""
+        if self.fault == "refuse":
+            raise ConnectionRefusedError("connection refused")
+        if self.fault == "connect_timeout":
+            await self.clock.sleep(SOAK_MANAGER["connect_timeout"])
+            raise TimeoutError
+        if message := self.open_guard():
+            self.violations.append(message)
+        transport = SoakTransport(self)
+        self.open.add(transport)
+        self.opened += 1
+        self.max_open = max(self.max_open, len(self.open))
+        if len(self.open) > 1:
+            self.violations.append(f"{len(self.open)} sockets open at {self.clock.monotonic()}")
+        return transport
+
+
+class SoakTransport(DeviceTransport):
+    """One connection to a ``SoakDevice``."""
+
+    def __init__(self, device: SoakDevice) -> None:
+        """Initialize an open connection."""
+        self._device = device
+        self._pending: list[bytes] = []
+        self._closed = False
+
+    def write(self, data: bytes) -> None:
+        """Queue the replies to every command line in ``data``."""
+        device = self._device
+        for index, line in enumerate(data.decode().splitlines()):
+            device.commands += 1
+            if device.fault in ("silent", "reset", "eof"):
+                continue
+            if device.fault == "stall" and index > 0:
+                continue
+            if device.fault == "flaky" and device.commands % 3 == 0:
+                continue
+            self._pending.append(device.replies.response(line).encode())
+
+    async def drain(self) -> None:
+        """Nothing to flush."""
+
+    async def read(self, n: int) -> bytes:
+        """Return the next reply, or fail the way the active fault dictates."""
+        device = self._device
+        if device.fault == "reset":
+            raise ConnectionResetError("connection reset by peer")
+        if device.fault == "eof":
+            return b""
+        if not self._pending:
+            # Nothing will ever come: let the read time out in simulated time.
+            await device.clock.sleep(SOAK_MANAGER["read_timeout"])
+            raise TimeoutError
+        await device.clock.sleep(device.latency)
+        return self._pending.pop(0)[:n]
+
+    def is_closing(self) -> bool:
+        """Return True once closed."""
+        return self._closed
+
+    def abort(self) -> None:
+        """Drop the connection with RST."""
+        if not self._closed:
+            self._device.resets += 1
+        self._release()
+
+    async def close(self, timeout: float) -> None:
+        """Close gracefully (FIN)."""
+        if not self._closed:
+            self._device.fins += 1
+        self._release()
+
+    def _release(self) -> None:
+        self._closed = True
+        self._device.open.discard(self)
+
+
+@dataclass
+class SoakReport:
+    """Outcome of one soak run."""
+
+    days: float
+    polls: int = 0
+    ok: int = 0
+    failed: int = 0
+    refused: int = 0
+    connects: int = 0
+    resets: int = 0
+    fins: int = 0
+    backoff_entries: int = 0
+    max_backoff: float = 0.0
+    max_open: int = 0
+    polls_by_fault: dict[str, int] = field(default_factory=dict)
+    violations: list[str] = field(default_factory=list)
+
+
+async def run_soak(
+    days: float = 1.0,
+    *,
+    interval: float = 10.0,
+    schedule: Sequence[FaultWindow] = DAILY_SCHEDULE,
+    commands: Sequence[str] = ("@dat", "@sta"),
+    **manager_kwargs: float | bool,
+) -> SoakReport:
+    """Poll a ``SoakDevice`` every ``interval`` simulated seconds for ``days``."""
+    clock = ManualClock()
+    device = SoakDevice(clock)
+    kwargs = SOAK_MANAGER | manager_kwargs
+    manager = ConnectionManager("soak.invalid", 5001, clock=clock, **kwargs)
+    backoff_max = float(kwargs["backoff_max"])
+    metrics = manager.metrics
+
+    def _open_guard() -> str:
+        if metrics.backoff_until > clock.time():
+            return f"socket opened during backoff at {clock.monotonic()}"
+        return ""
+
+    device.open_guard = _open_guard
+    report = SoakReport(days=days)
+    violations = device.violations
+
+    with patch.object(cm, "open_transport", device.open_transport):
+        while clock.monotonic() < days * DAY:
+            device.fault = fault_at(schedule, clock.monotonic())
+            report.polls_by_fault[device.fault] = report.polls_by_fault.get(device.fault, 0) + 1
+            report.polls += 1
+            fins = device.fins
+            try:
+                await manager.execute_batch(commands)
+            except ConnectionUnavailableError:
+                report.refused += 1
+            except ConnectionManagerError:
+                report.failed += 1
+                if device.open:
+                    violations.append(f"socket left open after failure at {clock.monotonic()}")
+            else:
+                report.ok += 1
+
+            if device.fins != fins:
+                violations.append(f"graceful close (FIN) at {clock.monotonic()}")
+            if metrics.current_backoff_duration > backoff_max:
+                violations.append(
+                    f"backoff {metrics.current_backoff_duration}s > {backoff_max}s "
+                    f"at {clock.monotonic()}"
+                )
+            if metrics.state is ConnectionState.BACKOFF:
+                window = metrics.backoff_until - clock.time()
+                report.max_backoff = max(report.max_backoff, window)
+                if window > backoff_max:
+                    violations.append(f"backoff window {window}s at {clock.monotonic()}")
+            await clock.sleep(interval)
+
+        await manager.close()
+
+    if device.open:
+        violations.append(f"{len(device.open)} sockets open after close()")
+    report.connects = device.opened
+    report.resets = device.resets
+    report.fins = device.fins
+    report.backoff_entries = metrics.backoff_entries
+    report.max_open = device.max_open
+    report.violations = violations
+    return report
@@ -0,0 +1,98 @@
+"""Tests for the adaptive poll interval.
+
+Covers:
+* the interval dropping to the floor on a power change
+* noise around a flat load staying inside the power band
+* stretching toward the ceiling while stable
+* going straight to the ceiling at night without production
+* reset() returning to the base interval
+"""
+
+from __future__ import annotations
+
+from custom_components.fournoks_elios4you.adaptive import AdaptiveInterval
+import pytest
+
+
+def _interval() -> AdaptiveInterval:
+    return AdaptiveInterval(60, floor=15, ceiling=300, power_delta=0.1, power_ratio=0.2)
+
+
+def test_first_cycle_stretches_from_base() -> None:
+    """Without a previous cycle there is no delta: the interval grows."""
+    adaptive = _interval()
+    assert adaptive.update((2.0, 1.0)) == pytest.approx(90)
+
+
+def test_power_change_drops_to_floor() -> None:
+    """A change of at least power_delta in any power drops to the floor."""
+    adaptive = _interval()
+    adaptive.update((2.0, 1.0))
+
+    assert adaptive.update((2.0, 1.3)) == 15
+    assert adaptive.update((2.05, 1.3)) == pytest.approx(22.5)
+
+
+def test_noisy_flat_load_stays_at_base() -> None:
+    """Household noise around a flat load never drops the interval below the base."""
+    adaptive = _interval()
+    consumed = [1.0, 1.15, 0.9, 1.12, 0.95, 1.18, 0.85, 1.1]
+
+    intervals = [adaptive.update((0.0, power)) for power in consumed]
+
+    assert min(intervals) >= 60
+
+
+def test_band_moves_with_the_power() -> None:
+    """After a step the band is centred on the new level, and small loads need an absolute change."""
+    adaptive = _interval()
+    adaptive.update((3.0, 0.2))
+    assert adaptive.update((2.0, 0.2)) == 15
+    # 2.0 kW ± 0.4: a drift toward the old level stays inside the new band
+    assert adaptive.update((2.3, 0.25)) == pytest.approx(22.5)
+    # 0.2 kW ± 0.1 (the absolute minimum): a 0.15 kW step leaves it
+    assert adaptive.update((2.3, 0.35)) == 15
+
+
+def test_floor_never_above_base() -> None:
+    """A floor above the scan interval is capped to it."""
+    adaptive = AdaptiveInterval(10, floor=15, ceiling=300, power_delta=0.1)
+    adaptive.update((1.0,))
+    assert adaptive.update((5.0,)) == 10
+
+
+def test_stable_values_stretch_to_ceiling() -> None:
+    """Stable cycles grow the interval geometrically, capped at the ceiling."""
+    adaptive = _interval()
+    intervals = [adaptive.update((2.0, 1.0)) for _ in range(10)]
+
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == 300
+
+
+def test_night_without_production_goes_to_ceiling() -> None:
+    """At night, once nothing is produced, polling slows down at once."""
+    adaptive = _interval()
+    adaptive.update((0.0, 0.4))
+
+    assert adaptive.update((0.0, 0.4), night=True) == 300
+    # A consumption change is still followed closely
+    assert adaptive.update((0.0, 2.4), night=True) == 15
+    # Production at night (sun state lagging) is treated as daytime
+    assert adaptive.update((0.5, 2.4), night=True) == 15
+
+
+def test_reset_returns_to_base() -> None:
+    """A reset forgets the last cycle and returns to the base interval."""
+    adaptive = _interval()
+    adaptive.update((2.0, 1.0))
+    adaptive.update((3.0, 1.0))
+
+    assert adaptive.reset() == 60
+    assert adaptive.update((9.0, 9.0)) == pytest.approx(90)
+
+
+def test_ceiling_never_below_base() -> None:
+    """A scan interval above the ceiling raises the ceiling to it."""
+    adaptive = AdaptiveInterval(600, floor=10, ceiling=300, power_delta=0.1)
+    assert adaptive.update((1.0,)) == 600
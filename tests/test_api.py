@@ -15,15 +15,25 @@ ConnectionManager itself is covered in test_connection_manager.py.
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Direct imports using symlink (fournoks_elios4you -> 4noks_elios4you)
+from custom_components.fournoks_elios4you import api as _elios4you_api
 from custom_components.fournoks_elios4you.api import (
     Elios4YouAPI,
     TelnetCommandError,
     TelnetConnectionError,
 )
-from custom_components.fournoks_elios4you.const import CONN_TIMEOUT, MANUFACTURER, MODEL
+from custom_components.fournoks_elios4you.connection_manager import ConnectionState
+from custom_components.fournoks_elios4you.const import (
+    CONN_TIMEOUT,
+    MANUFACTURER,
+    MODEL,
+    RELAY_CONFIRMED_MAX_AGE,
+)
+from custom_components.fournoks_elios4you.scheduler import CommandPriority
 import pytest
 
 from .conftest import TEST_HOST, TEST_NAME, TEST_PORT, TEST_SERIAL_NUMBER
@@ -91,6 +101,199 @@ class TestApiInit:
         assert api.data["cm_commands_sent"] == 0
 
 
+class TestDiagnosticChannel:
+    """The cm_ metrics are published on their own, throttled channel."""
+
+    def test_publish_throttled_within_interval(self, mock_hass) -> None:
+        """Metrics are not republished until the diagnostic interval elapsed."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, diagnostic_interval=300)
+        api.connection_manager.metrics.commands_sent = 5
+
+        api._update_diagnostic_data()
+        assert api.data["cm_commands_sent"] == 0
+
+        api._diagnostics_published_at -= 301
+        api._update_diagnostic_data()
+        assert api.data["cm_commands_sent"] == 5
+
+    def test_state_change_publishes_at_once(self, mock_hass) -> None:
+        """A connection state change bypasses the throttle."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, diagnostic_interval=300)
+        api.connection_manager.metrics.state = ConnectionState.BACKOFF
+
+        api._update_diagnostic_data()
+        assert api.data["cm_state"] == "backoff"
+
+    def test_force_publishes(self, mock_hass) -> None:
+        """``force`` publishes regardless of the interval."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, diagnostic_interval=300)
+        api.connection_manager.metrics.commands_sent = 5
+
+        api._update_diagnostic_data(force=True)
+        assert api.data["cm_commands_sent"] == 5
+
+
+class TestGenerations:
+    """Device values are swapped in whole, as numbered generations."""
+
+    @pytest.mark.asyncio
+    async def test_cycle_swaps_in_a_new_dict(self, mock_hass) -> None:
+        """A read cycle publishes a new dict and bumps the generation once."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api.connection_manager.execute_batch = AsyncMock(side_effect=TestRefreshTiers._reply)
+        before, generation = api.data, api.generation
+
+        await api.async_get_data()
+
+        assert api.data is not before
+        assert before["sn"] == ""
+        assert api.data["sn"] == TEST_SERIAL_NUMBER
+        assert api.generation == generation + 1
+        assert api.captured_at > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_cycle_publishes_nothing(self, mock_hass) -> None:
+        """A cycle that fails leaves the current dict untouched."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api.connection_manager.execute_batch = AsyncMock(side_effect=TestRefreshTiers._reply)
+        # An unexpected error after @dat and @sta were merged: neither is published
+        api._merge_inf = MagicMock(side_effect=RuntimeError("bad @inf"))
+        before = api.data
+
+        with pytest.raises(RuntimeError):
+            await api.async_get_data()
+
+        assert api.data is before
+        assert api.data["produced_power"] == 1
+        assert api._refreshed_at["@sta"] == 0.0
+
+    def test_snapshot_rebuilt_only_for_a_new_generation(self, mock_hass) -> None:
+        """device_snapshot() is cached per generation and stamped with it."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        snapshot = api.device_snapshot()
+        assert api.device_snapshot() is snapshot
+        assert snapshot.generation == api.generation
+
+        api._publish({"relay_state": 0})
+        assert api.device_snapshot() is not snapshot
+        assert api.device_snapshot().generation == snapshot.generation + 1
+        assert snapshot.measurements.relay_state == 1
+
+
+class TestPartialCycles:
+    """Commands of a cycle succeed or fail on their own; keys record their freshness."""
+
+    @staticmethod
+    def _failing_after(answered: int):
+        """Return an execute_batch that answers ``answered`` commands, then fails."""
+
+        def _execute(cmds: list[str], **_kwargs) -> list[str]:
+            err = TelnetCommandError(cmds[answered], "silent_timeout")
+            err.replies = tuple(TestRefreshTiers._reply(cmds[:answered]))
+            raise err
+
+        return _execute
+
+    @pytest.mark.asyncio
+    async def test_failed_inf_keeps_dat_and_sta(self, mock_hass) -> None:
+        """@dat and @sta are published; only @inf is retried by the next cycle."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, status_interval=60)
+        api.connection_manager.execute_batch = AsyncMock(side_effect=self._failing_after(2))
+
+        assert await api.async_get_data() is True
+
+        assert api.data["produced_power"] == 2.5
+        assert api.data["produced_energy"] == 100
+        assert api.data["sn"] == ""
+        assert api.command_status == {"@dat": "ok", "@sta": "ok", "@inf": "silent_timeout"}
+        assert api.updated_at["produced_power"][0] == "@dat"
+        assert api.updated_at["produced_energy"][0] == "@sta"
+        assert api.updated_at["sn"] == ("", 0.0)
+
+        api.connection_manager.execute_batch = AsyncMock(side_effect=TestRefreshTiers._reply)
+        await api.async_get_data()
+
+        assert api.connection_manager.execute_batch.await_args.args[0] == ("@dat", "@inf")
+        assert api.data["sn"] == TEST_SERIAL_NUMBER
+        assert api.command_status["@inf"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_failed_dat_fails_the_cycle(self, mock_hass) -> None:
+        """Without @dat nothing is published, even if later replies arrived."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api.connection_manager.execute_batch = AsyncMock(side_effect=self._failing_after(0))
+        before = api.data
+
+        with pytest.raises(TelnetCommandError):
+            await api.async_get_data()
+
+        assert api.data["produced_power"] == before["produced_power"] == 1
+        assert api.command_status["@dat"] != "ok"
+        assert api._refreshed_at["@dat"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_stale_keys_follow_each_commands_max_age(self, mock_hass) -> None:
+        """Unreported keys are stale; read keys go stale past their command's max age."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        assert "produced_power" in api.stale_keys(time.time(), {})
+        assert "cm_state" not in api.stale_keys(time.time(), {})
+
+        api.connection_manager.execute_batch = AsyncMock(side_effect=TestRefreshTiers._reply)
+        await api.async_get_data()
+        now = time.time()
+
+        assert "produced_power" not in api.stale_keys(now, {})
+        assert "self_consumed_power" not in api.stale_keys(now, {})
+        stale = api.stale_keys(now + 100, {"@dat": 60, "@sta": 300})
+        assert "produced_power" in stale
+        assert "self_consumed_power" in stale
+        assert "produced_energy" not in stale
+        assert "sn" not in stale
+
+    def test_restore_keeps_persisted_freshness(self, mock_hass) -> None:
+        """Restored values age from when they were read, or never if that is unknown."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+
+        api.restore(
+            {"produced_power": 2.5, "produced_energy": 100.0},
+            {"produced_power": ["@dat", 1_000.0]},
+        )
+
+        assert api.updated_at["produced_power"] == ("@dat", 1_000.0)
+        assert api.updated_at["produced_energy"][0] == ""
+        assert api.stale_keys(2_000.0, {"@dat": 60}) >= {"produced_power"}
+        assert "produced_energy" not in api.stale_keys(time.time() + 1e6, {"@dat": 60})
+
+
+class TestSnapshot:
+    """Persisted snapshots carry device values, not live connection metrics."""
+
+    def test_snapshot_excludes_connection_metrics(self, mock_hass) -> None:
+        """snapshot() drops the cm_ keys and keeps device values."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api.data["sn"] = "E4U123456789"
+        snapshot = api.snapshot()
+        assert snapshot["sn"] == "E4U123456789"
+        assert snapshot["produced_power"] == 1
+        assert not any(key.startswith("cm_") for key in snapshot)
+
+    def test_restore_sets_values_and_keeps_metrics_live(self, mock_hass) -> None:
+        """restore() takes plain values and ignores cm_ keys and other types."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api.restore(
+            {
+                "sn": "E4U123456789",
+                "produced_power": 2.5,
+                "cm_state": "ready",
+                "bogus": ["not", "a", "value"],
+            }
+        )
+        assert api.data["sn"] == "E4U123456789"
+        assert api.data["produced_power"] == 2.5
+        assert api.data["cm_state"] == "disconnected"
+        assert "bogus" not in api.data
+
+
 class TestParsing:
     """Static response parser covers both line formats and the awkward LF cases."""
 
@@ -157,7 +360,7 @@ class TestAsyncGetData:
         sta_raw = "@sta\n0;daily_peak;3.2\n1;monthly_peak;4.5\n\nready..."
         inf_raw = f"@inf\nsn={TEST_SERIAL_NUMBER}\nfwtop=1.0\nfwbtm=2.0\nhwver=3.0\n\nready..."
 
-        api.connection_manager.execute = AsyncMock(side_effect=[dat_raw, sta_raw, inf_raw])
+        api.connection_manager.execute_batch = AsyncMock(return_value=[dat_raw, sta_raw, inf_raw])
 
         assert await api.async_get_data() is True
 
@@ -173,7 +376,9 @@ class TestAsyncGetData:
     async def test_dat_failure_propagates(self, mock_hass) -> None:
         """If @dat fails, the cycle raises and diagnostics still get refreshed."""
         api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
-        api.connection_manager.execute = AsyncMock(side_effect=TelnetCommandError("@dat", "boom"))
+        api.connection_manager.execute_batch = AsyncMock(
+            side_effect=TelnetCommandError("@dat", "boom")
+        )
 
         with pytest.raises(TelnetCommandError):
             await api.async_get_data()
@@ -185,7 +390,7 @@ class TestAsyncGetData:
     async def test_connection_failure_propagates(self, mock_hass) -> None:
         """A TelnetConnectionError from the manager bubbles up."""
         api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
-        api.connection_manager.execute = AsyncMock(
+        api.connection_manager.execute_batch = AsyncMock(
             side_effect=TelnetConnectionError(TEST_HOST, TEST_PORT, CONN_TIMEOUT)
         )
 
@@ -215,7 +420,7 @@ class TestAsyncGetData:
         sta_raw = "@sta\n0;daily_peak;3.2\n1;monthly_peak;4.5\n\nready..."
         inf_raw = f"@inf\nsn={TEST_SERIAL_NUMBER}\nfwtop=1.0\nfwbtm=2.0\nhwver=3.0\n\nready..."
 
-        api.connection_manager.execute = AsyncMock(side_effect=[dat_raw, sta_raw, inf_raw])
+        api.connection_manager.execute_batch = AsyncMock(return_value=[dat_raw, sta_raw, inf_raw])
 
         assert await api.async_get_data() is True
         # produced_power keeps its seeded value (1) because parse was skipped
@@ -224,13 +429,237 @@ class TestAsyncGetData:
         assert api.data["consumed_power"] == 1.8
 
 
+class TestRefreshTiers:
+    """@dat every cycle, @sta on its own cadence, @inf at startup / recovery / TTL."""
+
+    DAT_RAW = "@dat\n0;produced_power;2.5\n\nready..."
+    STA_RAW = "@sta\n0;produced_energy;100\n\nready..."
+    INF_RAW = f"@inf\nsn={TEST_SERIAL_NUMBER}\nfwtop=1.0\nfwbtm=2.0\n\nready..."
+
+    @staticmethod
+    def _reply(cmds: list[str], **_kwargs) -> list[str]:
+        raws = {
+            "@dat": TestRefreshTiers.DAT_RAW,
+            "@sta": TestRefreshTiers.STA_RAW,
+            "@inf": TestRefreshTiers.INF_RAW,
+        }
+        return [raws[cmd] for cmd in cmds]
+
+    @pytest.mark.asyncio
+    async def test_first_cycle_reads_every_tier(self, mock_hass) -> None:
+        """Nothing has been read yet, so all three commands are due."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api.connection_manager.execute_batch = AsyncMock(side_effect=self._reply)
+
+        await api.async_get_data()
+
+        api.connection_manager.execute_batch.assert_awaited_once()
+        assert api.connection_manager.execute_batch.await_args.args[0] == ("@dat", "@sta", "@inf")
+        assert api.data["swver"] == "1.0 / 2.0"
+
+    @pytest.mark.asyncio
+    async def test_second_cycle_reads_only_dat(self, mock_hass) -> None:
+        """Within the status interval and the static TTL, only @dat is sent."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, status_interval=60)
+        api.connection_manager.execute_batch = AsyncMock(side_effect=self._reply)
+
+        await api.async_get_data()
+        await api.async_get_data()
+
+        assert api.connection_manager.execute_batch.await_args.args[0] == ("@dat",)
+        # Cached static info and derived values survive the @dat-only cycle.
+        assert api.data["sn"] == TEST_SERIAL_NUMBER
+        assert api.data["self_consumed_energy"] == 100 - 1
+
+    @pytest.mark.asyncio
+    async def test_status_tier_due_after_interval(self, mock_hass) -> None:
+        """@sta comes back once its interval has elapsed; @inf stays cached."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, status_interval=60)
+        api.connection_manager.execute_batch = AsyncMock(side_effect=self._reply)
+        await api.async_get_data()
+
+        api._refreshed_at["@sta"] -= 61
+        assert api._due_commands(time.time()) == ("@dat", "@sta")
+
+    @pytest.mark.asyncio
+    async def test_status_tier_due_every_poll_at_equal_intervals(self, mock_hass) -> None:
+        """With status and scan interval both 60 s, every poll sends @sta.
+
+        The cycle's own duration, and a poll firing a little early, must not
+        push @sta to every other poll.
+        """
+        now = 1_000_000.0
+
+        def _reply(cmds: list[str], **_kwargs) -> list[str]:
+            nonlocal now
+            now += 2.5  # the read cycle takes a while
+            return self._reply(cmds)
+
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, status_interval=60)
+        api.connection_manager.execute_batch = AsyncMock(side_effect=_reply)
+        fake_time = MagicMock(wraps=time)
+        fake_time.time.side_effect = lambda: now
+
+        with patch.object(_elios4you_api, "time", fake_time):
+            await api.async_get_data()
+            now = 1_000_000.0 + 60 - 0.2
+            await api.async_get_data()
+            now = 1_000_000.0 + 120
+            await api.async_get_data()
+
+        sent = [call.args[0] for call in api.connection_manager.execute_batch.await_args_list]
+        assert sent == [("@dat", "@sta", "@inf"), ("@dat", "@sta"), ("@dat", "@sta")]
+
+    @pytest.mark.asyncio
+    async def test_static_tier_due_after_ttl(self, mock_hass) -> None:
+        """@inf is re-read once the static-info TTL expires."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, static_info_ttl=3600)
+        api.connection_manager.execute_batch = AsyncMock(side_effect=self._reply)
+        await api.async_get_data()
+
+        api._refreshed_at["@inf"] -= 3601
+        assert "@inf" in api._due_commands(time.time())
+
+    @pytest.mark.asyncio
+    async def test_static_tier_due_after_failure(self, mock_hass) -> None:
+        """A connection failure since the last @inf read forces a re-read."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api.connection_manager.execute_batch = AsyncMock(side_effect=self._reply)
+        await api.async_get_data()
+
+        api.connection_manager.metrics.last_failure_at = time.time() + 1
+        assert "@inf" in api._due_commands(time.time())
+
+    @pytest.mark.asyncio
+    async def test_failed_cycle_keeps_tiers_due(self, mock_hass) -> None:
+        """A failed batch does not mark @sta/@inf as refreshed."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api.connection_manager.execute_batch = AsyncMock(
+            side_effect=TelnetCommandError("@dat", "boom")
+        )
+
+        with pytest.raises(TelnetCommandError):
+            await api.async_get_data()
+
+        assert api._due_commands(time.time()) == ("@dat", "@sta", "@inf")
+
+
+class TestSingleFlight:
+    """Concurrent identical reads share one request to the device."""
+
+    @staticmethod
+    def _gated_batch(gate: asyncio.Event) -> AsyncMock:
+        async def _batch(cmds: tuple[str, ...], **_kwargs) -> list[str]:
+            await gate.wait()
+            return TestRefreshTiers._reply(cmds)
+
+        return AsyncMock(side_effect=_batch)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cycles_share_one_batch(self, mock_hass) -> None:
+        """Two overlapping async_get_data calls send a single batch."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        gate = asyncio.Event()
+        api.connection_manager.execute_batch = self._gated_batch(gate)
+
+        first = asyncio.create_task(api.async_get_data())
+        second = asyncio.create_task(api.async_get_data())
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await asyncio.gather(first, second) == [True, True]
+        api.connection_manager.execute_batch.assert_awaited_once()
+
+        # Once finished, the next cycle goes to the device again.
+        await api.async_get_data()
+        assert api.connection_manager.execute_batch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_failure_reaches_every_caller(self, mock_hass) -> None:
+        """All joined callers see the same exception from the single request."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        gate = asyncio.Event()
+
+        async def _fail(cmds: tuple[str, ...], **_kwargs) -> list[str]:
+            await gate.wait()
+            raise TelnetCommandError("@dat", "silent_timeout")
+
+        api.connection_manager.execute_batch = AsyncMock(side_effect=_fail)
+
+        callers = [asyncio.create_task(api.async_get_data()) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+
+        assert all(isinstance(result, TelnetCommandError) for result in results)
+        api.connection_manager.execute_batch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_abort_shared_cycle(self, mock_hass) -> None:
+        """Cancelling one waiter leaves the shared request running for the others."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        gate = asyncio.Event()
+        api.connection_manager.execute_batch = self._gated_batch(gate)
+
+        first = asyncio.create_task(api.async_get_data())
+        second = asyncio.create_task(api.async_get_data())
+        await asyncio.sleep(0)
+        first.cancel()
+        gate.set()
+
+        assert await second is True
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert api.data["produced_power"] == 2.5
+
+    @pytest.mark.asyncio
+    async def test_cycle_after_relay_write_is_not_shared(self, mock_hass) -> None:
+        """A cycle requested after a relay write never joins one started before it."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        gate = asyncio.Event()
+        api.connection_manager.execute_batch = self._gated_batch(gate)
+        api.connection_manager.execute = AsyncMock(return_value="@rel\nrel=1\n\nready...")
+
+        before = asyncio.create_task(api.async_get_data())
+        await asyncio.sleep(0)
+        assert await api.telnet_set_relay("on") is True
+        after = asyncio.create_task(api.async_get_data())
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(before, after)
+
+        assert api.connection_manager.execute_batch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_reads_are_shared_writes_are_not(self, mock_hass) -> None:
+        """Read-only commands are single-flight; commands with arguments always go out."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        gate = asyncio.Event()
+
+        async def _execute(cmd: str, **_kwargs) -> str:
+            await gate.wait()
+            return "@rel\nrel=1\n\nready..."
+
+        api.connection_manager.execute = AsyncMock(side_effect=_execute)
+
+        reads = [asyncio.create_task(api._command("@rel")) for _ in range(2)]
+        writes = [asyncio.create_task(api._command("@rel 0 1")) for _ in range(2)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*reads, *writes)
+
+        assert all(result == {"rel": "1"} for result in results)
+        sent = [call.args[0] for call in api.connection_manager.execute.await_args_list]
+        assert sorted(sent) == ["@rel", "@rel 0 1", "@rel 0 1"]
+
+
 class TestSetRelay:
     """Relay set + verify cycle."""
 
     @pytest.mark.asyncio
     async def test_set_relay_on_success(self, mock_hass) -> None:
         """When the device echoes the requested state, return True and update data."""
-        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
         api.connection_manager.execute = AsyncMock(
             side_effect=["@rel\nrel=1\n\nready...", "@rel\nrel=1\n\nready..."]
         )
@@ -241,7 +670,7 @@ class TestSetRelay:
     @pytest.mark.asyncio
     async def test_set_relay_off_success(self, mock_hass) -> None:
         """OFF case mirrors ON."""
-        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
         api.connection_manager.execute = AsyncMock(
             side_effect=["@rel\nrel=0\n\nready...", "@rel\nrel=0\n\nready..."]
         )
@@ -249,10 +678,49 @@ class TestSetRelay:
         assert await api.telnet_set_relay("off") is True
         assert api.data["relay_state"] == 0
 
+    @pytest.mark.asyncio
+    async def test_set_relay_uses_interactive_priority(self, mock_hass) -> None:
+        """Relay write and verify are scheduled ahead of queued polls."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
+        api.connection_manager.execute = AsyncMock(
+            side_effect=["@rel\nrel=1\n\nready...", "@rel\nrel=1\n\nready..."]
+        )
+
+        await api.telnet_set_relay("on")
+
+        for call in api.connection_manager.execute.await_args_list:
+            assert call.kwargs["priority"] is CommandPriority.INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_read_relay_sends_only_rel(self, mock_hass) -> None:
+        """The relay-only refresh is one @rel round trip, published as a new generation."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
+        api.connection_manager.execute = AsyncMock(return_value="@rel\nrel=1\n\nready...")
+        api.connection_manager.execute_batch = AsyncMock()
+        generation = api.generation
+
+        assert await api.async_read_relay() == 1
+
+        api.connection_manager.execute.assert_awaited_once()
+        assert api.connection_manager.execute.await_args.args[0] == "@rel"
+        api.connection_manager.execute_batch.assert_not_called()
+        assert api.data["relay_state"] == 1
+        assert api.generation > generation
+        assert api.updated_at["relay_state"][0] == "@rel"
+
+    @pytest.mark.asyncio
+    async def test_read_relay_malformed_raises(self, mock_hass) -> None:
+        """A reply without a relay state is a command error."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
+        api.connection_manager.execute = AsyncMock(return_value="@rel\nfoo=1\n\nready...")
+
+        with pytest.raises(TelnetCommandError):
+            await api.async_read_relay()
+
     @pytest.mark.asyncio
     async def test_set_relay_invalid_state(self, mock_hass) -> None:
         """Unknown state is rejected without touching the device."""
-        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
         api.connection_manager.execute = AsyncMock()
 
         assert await api.telnet_set_relay("invalid") is False
@@ -261,26 +729,29 @@ class TestSetRelay:
     @pytest.mark.asyncio
     async def test_set_relay_command_error_returns_false(self, mock_hass) -> None:
         """Manager error is swallowed and reported as False."""
-        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
         api.connection_manager.execute = AsyncMock(side_effect=TelnetCommandError("@rel", "boom"))
 
         assert await api.telnet_set_relay("on") is False
+        assert api.relay_reads == 0
 
     @pytest.mark.asyncio
     async def test_set_relay_state_mismatch(self, mock_hass) -> None:
         """When the device reports a different state than requested, return False."""
-        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
         api.connection_manager.execute = AsyncMock(
             side_effect=["@rel\nrel=0\n\nready...", "@rel\nrel=0\n\nready..."]
         )
 
-        # Asked for ON, device reports OFF
+        # Asked for ON, device reports OFF: the read-back is still published
         assert await api.telnet_set_relay("on") is False
+        assert api.relay_reads == 1
+        assert api.data["relay_state"] == 0
 
     @pytest.mark.asyncio
     async def test_set_relay_malformed_response_returns_false(self, mock_hass) -> None:
         """Non-integer rel value yields False (parse_error swallowed)."""
-        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
         # First call (set) succeeds; second (read) parses but value is non-int.
         api.connection_manager.execute = AsyncMock(
             side_effect=["@rel\nrel=1\n\nready...", "@rel\nrel=abc\n\nready..."]
@@ -288,6 +759,131 @@ class TestSetRelay:
 
         assert await api.telnet_set_relay("on") is False
 
+    @pytest.mark.asyncio
+    async def test_flapping_requests_coalesce_into_one_write(self, mock_hass) -> None:
+        """Requests within the window collapse to the last state, written and verified once."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0.01)
+        api.connection_manager.execute = AsyncMock(
+            side_effect=["@rel\nrel=0\n\nready...", "@rel\nrel=0\n\nready..."]
+        )
+
+        results = await asyncio.gather(
+            api.telnet_set_relay("on"),
+            api.telnet_set_relay("off"),
+            api.telnet_set_relay("on"),
+            api.telnet_set_relay("off"),
+        )
+
+        assert results == [True] * 4
+        sent = [call.args[0] for call in api.connection_manager.execute.await_args_list]
+        assert sent == ["@rel 0 0", "@rel"]
+        assert api.data["relay_state"] == 0
+
+    @pytest.mark.asyncio
+    async def test_first_request_is_written_at_once(self, mock_hass) -> None:
+        """A lone request does not wait for the window; one right after it does."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0.2)
+        state = {"rel": "0"}
+
+        async def _execute(cmd: str, **_kwargs) -> str:
+            if cmd.startswith("@rel 0"):
+                state["rel"] = cmd[-1]
+            return f"@rel\nrel={state['rel']}\n\nready..."
+
+        api.connection_manager.execute = AsyncMock(side_effect=_execute)
+
+        started = time.monotonic()
+        assert await api.telnet_set_relay("on") is True
+        assert time.monotonic() - started < 0.2
+
+        # Within the window after that write: coalesced into one delayed write
+        results = await asyncio.gather(api.telnet_set_relay("on"), api.telnet_set_relay("off"))
+        assert time.monotonic() - started >= 0.2
+
+        assert results == [True, True]
+        sent = [call.args[0] for call in api.connection_manager.execute.await_args_list]
+        assert sent == ["@rel 0 1", "@rel", "@rel 0 0", "@rel"]
+
+    @pytest.mark.asyncio
+    async def test_request_matching_confirmed_state_is_skipped(self, mock_hass) -> None:
+        """A request for the state the device already reported sends nothing."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
+        api.connection_manager.execute = AsyncMock(return_value="@rel\nrel=1\n\nready...")
+        await api.async_read_relay()
+        api.connection_manager.execute.reset_mock()
+
+        assert await api.telnet_set_relay("on") is True
+
+        api.connection_manager.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_request_matching_polled_state_is_written(self, mock_hass) -> None:
+        """A relay state from an @dat poll may be old: the request is still written."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
+        api.data = {**api.data, "relay_state": 1}
+        api.updated_at["relay_state"] = ("@dat", time.time())
+        api.connection_manager.execute = AsyncMock(return_value="@rel\nrel=1\n\nready...")
+
+        assert await api.telnet_set_relay("on") is True
+
+        sent = [call.args[0] for call in api.connection_manager.execute.await_args_list]
+        assert sent == ["@rel 0 1", "@rel"]
+
+    @pytest.mark.asyncio
+    async def test_request_matching_restored_state_is_written(self, mock_hass) -> None:
+        """Values restored from disk never stand in for the device's answer."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
+        api.restore({"relay_state": 1}, {"relay_state": ["@rel", time.time()]})
+        assert api.data["relay_state"] == 1
+        api.connection_manager.execute = AsyncMock(return_value="@rel\nrel=1\n\nready...")
+
+        assert await api.telnet_set_relay("on") is True
+
+        sent = [call.args[0] for call in api.connection_manager.execute.await_args_list]
+        assert sent == ["@rel 0 1", "@rel"]
+
+    @pytest.mark.asyncio
+    async def test_old_read_back_no_longer_skips(self, mock_hass) -> None:
+        """A read-back older than RELAY_CONFIRMED_MAX_AGE is not trusted."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
+        api.connection_manager.execute = AsyncMock(return_value="@rel\nrel=1\n\nready...")
+        with patch.object(_elios4you_api.time, "time", return_value=1000.0):
+            await api.async_read_relay()
+        api.connection_manager.execute.reset_mock()
+
+        with patch.object(
+            _elios4you_api.time, "time", return_value=1000.0 + RELAY_CONFIRMED_MAX_AGE + 1
+        ):
+            assert await api.telnet_set_relay("on") is True
+
+        assert api.connection_manager.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_request_during_a_write_starts_the_next_one(self, mock_hass) -> None:
+        """A request arriving mid-write is written after it, not merged into it."""
+        api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT, relay_window=0)
+        gate = asyncio.Event()
+        state = {"rel": "0"}
+
+        async def _execute(cmd: str, **_kwargs) -> str:
+            if cmd.startswith("@rel 0"):
+                await gate.wait()
+                state["rel"] = cmd[-1]
+            return f"@rel\nrel={state['rel']}\n\nready..."
+
+        api.connection_manager.execute = AsyncMock(side_effect=_execute)
+
+        first = asyncio.create_task(api.telnet_set_relay("on"))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(api.telnet_set_relay("off"))
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await asyncio.gather(first, second) == [True, True]
+        sent = [call.args[0] for call in api.connection_manager.execute.await_args_list]
+        assert sent == ["@rel 0 1", "@rel", "@rel 0 0", "@rel"]
+        assert api.data["relay_state"] == 0
+
 
 class TestClose:
     """Public close delegates to the manager."""
@@ -350,7 +946,7 @@ class TestMergeBranches:
         sta_raw = "@sta\n0;daily_peak;3.2\n\nready..."
         inf_raw = f"@inf\nsn={TEST_SERIAL_NUMBER}\nfwtop=1.0\nfwbtm=2.0\nhwver=3.0\n\nready..."
 
-        api.connection_manager.execute = AsyncMock(side_effect=[dat_raw, sta_raw, inf_raw])
+        api.connection_manager.execute_batch = AsyncMock(return_value=[dat_raw, sta_raw, inf_raw])
         assert await api.async_get_data() is True
         # utc_time should be ignored (stays as the seeded empty string)
         assert api.data["utc_time"] == ""
@@ -382,6 +978,6 @@ class TestMergeBranches:
         sta_raw = "@sta\n0;daily_peak;not_a_float\n1;monthly_peak;4.5\n\nready..."
         inf_raw = f"@inf\nsn={TEST_SERIAL_NUMBER}\nfwtop=1.0\nfwbtm=2.0\nhwver=3.0\n\nready..."
 
-        api.connection_manager.execute = AsyncMock(side_effect=[dat_raw, sta_raw, inf_raw])
+        api.connection_manager.execute_batch = AsyncMock(return_value=[dat_raw, sta_raw, inf_raw])
         assert await api.async_get_data() is True
         assert api.data["monthly_peak"] == 4.5
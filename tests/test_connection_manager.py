@@ -7,6 +7,8 @@ Covers:
 * retry logic on silent timeouts
 * backoff behavior after consecutive failures, including exponential growth
 * metrics_snapshot() exposing the data we surface as diagnostic sensors
+* per-phase latency histograms for single and pipelined commands
+* adaptive read/connect timeouts from the round-trip estimators
 """
 
 from __future__ import annotations
@@ -23,12 +25,21 @@ from custom_components.fournoks_elios4you.connection_manager import (
     TelnetConnectionError,
     _RetryableError,
 )
+from custom_components.fournoks_elios4you.clock import ManualClock
+from custom_components.fournoks_elios4you.parser import ResponseParser
+from custom_components.fournoks_elios4you.scheduler import CommandPriority
+from custom_components.fournoks_elios4you.transport import TelnetlibTransport, TransportBackend
 import pytest
 
 TEST_HOST = "192.168.1.100"
 TEST_PORT = 5001
 
 
+def _telnet_manager(**kwargs) -> ConnectionManager:
+    """Return a manager on the telnetlib3 backend, so the reader/writer mocks apply."""
+    return ConnectionManager(TEST_HOST, TEST_PORT, transport=TransportBackend.TELNETLIB3, **kwargs)
+
+
 def _make_writer() -> MagicMock:
     """Return a MagicMock that quacks like a telnetlib3 writer."""
     writer = MagicMock()
@@ -66,7 +77,7 @@ def _make_reader(chunks: list[str]) -> MagicMock:
 
 def test_initial_state_is_disconnected() -> None:
     """A fresh manager starts DISCONNECTED with zeroed counters."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     assert mgr.state is ConnectionState.DISCONNECTED
     snap = mgr.metrics_snapshot()
     assert snap["state"] == "disconnected"
@@ -76,12 +87,21 @@ def test_initial_state_is_disconnected() -> None:
 
 def test_metrics_snapshot_includes_derived_fields() -> None:
     """``backoff_seconds_remaining`` and ``state_age_seconds`` are derived."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     snap = mgr.metrics_snapshot()
     assert "backoff_seconds_remaining" in snap
     assert "state_age_seconds" in snap
 
 
+def test_metrics_snapshot_latency_follows_new_samples() -> None:
+    """Cached latency percentiles are recomputed once a new sample is recorded."""
+    mgr = _telnet_manager()
+    assert mgr.metrics_snapshot()["connect_p95_ms"] == 0.0
+
+    mgr.metrics.latency.connect.record(0.2)
+    assert mgr.metrics_snapshot()["connect_p95_ms"] > 0.0
+
+
 # ---------------------------------------------------------------------- #
 # execute() happy path
 # ---------------------------------------------------------------------- #
@@ -90,7 +110,7 @@ def test_metrics_snapshot_includes_derived_fields() -> None:
 @pytest.mark.asyncio
 async def test_execute_opens_connection_and_returns_response() -> None:
     """First execute() opens the connection and returns the raw response."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     reader = _make_reader([f"@dat\n0;key;val\n\n{RESPONSE_SEPARATOR}"])
     writer = _make_writer()
 
@@ -111,7 +131,7 @@ async def test_execute_opens_connection_and_returns_response() -> None:
 @pytest.mark.asyncio
 async def test_execute_reuses_connection_within_window() -> None:
     """A second execute() within the reuse window does not re-open."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT, reuse_window=60.0)
+    mgr = _telnet_manager(reuse_window=60.0)
     reader = _make_reader(
         [
             f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}",
@@ -133,6 +153,337 @@ async def test_execute_reuses_connection_within_window() -> None:
     assert mgr.metrics.connects_succeeded == 1
 
 
+@pytest.mark.asyncio
+async def test_execute_records_latency_per_phase() -> None:
+    """One command records connect, write, first-byte and separator samples."""
+    mgr = _telnet_manager()
+    reader = _make_reader(["@dat\n0;a;1\n", f"\n{RESPONSE_SEPARATOR}"])
+    writer = _make_writer()
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        return_value=(reader, writer),
+    ):
+        await mgr.execute("@dat")
+
+    latency = mgr.latency_snapshot()
+    assert latency["connect"]["all"]["count"] == 1
+    for phase in ("write", "ttfb", "separator"):
+        assert latency[phase]["@dat"]["count"] == 1
+        assert latency[phase]["all"]["count"] == 1
+
+    snap = mgr.metrics_snapshot()
+    for key in ("connect_p95_ms", "ttfb_p95_ms", "response_p50_ms", "response_p99_ms"):
+        assert isinstance(snap[key], float)
+    assert "latency" not in snap
+
+
+@pytest.mark.asyncio
+async def test_read_timeout_adapts_to_observed_latency() -> None:
+    """A fast reply pulls the read timeout down to the floor; a timeout doubles it."""
+    mgr = _telnet_manager(read_timeout=5.0, read_timeout_floor=0.5)
+    reader = _make_reader([f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}"])
+    writer = _make_writer()
+    assert mgr.metrics_snapshot()["read_timeout_seconds"] == 5.0
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        return_value=(reader, writer),
+    ):
+        await mgr.execute("@dat")
+
+    assert mgr._current_read_timeout("@dat") == 0.5
+    assert mgr._current_read_timeout("@sta") == 5.0  # no samples yet
+    assert mgr._current_connect_timeout() == ConnectionManager.DEFAULT_CONNECT_TIMEOUT_FLOOR
+
+    mgr._rtt_for("@dat").backoff()
+    mgr._rtt_for("@dat").srtt = 0.3
+    mgr._rtt_for("@dat").rttvar = 0.05
+    assert mgr._current_read_timeout("@dat") == pytest.approx(2 * (0.3 + 4 * 0.05))
+
+
+@pytest.mark.asyncio
+async def test_silent_timeout_uses_adapted_timeout_and_backs_off() -> None:
+    """After a fast reply, a silent device is given up on at the floor, not the ceiling."""
+    mgr = _telnet_manager(read_timeout=5.0, read_timeout_floor=0.05, max_retries=0)
+    reader, replies = _make_queue_reader()
+    writer = _make_writer()
+    replies.put_nowait(f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}")
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        return_value=(reader, writer),
+    ):
+        await mgr.execute("@dat")
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(TelnetCommandError):
+            await mgr.execute("@dat")  # nothing queued: the device stays silent
+
+    assert loop.time() - started < 1.0
+    assert mgr.metrics.silent_timeouts == 1
+    assert mgr._current_read_timeout("@dat") == pytest.approx(0.1)
+
+
+def test_fixed_timeouts_when_adaptation_disabled() -> None:
+    """With adaptive_timeouts=False the configured values are used as-is."""
+    mgr = _telnet_manager(read_timeout=3.0, connect_timeout=4.0, adaptive_timeouts=False)
+    mgr._rtt_for("@dat").sample(0.01)
+    mgr._connect_rtt.sample(0.01)
+    assert mgr._current_read_timeout("@dat") == 3.0
+    assert mgr._current_connect_timeout() == 4.0
+
+
+# ---------------------------------------------------------------------- #
+# execute_batch() pipelining
+# ---------------------------------------------------------------------- #
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_pipelines_in_single_write() -> None:
+    """All commands go out in one write; replies are split on the separator."""
+    mgr = _telnet_manager()
+    # Replies arrive concatenated, with the second separator split across chunks.
+    reader = _make_reader(
+        [
+            f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}\n@sta\n0;b;2\n\nrea",
+            f"dy...\n@inf\nsn=X\n\n{RESPONSE_SEPARATOR}",
+        ]
+    )
+    writer = _make_writer()
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        return_value=(reader, writer),
+    ):
+        replies = await mgr.execute_batch(["@dat", "@sta", "@inf"])
+
+    writer.write.assert_called_once_with("@dat\n@sta\n@inf\n")
+    writer.drain.assert_awaited_once()
+    assert len(replies) == 3
+    assert all(reply.endswith(RESPONSE_SEPARATOR) for reply in replies)
+    assert "0;b;2" in replies[1]
+    assert "sn=X" in replies[2]
+    assert mgr.pipelining is True
+    assert mgr.metrics.commands_sent == 3
+    assert mgr.metrics.pipeline_fallbacks == 0
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_records_latency_per_command() -> None:
+    """Pipelined replies are timed per command; the shared write once."""
+    mgr = _telnet_manager()
+    reader = _make_reader(
+        [f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}\n@sta\n0;b;2\n\n{RESPONSE_SEPARATOR}"]
+    )
+    writer = _make_writer()
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        return_value=(reader, writer),
+    ):
+        await mgr.execute_batch(["@dat", "@sta"])
+
+    latency = mgr.latency_snapshot()
+    assert set(latency["write"]) == {"pipeline", "all"}
+    assert latency["separator"]["all"]["count"] == 2
+    assert latency["ttfb"]["@sta"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_falls_back_to_sequential_on_stall() -> None:
+    """A device that answers only the head of the pipeline gets the rest one at a time.
+
+    One stall is a single strike: pipelining stays on for the next batch.
+    """
+    mgr = _telnet_manager(read_timeout=0.05)
+    reader1 = _make_reader([f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}"])
+    reader2 = _make_reader(
+        [
+            f"@sta\n0;b;2\n\n{RESPONSE_SEPARATOR}",
+            f"@inf\nsn=X\n\n{RESPONSE_SEPARATOR}",
+        ]
+    )
+    writer1 = _make_writer()
+    writer2 = _make_writer()
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        side_effect=[(reader1, writer1), (reader2, writer2)],
+    ):
+        replies = await mgr.execute_batch(["@dat", "@sta", "@inf"])
+
+    assert [reply.splitlines()[0] for reply in replies] == ["@dat", "@sta", "@inf"]
+    assert mgr.pipelining is True
+    assert mgr.metrics.pipeline_fallbacks == 0
+    # Stalled socket was reset, unanswered commands replayed one at a time.
+    writer1.get_extra_info.return_value.abort.assert_called_once()
+    assert writer2.write.call_count == 2
+    assert mgr.metrics.commands_retried == 0
+    assert mgr.metrics.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_silent_pipeline_retried_sequentially() -> None:
+    """A pipeline that gets no reply at all is retried one command at a time.
+
+    Consecutive batches answered only sequentially switch pipelining off; it is
+    re-probed after the cool-down and stays on once the probe is answered.
+    """
+    clock = ManualClock()
+    mgr = _telnet_manager(
+        max_retries=1, retry_delay=0.0, pipeline_strikes=2, pipeline_reprobe=600, clock=clock
+    )
+    replies_ok = [f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}", f"@sta\n0;b;2\n\n{RESPONSE_SEPARATOR}"]
+    writers = [_make_writer() for _ in range(6)]
+    readers = [
+        _make_reader([]),  # batch 1: silent pipeline
+        _make_reader(replies_ok),  # batch 1: sequential retry
+        _make_reader([]),  # batch 2: silent pipeline
+        _make_reader(replies_ok),  # batch 2: sequential retry
+        _make_reader(replies_ok),  # batch 3: sequential from the start
+        _make_reader(["".join(replies_ok)]),  # batch 4: re-probed pipeline
+    ]
+
+    async def batch() -> list[str]:
+        # Past the reuse window: every batch opens the next connection
+        clock.advance(ConnectionManager.DEFAULT_REUSE_WINDOW + 1)
+        return await mgr.execute_batch(["@dat", "@sta"])
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        side_effect=list(zip(readers, writers, strict=True)),
+    ):
+        replies = await batch()
+        assert [reply.splitlines()[0] for reply in replies] == ["@dat", "@sta"]
+        writers[0].write.assert_called_once_with("@dat\n@sta\n")
+        assert [c.args[0] for c in writers[1].write.call_args_list] == ["@dat\n", "@sta\n"]
+        # One strike is not enough to give up on pipelining
+        assert mgr.pipelining is True
+
+        await batch()
+        assert mgr.pipelining is False
+        assert mgr.metrics.pipeline_fallbacks == 1
+
+        await batch()
+        assert [c.args[0] for c in writers[4].write.call_args_list] == ["@dat\n", "@sta\n"]
+
+        clock.advance(600)
+        await batch()
+        writers[5].write.assert_called_once_with("@dat\n@sta\n")
+        assert mgr.pipelining is True
+
+    assert mgr.metrics.silent_timeouts == 2
+    assert mgr.metrics.pipeline_fallbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_silent_device_keeps_pipelining() -> None:
+    """A device silent to the sequential retry too is not held against pipelining."""
+    mgr = _telnet_manager(max_retries=1, retry_delay=0.0)
+    writer1 = _make_writer()
+    writer2 = _make_writer()
+
+    with (
+        patch(
+            "telnetlib3.open_connection",
+            new_callable=AsyncMock,
+            side_effect=[(_make_reader([]), writer1), (_make_reader([]), writer2)],
+        ),
+        pytest.raises(TelnetCommandError),
+    ):
+        await mgr.execute_batch(["@dat", "@sta"])
+
+    writer2.write.assert_called_once_with("@dat\n")
+    assert mgr.pipelining is True
+    assert mgr.metrics.pipeline_fallbacks == 0
+
+
+async def test_execute_batch_failure_keeps_answered_replies() -> None:
+    """When the retries run out, the error carries the replies received before it."""
+    mgr = _telnet_manager(max_retries=0, retry_delay=0.0)
+    reader = _make_reader([f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}"])
+
+    with (
+        patch(
+            "telnetlib3.open_connection",
+            new_callable=AsyncMock,
+            return_value=(reader, _make_writer()),
+        ),
+        pytest.raises(TelnetCommandError) as exc_info,
+    ):
+        await mgr.execute_batch(["@dat", "@sta", "@inf"])
+
+    assert exc_info.value.command == "@sta"
+    assert len(exc_info.value.replies) == 1
+    assert exc_info.value.replies[0].startswith("@dat")
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_feeds_parsers_while_reading() -> None:
+    """Each parser receives exactly its own response and is complete on return."""
+    mgr = _telnet_manager(read_timeout=0.05)
+    reader1 = _make_reader(
+        [
+            f"@dat\n0;a;1\n0;b;2\n\n{RESPONSE_SEPARATOR}\n@st",
+            "a\n0;c;3\n\nrea",
+        ]
+    )
+    reader2 = _make_reader([f"@sta\n0;c;3\n\n{RESPONSE_SEPARATOR}"])
+    writer1 = _make_writer()
+    writer2 = _make_writer()
+    parsers = [ResponseParser("@dat"), ResponseParser("@sta")]
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        side_effect=[(reader1, writer1), (reader2, writer2)],
+    ):
+        await mgr.execute_batch(["@dat", "@sta"], parsers=parsers)
+
+    # @sta stalled mid-pipeline and was re-read sequentially: its parser was
+    # reset, so the half-read first copy does not leak into the result.
+    assert mgr.metrics.silent_timeouts == 0
+    assert all(parser.complete for parser in parsers)
+    assert parsers[0].result() == {"a": "1", "b": "2"}
+    assert parsers[1].result() == {"c": "3"}
+
+
+@pytest.mark.asyncio
+async def test_execute_feeds_parser() -> None:
+    """A single command streams its response into the parser."""
+    mgr = _telnet_manager()
+    reader = _make_reader(["@inf\nsn=X\nfw", f"top=1.0\n\n{RESPONSE_SEPARATOR}"])
+    parser = ResponseParser("@inf")
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        return_value=(reader, _make_writer()),
+    ):
+        raw = await mgr.execute("@inf", parser=parser)
+
+    assert parser.complete is True
+    assert parser.result() == {"sn": "X", "fwtop": "1.0"}
+    assert raw.endswith(RESPONSE_SEPARATOR)
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_empty_is_noop() -> None:
+    """An empty batch never touches the network."""
+    mgr = _telnet_manager()
+    with patch("telnetlib3.open_connection", new_callable=AsyncMock) as open_conn:
+        assert await mgr.execute_batch([]) == []
+    open_conn.assert_not_called()
+
+
 # ---------------------------------------------------------------------- #
 # Error paths: silent timeout + retries
 # ---------------------------------------------------------------------- #
@@ -141,7 +492,7 @@ async def test_execute_reuses_connection_within_window() -> None:
 @pytest.mark.asyncio
 async def test_silent_timeout_triggers_retry_then_succeeds() -> None:
     """First attempt returns no separator → RST + reconnect → second succeeds."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT, max_retries=1, retry_delay=0.0)
+    mgr = _telnet_manager(max_retries=1, retry_delay=0.0)
 
     # First reader returns garbage without separator, second returns valid.
     reader_bad = _make_reader(["garbage_no_separator"])
@@ -169,7 +520,7 @@ async def test_silent_timeout_triggers_retry_then_succeeds() -> None:
 @pytest.mark.asyncio
 async def test_silent_timeout_all_retries_fail_raises() -> None:
     """If every attempt silently times out, raise TelnetCommandError."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT, max_retries=1, retry_delay=0.0)
+    mgr = _telnet_manager(max_retries=1, retry_delay=0.0)
 
     reader1 = _make_reader(["garbage"])
     reader2 = _make_reader(["more garbage"])
@@ -194,7 +545,7 @@ async def test_silent_timeout_all_retries_fail_raises() -> None:
 @pytest.mark.asyncio
 async def test_transport_error_during_send_is_retried() -> None:
     """Drain raising OSError on first attempt is a retryable failure."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT, max_retries=1, retry_delay=0.0)
+    mgr = _telnet_manager(max_retries=1, retry_delay=0.0)
 
     reader = _make_reader([f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}"])
     writer_bad = _make_writer()
@@ -221,7 +572,7 @@ async def test_transport_error_during_send_is_retried() -> None:
 @pytest.mark.asyncio
 async def test_connect_timeout_raises_telnet_connection_error() -> None:
     """All connect attempts timing out raises TelnetConnectionError."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT, max_retries=0, retry_delay=0.0)
+    mgr = _telnet_manager(max_retries=0, retry_delay=0.0)
 
     with (
         patch(
@@ -246,9 +597,7 @@ async def test_connect_timeout_raises_telnet_connection_error() -> None:
 @pytest.mark.asyncio
 async def test_consecutive_failures_enter_backoff() -> None:
     """Reaching the threshold transitions to BACKOFF and refuses new calls."""
-    mgr = ConnectionManager(
-        TEST_HOST,
-        TEST_PORT,
+    mgr = _telnet_manager(
         max_retries=0,
         retry_delay=0.0,
         backoff_threshold=3,
@@ -282,9 +631,7 @@ async def test_consecutive_failures_enter_backoff() -> None:
 @pytest.mark.asyncio
 async def test_backoff_expires_and_allows_trial() -> None:
     """Once the backoff window passes, the next execute() is allowed through."""
-    mgr = ConnectionManager(
-        TEST_HOST,
-        TEST_PORT,
+    mgr = _telnet_manager(
         max_retries=0,
         retry_delay=0.0,
         backoff_threshold=1,
@@ -325,9 +672,7 @@ async def test_backoff_expires_and_allows_trial() -> None:
 @pytest.mark.asyncio
 async def test_backoff_duration_grows_exponentially() -> None:
     """Each failure past the threshold doubles the backoff window, capped at max."""
-    mgr = ConnectionManager(
-        TEST_HOST,
-        TEST_PORT,
+    mgr = _telnet_manager(
         max_retries=0,
         retry_delay=0.0,
         backoff_threshold=1,
@@ -352,6 +697,116 @@ async def test_backoff_duration_grows_exponentially() -> None:
     assert durations == [1.0, 2.0, 4.0, 8.0, 8.0]
 
 
+# ---------------------------------------------------------------------- #
+# Priority scheduling
+# ---------------------------------------------------------------------- #
+
+
+def _make_queue_reader() -> tuple[MagicMock, asyncio.Queue[str]]:
+    """Return a reader that blocks until the test pushes the next chunk."""
+    chunks: asyncio.Queue[str] = asyncio.Queue()
+    reader = MagicMock()
+
+    async def _read(_size: int) -> str:
+        return await chunks.get()
+
+    reader.read = _read
+    return reader, chunks
+
+
+async def _wait_for_writes(writer: MagicMock, count: int) -> None:
+    """Yield to the loop until ``writer.write`` has been called ``count`` times."""
+    for _ in range(100):
+        if writer.write.call_count >= count:
+            return
+        await asyncio.sleep(0)
+    raise AssertionError(f"expected {count} writes, got {writer.write.call_count}")
+
+
+@pytest.mark.asyncio
+async def test_interactive_command_overtakes_queued_poll() -> None:
+    """A relay write queued after a poll reaches the device first."""
+    mgr = _telnet_manager()
+    reader, chunks = _make_queue_reader()
+    writer = _make_writer()
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        return_value=(reader, writer),
+    ):
+        in_flight = asyncio.create_task(mgr.execute("@dat"))
+        await _wait_for_writes(writer, 1)
+        poll = asyncio.create_task(mgr.execute("@sta"))
+        relay = asyncio.create_task(mgr.execute("@rel 0 1", priority=CommandPriority.INTERACTIVE))
+        await asyncio.sleep(0)
+        # Still one command in flight: nothing else has been written yet.
+        assert writer.write.call_count == 1
+
+        for _ in range(3):
+            chunks.put_nowait(f"x\n\n{RESPONSE_SEPARATOR}")
+        await asyncio.gather(in_flight, poll, relay)
+
+    assert [c.args[0] for c in writer.write.call_args_list] == ["@dat\n", "@rel 0 1\n", "@sta\n"]
+
+
+@pytest.mark.asyncio
+async def test_retrying_poll_yields_to_interactive_command() -> None:
+    """Between retries a poll hands the device to a waiting relay write."""
+    mgr = _telnet_manager(max_retries=1, retry_delay=0.01)
+    reader_bad = _make_reader([])  # immediate EOF → silent timeout
+    reader_good = _make_reader(
+        [f"@rel\nrel=1\n\n{RESPONSE_SEPARATOR}", f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}"]
+    )
+    writer1 = _make_writer()
+    writer2 = _make_writer()
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        side_effect=[(reader_bad, writer1), (reader_good, writer2)],
+    ):
+        poll = asyncio.create_task(mgr.execute("@dat"))
+        await _wait_for_writes(writer1, 1)
+        relay = asyncio.create_task(mgr.execute("@rel", priority=CommandPriority.INTERACTIVE))
+        poll_raw, relay_raw = await asyncio.gather(poll, relay)
+
+    assert relay_raw.startswith("@rel")
+    assert poll_raw.startswith("@dat")
+    assert [c.args[0] for c in writer2.write.call_args_list] == ["@rel\n", "@dat\n"]
+    assert mgr.metrics.priority_yields == 1
+    assert mgr.metrics.commands_retried == 1
+
+
+@pytest.mark.asyncio
+async def test_close_rejects_queued_commands() -> None:
+    """close() fails queued callers immediately and lets the in-flight one finish."""
+    mgr = _telnet_manager()
+    reader, chunks = _make_queue_reader()
+    writer = _make_writer()
+
+    with patch(
+        "telnetlib3.open_connection",
+        new_callable=AsyncMock,
+        return_value=(reader, writer),
+    ):
+        in_flight = asyncio.create_task(mgr.execute("@dat"))
+        await _wait_for_writes(writer, 1)
+        queued = asyncio.create_task(mgr.execute("@sta"))
+        await asyncio.sleep(0)
+
+        closing = asyncio.create_task(mgr.close())
+        with pytest.raises(ConnectionUnavailableError, match="manager closed"):
+            await queued
+
+        chunks.put_nowait(f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}")
+        assert (await in_flight).startswith("@dat")
+        await closing
+
+    assert mgr.state is ConnectionState.CLOSED
+    assert writer.write.call_count == 1
+
+
 # ---------------------------------------------------------------------- #
 # Closing
 # ---------------------------------------------------------------------- #
@@ -360,7 +815,7 @@ async def test_backoff_duration_grows_exponentially() -> None:
 @pytest.mark.asyncio
 async def test_close_transitions_to_terminal_state() -> None:
     """close() transitions to CLOSED and uses graceful FIN."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     reader = _make_reader([f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}"])
     writer = _make_writer()
 
@@ -384,7 +839,7 @@ async def test_close_transitions_to_terminal_state() -> None:
 @pytest.mark.asyncio
 async def test_close_then_execute_raises() -> None:
     """A closed manager refuses further work."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     await mgr.close()
 
     with pytest.raises(ConnectionUnavailableError):
@@ -394,7 +849,7 @@ async def test_close_then_execute_raises() -> None:
 @pytest.mark.asyncio
 async def test_close_handles_missing_writer() -> None:
     """Closing without ever connecting is a no-op."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     await mgr.close()  # should not raise
     assert mgr.state is ConnectionState.CLOSED
 
@@ -402,7 +857,7 @@ async def test_close_handles_missing_writer() -> None:
 @pytest.mark.asyncio
 async def test_close_wait_closed_timeout_does_not_hang() -> None:
     """A hung wait_closed() is bounded by close_timeout and does not block."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT, close_timeout=0.05)
+    mgr = _telnet_manager(close_timeout=0.05)
     reader = _make_reader([f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}"])
     writer = _make_writer()
 
@@ -442,7 +897,7 @@ def test_retryable_error_keeps_reason() -> None:
 
 def test_transition_to_same_state_is_noop() -> None:
     """Transitioning to the current state should not bump state_since."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     before = mgr.metrics.state_since
     mgr._transition(ConnectionState.DISCONNECTED, reason="self-loop")
     assert mgr.metrics.state_since == before
@@ -455,37 +910,37 @@ def test_transition_to_same_state_is_noop() -> None:
 
 def test_can_reuse_false_when_writer_is_closing() -> None:
     """A closing writer means we cannot reuse the connection."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     writer = _make_writer()
     writer.is_closing = MagicMock(return_value=True)
-    mgr._writer = writer
+    mgr._transport = TelnetlibTransport(_make_reader([]), writer)
     mgr._last_activity = __import__("time").time()
     assert mgr._can_reuse() is False
 
 
 def test_can_reuse_false_when_transport_is_closing() -> None:
     """A writer that's open but whose transport is closing is not reusable."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     writer = _make_writer()
     writer.get_extra_info.return_value.is_closing = MagicMock(return_value=True)
-    mgr._writer = writer
+    mgr._transport = TelnetlibTransport(_make_reader([]), writer)
     mgr._last_activity = __import__("time").time()
     assert mgr._can_reuse() is False
 
 
 def test_can_reuse_false_on_exception_during_check() -> None:
     """OSError while inspecting the writer means we should not trust it."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     writer = MagicMock()
     writer.is_closing = MagicMock(side_effect=OSError("boom"))
-    mgr._writer = writer
+    mgr._transport = TelnetlibTransport(_make_reader([]), writer)
     assert mgr._can_reuse() is False
 
 
 def test_can_reuse_false_when_age_exceeds_reuse_window() -> None:
     """A writer older than reuse_window is dropped (logs and returns False)."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT, reuse_window=1.0)
-    mgr._writer = _make_writer()
+    mgr = _telnet_manager(reuse_window=1.0)
+    mgr._transport = TelnetlibTransport(_make_reader([]), _make_writer())
     mgr._last_activity = 0.0  # epoch — definitely older than 1 second
     assert mgr._can_reuse() is False
 
@@ -493,10 +948,9 @@ def test_can_reuse_false_when_age_exceeds_reuse_window() -> None:
 @pytest.mark.asyncio
 async def test_ensure_connected_closes_stale_writer_first() -> None:
     """When the reuse window has expired, the old socket is aborted before reconnect."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT, reuse_window=1.0)
+    mgr = _telnet_manager(reuse_window=1.0)
     stale = _make_writer()
-    mgr._writer = stale
-    mgr._reader = _make_reader([])
+    mgr._transport = TelnetlibTransport(_make_reader([]), stale)
     mgr._last_activity = 0.0  # forces _can_reuse() → False via age check
 
     new_reader = _make_reader([f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}"])
@@ -511,7 +965,8 @@ async def test_ensure_connected_closes_stale_writer_first() -> None:
 
     # Stale writer's transport was aborted (RST), then a new connection opened.
     stale.get_extra_info.return_value.abort.assert_called_once()
-    assert mgr._writer is new_writer
+    assert isinstance(mgr._transport, TelnetlibTransport)
+    assert mgr._transport._writer is new_writer
 
 
 # ---------------------------------------------------------------------- #
@@ -522,17 +977,16 @@ async def test_ensure_connected_closes_stale_writer_first() -> None:
 @pytest.mark.asyncio
 async def test_close_safely_force_abort_without_transport_falls_back_to_close() -> None:
     """If there's no underlying transport, abort falls back to writer.close()."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
     writer = _make_writer()
     writer.get_extra_info = MagicMock(return_value=None)  # no transport
-    mgr._writer = writer
-    mgr._reader = _make_reader([])
+    mgr._transport = TelnetlibTransport(_make_reader([]), writer)
 
     await mgr._close_safely(force_abort=True)
 
     # No transport to abort → writer.close() called as fallback.
     writer.close.assert_called_once()
-    assert mgr._writer is None
+    assert mgr._transport is None
     assert mgr.metrics.forced_aborts == 1
 
 
@@ -544,17 +998,17 @@ async def test_close_safely_force_abort_without_transport_falls_back_to_close()
 @pytest.mark.asyncio
 async def test_read_until_returns_partial_on_zero_remaining() -> None:
     """If the read budget is already exhausted before the first read, return what we have."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
-    mgr._reader = _make_reader(["never read"])
+    mgr = _telnet_manager()
+    mgr._transport = TelnetlibTransport(_make_reader(["never read"]), _make_writer())
     # Negative timeout → remaining <= 0 on first iteration → bail out
-    result = await mgr._read_until(RESPONSE_SEPARATOR, timeout=-1.0)
-    assert result == ""
+    result = await mgr._read_until(RESPONSE_SEPARATOR.encode(), timeout=-1.0)
+    assert result.tobytes() == b""
 
 
 @pytest.mark.asyncio
 async def test_read_until_handles_timeout_error_from_wait_for() -> None:
     """A TimeoutError from asyncio.wait_for inside the loop returns the partial buffer."""
-    mgr = ConnectionManager(TEST_HOST, TEST_PORT)
+    mgr = _telnet_manager()
 
     async def _slow_read(_size: int) -> str:
         await asyncio.sleep(60)
@@ -562,7 +1016,39 @@ async def test_read_until_handles_timeout_error_from_wait_for() -> None:
 
     reader = MagicMock()
     reader.read = _slow_read
-    mgr._reader = reader
+    mgr._transport = TelnetlibTransport(reader, _make_writer())
+
+    result = await mgr._read_until(RESPONSE_SEPARATOR.encode(), timeout=0.05)
+    assert RESPONSE_SEPARATOR.encode() not in result.tobytes()
+
 
-    result = await mgr._read_until(RESPONSE_SEPARATOR, timeout=0.05)
-    assert RESPONSE_SEPARATOR not in result
+@pytest.mark.asyncio
+async def test_read_until_finds_separator_split_across_chunks() -> None:
+    """The overlap scan catches a separator that straddles chunk boundaries."""
+    mgr = _telnet_manager()
+    response = f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}"
+    # One character per chunk: every boundary splits the separator at some point.
+    mgr._transport = TelnetlibTransport(_make_reader(list(response)), _make_writer())
+
+    result = await mgr._read_until(RESPONSE_SEPARATOR.encode(), timeout=1.0)
+
+    assert isinstance(result, memoryview)
+    assert result.readonly is True
+    assert str(result, "utf-8") == response
+
+
+@pytest.mark.asyncio
+async def test_read_replies_splits_responses_across_chunk_boundaries() -> None:
+    """Pipelined replies are cut correctly when separators straddle chunks."""
+    mgr = _telnet_manager()
+    first = f"@dat\n0;a;1\n\n{RESPONSE_SEPARATOR}"
+    second = f"\n@sta\n0;b;2\n\n{RESPONSE_SEPARATOR}"
+    stream = first + second
+    chunks = [stream[i : i + 3] for i in range(0, len(stream), 3)]
+    mgr._transport = TelnetlibTransport(_make_reader(chunks), _make_writer())
+
+    replies: list[str] = []
+    received = await mgr._read_replies(RESPONSE_SEPARATOR.encode(), 2, 1.0, replies)
+
+    assert received == 2
+    assert replies == [first, second]
@@ -6,6 +6,7 @@ https://github.com/alexdelprete/ha-4noks-elios4you
 from __future__ import annotations
 
 from datetime import timedelta
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -14,15 +15,30 @@ import pytest
 from custom_components.fournoks_elios4you import coordinator as _elios4you_coordinator
 from custom_components.fournoks_elios4you.api import TelnetCommandError, TelnetConnectionError
 from custom_components.fournoks_elios4you.const import (
+    ADAPTIVE_FLOOR_RATIO,
+    ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ALIGNED_POLLING,
     CONF_ENABLE_REPAIR_NOTIFICATION,
     CONF_FAILURES_THRESHOLD,
+    CONF_MAX_DATA_AGE,
     CONF_RECOVERY_SCRIPT,
     CONF_SCAN_INTERVAL,
+    DEFAULT_DIAGNOSTIC_INTERVAL,
+    DEFAULT_RELAY_WINDOW,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
     DOMAIN,
     MIN_SCAN_INTERVAL,
+    SNAPSHOT_SAVE_DELAY,
+    SUN_BELOW_HORIZON,
+    SUN_ENTITY_ID,
 )
 from custom_components.fournoks_elios4you.coordinator import Elios4YouCoordinator
+from custom_components.fournoks_elios4you.model import DeviceSnapshot
+from custom_components.fournoks_elios4you.schedule import get_scheduler
+from custom_components.fournoks_elios4you.switch import Elios4YouSwitch
+from homeassistant.components.switch import SwitchDeviceClass
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import UpdateFailed
@@ -31,6 +47,36 @@ from .conftest import TEST_HOST, TEST_NAME, TEST_PORT, TEST_SCAN_INTERVAL, TEST_
 from .test_config_flow import MockConfigEntry
 
 
+def _make_coordinator(
+    hass,
+    options: dict[str, Any] | None = None,
+    *,
+    unique_id: str = TEST_SERIAL_NUMBER,
+    api_data: dict[str, Any] | None = None,
+) -> Elios4YouCoordinator:
+    """Create a coordinator on a mocked API for a config entry added to ``hass``.
+
+    The API answers every poll, its data is ``api_data`` plus the serial
+    number as generation 1, and snapshot saves are mocked out.
+    """
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: TEST_NAME, CONF_HOST: TEST_HOST, CONF_PORT: TEST_PORT},
+        options={CONF_SCAN_INTERVAL: TEST_SCAN_INTERVAL, **(options or {})},
+        unique_id=unique_id,
+    )
+    entry.add_to_hass(hass)
+    with patch.object(_elios4you_coordinator, "Elios4YouAPI") as mock_api_class:
+        api = mock_api_class.return_value
+        api.async_get_data = AsyncMock(return_value=True)
+        api.data = {**(api_data or {}), "sn": TEST_SERIAL_NUMBER}
+        api.generation = 1
+        api.stale_keys.return_value = set()
+        coordinator = Elios4YouCoordinator(hass, entry)
+    coordinator._schedule_snapshot_save = MagicMock()
+    return coordinator
+
+
 class TestCoordinatorInit:
     """Tests for coordinator initialization."""
 
@@ -133,6 +179,9 @@ class TestCoordinatorInit:
             TEST_NAME,
             TEST_HOST,
             TEST_PORT,
+            status_interval=DEFAULT_STATUS_INTERVAL,
+            diagnostic_interval=DEFAULT_DIAGNOSTIC_INTERVAL,
+            relay_window=DEFAULT_RELAY_WINDOW,
         )
         assert coordinator.api == mock_api_class.return_value
 
@@ -162,7 +211,7 @@ class TestCoordinatorUpdate:
             coordinator = Elios4YouCoordinator(mock_hass, entry)
             result = await coordinator.async_update_data()
 
-        assert result is True
+        assert result is mock_api.device_snapshot.return_value
         assert coordinator.last_update_status is True
         mock_api.async_get_data.assert_called_once()
 
@@ -406,6 +455,34 @@ class TestCoordinatorFailureTracking:
             await coordinator.async_update_data()
             assert coordinator._consecutive_failures == 0
 
+    @pytest.mark.asyncio
+    async def test_success_schedules_one_snapshot_save(self, mock_hass) -> None:
+        """Successful updates schedule the snapshot save at most once per delay."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_NAME: TEST_NAME, CONF_HOST: TEST_HOST, CONF_PORT: TEST_PORT},
+            options={CONF_SCAN_INTERVAL: TEST_SCAN_INTERVAL},
+        )
+
+        with patch.object(_elios4you_coordinator, "Elios4YouAPI") as mock_api_class:
+            mock_api = mock_api_class.return_value
+            mock_api.data = {}
+            mock_api.async_get_data = AsyncMock(return_value=True)
+            mock_api.snapshot = MagicMock(return_value={"sn": TEST_SERIAL_NUMBER})
+
+            coordinator = Elios4YouCoordinator(mock_hass, entry)
+            with patch.object(coordinator._store, "async_delay_save") as delay_save:
+                await coordinator.async_update_data()
+                await coordinator.async_update_data()
+                delay_save.assert_called_once_with(coordinator._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+                # The store collects the data at write time, re-arming the schedule
+                stored = coordinator._snapshot_data()
+                assert stored["data"] == {"sn": TEST_SERIAL_NUMBER}
+                assert "saved_at" in stored
+                await coordinator.async_update_data()
+                assert delay_save.call_count == 2
+
     @pytest.mark.asyncio
     async def test_repair_issue_created_after_threshold(self, mock_hass) -> None:
         """Test repair issue is created after failures threshold is reached."""
@@ -794,3 +871,402 @@ class TestCoordinatorErrorTypes:
                 await coordinator.async_update_data()
 
             assert coordinator._last_error_type == "device_unreachable"
+
+
+class TestCoordinatorKeyedListeners:
+    """Tests for change-only listener notification."""
+
+    @staticmethod
+    def _swap(coordinator: Elios4YouCoordinator, **changes: float) -> None:
+        """Publish changed values as a new generation, as the API does."""
+        coordinator.api.data = {**coordinator.api.data, **changes}
+        coordinator.api.generation += 1
+
+    @pytest.mark.asyncio
+    async def test_only_listeners_of_changed_keys_are_woken(self, hass) -> None:
+        """After the first update, a listener is only woken when its key changes."""
+        coordinator = _make_coordinator(hass, api_data={"produced_power": 1.0})
+        power, serial, unkeyed = MagicMock(), MagicMock(), MagicMock()
+        coordinator.async_add_listener(power, "produced_power")
+        coordinator.async_add_listener(serial, "sn")
+        coordinator.async_add_listener(unkeyed)
+
+        # The first update wakes everyone
+        coordinator.async_update_listeners()
+        assert (power.call_count, serial.call_count, unkeyed.call_count) == (1, 1, 1)
+
+        # Nothing changed: only listeners without a key run
+        coordinator.async_update_listeners()
+        assert (power.call_count, serial.call_count, unkeyed.call_count) == (1, 1, 2)
+
+        self._swap(coordinator, produced_power=2.5)
+        coordinator.async_update_listeners()
+        assert (power.call_count, serial.call_count, unkeyed.call_count) == (2, 1, 3)
+
+    @pytest.mark.asyncio
+    async def test_same_generation_skips_comparison(self, hass) -> None:
+        """Without a new generation of api.data, values are not compared again."""
+        coordinator = _make_coordinator(hass, api_data={"produced_power": 1.0})
+        power = MagicMock()
+        coordinator.async_add_listener(power, "produced_power")
+        coordinator.async_update_listeners()
+
+        # Modified in place, i.e. not published by the API: ignored
+        coordinator.api.data["produced_power"] = 2.5
+        coordinator.async_update_listeners()
+        assert power.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_availability_change_wakes_everyone(self, hass) -> None:
+        """A failed or recovered update is shown by every entity."""
+        coordinator = _make_coordinator(hass, api_data={"produced_power": 1.0})
+        serial = MagicMock()
+        coordinator.async_add_listener(serial, "sn")
+        coordinator.async_update_listeners()
+
+        coordinator.last_update_success = False
+        coordinator.async_update_listeners()
+        coordinator.last_update_success = True
+        coordinator.async_update_listeners()
+        assert serial.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_removed_listener_is_not_woken(self, hass) -> None:
+        """Removing a listener drops it from the key index."""
+        coordinator = _make_coordinator(hass, api_data={"produced_power": 1.0})
+        power = MagicMock()
+        remove = coordinator.async_add_listener(power, "produced_power")
+        coordinator.async_update_listeners()
+
+        remove()
+        self._swap(coordinator, produced_power=2.5)
+        coordinator.async_update_listeners()
+        assert power.call_count == 1
+        assert not list(coordinator.async_contexts())
+
+
+class TestCoordinatorDataAge:
+    """Tests for per-key freshness with a maximum data age."""
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_wakes_listeners_of_keys_gone_stale(self, hass) -> None:
+        """Polls keep failing: only the listeners of keys that aged out are woken."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_NAME: TEST_NAME, CONF_HOST: TEST_HOST, CONF_PORT: TEST_PORT},
+            options={CONF_SCAN_INTERVAL: TEST_SCAN_INTERVAL, CONF_MAX_DATA_AGE: 120},
+        )
+        with patch.object(_elios4you_coordinator, "Elios4YouAPI") as mock_api_class:
+            mock_api_class.return_value.data = {"produced_power": 1.0, "sn": TEST_SERIAL_NUMBER}
+            mock_api_class.return_value.generation = 1
+            mock_api_class.return_value.stale_keys.return_value = set()
+            coordinator = Elios4YouCoordinator(hass, entry)
+        coordinator.api.async_get_data = AsyncMock(
+            side_effect=TelnetConnectionError(TEST_HOST, TEST_PORT, 5.0)
+        )
+        power, serial = MagicMock(), MagicMock()
+        coordinator.async_add_listener(power, "produced_power")
+        coordinator.async_add_listener(serial, "sn")
+
+        # The first failure changes availability and wakes everyone
+        await coordinator.async_refresh()
+        assert (power.call_count, serial.call_count) == (1, 1)
+
+        # Later failures are silent, except for keys going stale
+        coordinator.api.stale_keys.return_value = {"produced_power"}
+        await coordinator.async_refresh()
+        assert (power.call_count, serial.call_count) == (2, 1)
+        assert coordinator.stale_keys == {"produced_power"}
+        assert coordinator.api.stale_keys.call_args.args[1] == {
+            "@dat": coordinator.scan_interval + 120,
+            "@sta": max(coordinator.status_interval, coordinator.scan_interval) + 120,
+        }
+
+        await coordinator.async_refresh()
+        assert power.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_wakes_listeners_of_changed_metrics(self, hass) -> None:
+        """Polls keep failing: the connection metrics they publish still reach their sensors."""
+        coordinator = _make_coordinator(hass, api_data={"cm_consecutive_failures": 0})
+        failures = 0
+
+        async def _fail() -> bool:
+            nonlocal failures
+            failures += 1
+            # A failed cycle publishes its metrics, as the API does
+            coordinator.api.data = {**coordinator.api.data, "cm_consecutive_failures": failures}
+            coordinator.api.generation += 1
+            raise TelnetConnectionError(TEST_HOST, TEST_PORT, 5.0)
+
+        coordinator.api.async_get_data = AsyncMock(side_effect=_fail)
+        metric, serial = MagicMock(), MagicMock()
+        coordinator.async_add_listener(metric, "cm_consecutive_failures")
+        coordinator.async_add_listener(serial, "sn")
+
+        await coordinator.async_refresh()
+        assert (metric.call_count, serial.call_count) == (1, 1)
+
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+        assert (metric.call_count, serial.call_count) == (3, 1)
+
+
+class TestCoordinatorAdaptivePolling:
+    """Tests for the poll interval following the power dynamics."""
+
+    @staticmethod
+    def _powers(coordinator: Elios4YouCoordinator, produced: float, consumed: float) -> None:
+        coordinator.api.device_snapshot.return_value = DeviceSnapshot.from_data(
+            {"produced_power": produced, "consumed_power": consumed}
+        )
+
+    @pytest.mark.asyncio
+    async def test_disabled_keeps_scan_interval(self, hass) -> None:
+        """Without the option, the interval never moves."""
+        coordinator = _make_coordinator(hass)
+        self._powers(coordinator, 2.0, 1.0)
+        await coordinator.async_update_data()
+        self._powers(coordinator, 5.0, 1.0)
+        await coordinator.async_update_data()
+
+        assert coordinator.update_interval == timedelta(seconds=60)
+
+    @pytest.mark.asyncio
+    async def test_interval_follows_power_changes(self, hass) -> None:
+        """Stable power stretches the interval, a change drops it, a failure resets it."""
+        coordinator = _make_coordinator(hass, {CONF_ADAPTIVE_POLLING: True})
+        self._powers(coordinator, 2.0, 1.0)
+        await coordinator.async_update_data()
+        assert coordinator.update_interval == timedelta(seconds=90)
+
+        self._powers(coordinator, 1.2, 1.0)
+        await coordinator.async_update_data()
+        # The floor is a fraction of the 60 s scan interval
+        assert coordinator.update_interval == timedelta(seconds=60 * ADAPTIVE_FLOOR_RATIO)
+
+        coordinator.api.async_get_data = AsyncMock(
+            side_effect=TelnetConnectionError(TEST_HOST, TEST_PORT, 5)
+        )
+        with pytest.raises(UpdateFailed):
+            await coordinator.async_update_data()
+        assert coordinator.update_interval == timedelta(seconds=60)
+
+    @pytest.mark.asyncio
+    async def test_night_without_production_polls_at_ceiling(self, hass) -> None:
+        """With the sun below the horizon and no production, polling slows down."""
+        hass.states.async_set(SUN_ENTITY_ID, SUN_BELOW_HORIZON)
+        coordinator = _make_coordinator(hass, {CONF_ADAPTIVE_POLLING: True})
+        self._powers(coordinator, 0.0, 0.3)
+        await coordinator.async_update_data()
+
+        assert coordinator.update_interval == timedelta(seconds=ADAPTIVE_MAX_INTERVAL)
+
+
+class TestCoordinatorAlignedPolling:
+    """Tests for polls scheduled on wall-clock boundaries."""
+
+    @staticmethod
+    def _next_delay(hass, coordinator: Elios4YouCoordinator) -> float:
+        """Schedule the next poll at wall-clock time 6042.25 and return its delay.
+
+        The base class counts the delay from the loop clock's whole second,
+        here 0.5 s before the loop time.
+        """
+        with (
+            patch.object(_elios4you_coordinator.time, "time", return_value=6042.25),
+            patch.object(hass.loop, "time", return_value=500.5),
+            patch.object(hass.loop, "call_at") as mock_call_at,
+        ):
+            coordinator._schedule_refresh()
+        mock_call_at.assert_called_once()
+        return coordinator.update_interval.total_seconds() - 0.5
+
+    @pytest.mark.asyncio
+    async def test_next_poll_on_minute_boundary(self, hass) -> None:
+        """A single device polls on the next minute boundary."""
+        coordinator = _make_coordinator(hass, {CONF_ALIGNED_POLLING: True})
+
+        assert self._next_delay(hass, coordinator) == pytest.approx(17.75)
+        assert coordinator.poll_interval == timedelta(seconds=60)
+
+    @pytest.mark.asyncio
+    async def test_boundary_shifted_by_device_slot(self, hass) -> None:
+        """With a device sorting first, this one polls half a period after the boundary."""
+        coordinator = _make_coordinator(hass, {CONF_ALIGNED_POLLING: True})
+        get_scheduler(hass).register("0")
+
+        # Boundaries at :30 of each minute
+        assert self._next_delay(hass, coordinator) == pytest.approx(47.75)
+
+    @pytest.mark.asyncio
+    async def test_disabled_keeps_poll_interval(self, hass) -> None:
+        """Without the option, the next poll is one poll interval away."""
+        coordinator = _make_coordinator(hass, {CONF_ALIGNED_POLLING: False})
+
+        with patch.object(hass.loop, "call_at") as mock_call_at:
+            coordinator._schedule_refresh()
+
+        mock_call_at.assert_called_once()
+        assert coordinator.update_interval == coordinator.poll_interval == timedelta(seconds=60)
+
+    @pytest.mark.asyncio
+    async def test_polling_disabled_schedules_nothing(self, hass) -> None:
+        """With polling disabled on the entry, no aligned poll is scheduled."""
+        coordinator = _make_coordinator(hass, {CONF_ALIGNED_POLLING: True})
+        hass.config_entries.async_update_entry(coordinator.config_entry, pref_disable_polling=True)
+
+        with patch.object(hass.loop, "call_at") as mock_call_at:
+            coordinator._schedule_refresh()
+
+        mock_call_at.assert_not_called()
+
+
+class TestCoordinatorPollScheduler:
+    """Tests for the scheduler shared by all config entries."""
+
+    @pytest.mark.asyncio
+    async def test_devices_share_one_scheduler(self, hass) -> None:
+        """Every coordinator registers with the same scheduler and leaves it on shutdown."""
+        first = _make_coordinator(hass)
+        second = _make_coordinator(hass, unique_id="E4U999999999")
+        scheduler = get_scheduler(hass)
+
+        assert first._scheduler is second._scheduler is scheduler
+        assert scheduler.phase(TEST_SERIAL_NUMBER, 60) == 0
+        assert scheduler.phase("E4U999999999", 60) == 30
+
+        await first.async_shutdown()
+        assert scheduler.phase("E4U999999999", 60) == 0
+
+    @pytest.mark.asyncio
+    async def test_read_cycle_holds_a_session(self, hass) -> None:
+        """The read cycle runs inside one of the scheduler's sessions."""
+        coordinator = _make_coordinator(hass)
+        scheduler = get_scheduler(hass)
+        active = []
+        coordinator.api.async_get_data = AsyncMock(
+            side_effect=lambda: active.append(scheduler.active) or True
+        )
+
+        await coordinator.async_update_data()
+
+        assert active == [1]
+        assert scheduler.active == 0
+
+    @pytest.mark.asyncio
+    async def test_first_refresh_after_restore_in_device_slot(self, hass) -> None:
+        """After a restore, the first poll waits for the device's slot of the period."""
+        _make_coordinator(hass)
+        coordinator = _make_coordinator(hass, unique_id="E4U999999999")
+
+        with (
+            patch.object(hass.loop, "time", return_value=500.0),
+            patch.object(hass.loop, "call_at") as mock_call_at,
+        ):
+            coordinator.async_schedule_first_refresh()
+
+        mock_call_at.assert_called_once()
+        assert coordinator.update_interval == timedelta(seconds=30)
+
+        # Once the first poll ran, polls are one poll interval apart again
+        await coordinator.async_update_data()
+        with patch.object(hass.loop, "call_at"):
+            coordinator._schedule_refresh()
+        assert coordinator.update_interval == timedelta(seconds=60)
+
+    @pytest.mark.asyncio
+    async def test_first_poll_after_setup_refresh_in_device_slot(self, hass) -> None:
+        """After setup's own first refresh, the next poll is the device's slot of the next period."""
+        _make_coordinator(hass)
+        coordinator = _make_coordinator(hass, unique_id="E4U999999999")
+        coordinator.api.device_snapshot.return_value = DeviceSnapshot.from_data({})
+        with patch.object(hass.loop, "call_at"):
+            await coordinator.async_refresh()
+
+        with (
+            patch.object(hass.loop, "time", return_value=500.0),
+            patch.object(hass.loop, "call_at") as mock_call_at,
+        ):
+            coordinator.async_schedule_first_refresh()
+
+        mock_call_at.assert_called_once()
+        assert coordinator.update_interval == timedelta(seconds=60 + 30)
+
+
+class TestCoordinatorRelayRefresh:
+    """Tests for the relay-only refresh after a relay write."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_relay_wakes_only_relay_listeners(self, hass) -> None:
+        """Only @rel is read, and only listeners of the changed relay state are woken."""
+        coordinator = _make_coordinator(hass, api_data={"relay_state": 0})
+        relay, serial = MagicMock(), MagicMock()
+        coordinator.async_add_listener(relay, "relay_state")
+        coordinator.async_add_listener(serial, "sn")
+        coordinator.async_update_listeners()
+        coordinator.api.async_get_data = AsyncMock()
+
+        async def _read_relay() -> int:
+            coordinator.api.data = {**coordinator.api.data, "relay_state": 1}
+            coordinator.api.generation += 1
+            return 1
+
+        coordinator.api.async_read_relay = AsyncMock(side_effect=_read_relay)
+        await coordinator.async_refresh_relay()
+
+        coordinator.api.async_get_data.assert_not_called()
+        assert coordinator.data is coordinator.api.device_snapshot.return_value
+        assert (relay.call_count, serial.call_count) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_refresh_relay_failure_is_not_published(self, hass) -> None:
+        """A failed relay read leaves the published data alone."""
+        coordinator = _make_coordinator(hass, api_data={"relay_state": 0})
+        coordinator.api.async_read_relay = AsyncMock(side_effect=TelnetCommandError("@rel"))
+        coordinator.async_publish = MagicMock()
+
+        await coordinator.async_refresh_relay()
+
+        coordinator.async_publish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_publish_keeps_poll_status_and_schedule(self, hass) -> None:
+        """Publishing a relay read-back neither marks the poll successful nor postpones it."""
+        coordinator = _make_coordinator(hass, api_data={"relay_state": 0})
+        coordinator.async_add_listener(MagicMock(), "relay_state")
+        coordinator.last_update_success = False
+        scheduled = coordinator._unsub_refresh
+        assert scheduled is not None
+
+        coordinator.async_publish()
+
+        assert coordinator.data is coordinator.api.device_snapshot.return_value
+        assert coordinator.last_update_success is False
+        assert coordinator._unsub_refresh is scheduled
+
+    @pytest.mark.asyncio
+    async def test_failed_relay_write_is_not_published(self, hass) -> None:
+        """A failed toggle during an outage keeps entities unavailable and polling on time."""
+        coordinator = _make_coordinator(hass, api_data={"relay_state": 0})
+        coordinator.async_add_listener(MagicMock(), "relay_state")
+        coordinator.last_update_success = False
+        scheduled = coordinator._unsub_refresh
+        coordinator.api.telnet_set_relay = AsyncMock(return_value=False)
+        coordinator.api.data = {
+            **coordinator.api.data,
+            **dict.fromkeys(("manufact", "model", "swver", "hwver"), ""),
+        }
+        switch = Elios4YouSwitch(
+            coordinator,
+            "Relay",
+            "relay_state",
+            "mdi:toggle-switch-outline",
+            SwitchDeviceClass.SWITCH,
+        )
+
+        await switch.async_turn_on()
+
+        assert coordinator.data is None
+        assert coordinator.last_update_success is False
+        assert coordinator._unsub_refresh is scheduled
@@ -0,0 +1,134 @@
+"""Integration tests against the local device simulator.
+
+Covers, over real localhost sockets:
+* a full read cycle and a relay switch through Elios4YouAPI
+* framing robustness against a stray leading LF and dribbled partial chunks
+* a silent reply being retried after an RST that frees the device's slot
+* CLOSE_WAIT exhaustion after graceful closes, and RST avoiding it
+* a deaf device failing the command instead of hanging
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+from custom_components.fournoks_elios4you.api import Elios4YouAPI
+from custom_components.fournoks_elios4you.connection_manager import (
+    ConnectionManager,
+    TelnetCommandError,
+)
+import pytest
+
+from .conftest import TEST_NAME
+from .device_simulator import DeviceSimulator, SimulatorFaults
+
+
+@pytest.fixture
+async def sim(socket_enabled: None) -> AsyncGenerator[DeviceSimulator]:
+    """Run a simulator with two socket slots on a free localhost port."""
+    async with DeviceSimulator(slots=2) as simulator:
+        yield simulator
+
+
+def _manager(sim: DeviceSimulator, **kwargs) -> ConnectionManager:
+    kwargs.setdefault("read_timeout", 0.3)
+    kwargs.setdefault("retry_delay", 0.0)
+    return ConnectionManager(sim.host, sim.port, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_api_read_cycle_and_relay(sim: DeviceSimulator, mock_hass) -> None:
+    """The API reads every tier and switches the relay against the simulator."""
+    api = Elios4YouAPI(mock_hass, TEST_NAME, sim.host, sim.port)
+    try:
+        assert await api.async_get_data() is True
+        assert api.data["produced_power"] == 2.5
+        assert api.data["sold_energy_f2"] == 580.2
+        assert api.data["sn"] == "E4USIM000001"
+        assert api.data["swver"] == "2.13 / 1.07"
+        assert api.data["self_consumed_power"] == 1.7
+
+        assert await api.telnet_set_relay("on") is True
+        assert sim.relay == 1
+        assert api.data["relay_state"] == 1
+    finally:
+        await api.close()
+
+    assert sim.stats.commands[:3] == ["@dat", "@sta", "@inf"]
+    assert sim.stats.accepted == 1  # one reused connection for everything
+
+
+@pytest.mark.asyncio
+async def test_leading_lf_and_partial_chunks(sim: DeviceSimulator) -> None:
+    """Replies dribbled out 3 bytes at a time after a stray LF still frame and parse."""
+    sim.faults = SimulatorFaults(leading_lf=True, chunk_size=3, chunk_delay=0.001)
+    mgr = _manager(sim, read_timeout=2.0)
+    try:
+        dat, inf = await mgr.execute_batch(["@dat", "@inf"])
+    finally:
+        await mgr.close()
+
+    assert Elios4YouAPI._parse("@dat", dat)["produced_power"] == "2.50"
+    assert Elios4YouAPI._parse("@inf", inf)["fwtop"] == "2.13"
+
+
+@pytest.mark.asyncio
+async def test_silent_reply_is_retried_after_reset(sim: DeviceSimulator) -> None:
+    """A swallowed command costs one RST and a reconnect, then succeeds."""
+    sim.faults.silent_next = 1
+    mgr = _manager(sim, max_retries=1)
+    try:
+        raw = await mgr.execute("@dat")
+    finally:
+        await mgr.close()
+
+    assert "Produced Power" in raw
+    assert mgr.metrics.silent_timeouts == 1
+    assert mgr.metrics.forced_aborts == 1
+    assert sim.stats.resets == 1
+    assert sim.stats.accepted == 2
+
+
+@pytest.mark.asyncio
+async def test_close_wait_exhausts_slots_on_fin(sim: DeviceSimulator) -> None:
+    """Graceful closes leave slots in CLOSE_WAIT until the device stops answering."""
+    sim.faults.close_wait_on_fin = True
+    for _ in range(sim.slots):
+        mgr = _manager(sim)
+        await mgr.execute("@rel")
+        await mgr.close()  # FIN
+
+    await sim.wait_for_slots(sim.slots)
+    mgr = _manager(sim, max_retries=0)
+    with pytest.raises(TelnetCommandError):
+        await mgr.execute("@rel")
+    assert sim.stats.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_reset_frees_slot_despite_close_wait(sim: DeviceSimulator) -> None:
+    """The manager's RST on error paths does not leave a slot behind."""
+    sim.faults.close_wait_on_fin = True
+    sim.faults.silent_next = sim.slots
+    mgr = _manager(sim, max_retries=sim.slots)
+    try:
+        await mgr.execute("@rel")
+    finally:
+        await mgr._close_safely(force_abort=True)
+
+    await sim.wait_for_slots(0)
+    assert sim.stats.resets == sim.stats.accepted == sim.slots + 1
+    assert sim.stats.rejected == 0
+
+
+@pytest.mark.asyncio
+async def test_deaf_device_fails_command(sim: DeviceSimulator) -> None:
+    """A deaf device accepts the connection but the command fails within the timeout."""
+    sim.faults.deaf = True
+    mgr = _manager(sim, max_retries=1)
+    with pytest.raises(TelnetCommandError):
+        await mgr.execute("@dat")
+    await mgr.close()
+
+    assert sim.stats.unanswered == 2
+    assert mgr.metrics.silent_timeouts == 2
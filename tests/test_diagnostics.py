@@ -12,7 +12,10 @@ import pytest
 
 # Direct imports using symlink (fournoks_elios4you -> 4noks_elios4you)
 from custom_components.fournoks_elios4you.const import CONF_SCAN_INTERVAL, DOMAIN, VERSION
-from custom_components.fournoks_elios4you.diagnostics import async_get_config_entry_diagnostics
+from custom_components.fournoks_elios4you.diagnostics import (
+    _redact_trace,
+    async_get_config_entry_diagnostics,
+)
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT
 from homeassistant.core import HomeAssistant
 
@@ -34,8 +37,32 @@ def mock_coordinator(mock_api_data):
     coordinator.api.connection_manager.metrics_snapshot = MagicMock(
         return_value={"state": "ready", "consecutive_failures": 0}
     )
+    coordinator.api.connection_manager.latency_snapshot = MagicMock(
+        return_value={"separator": {"all": {"count": 1, "p95_ms": 45.3}}}
+    )
+    coordinator.api.connection_manager.trace_snapshot = MagicMock(
+        return_value={
+            "capacity": 256,
+            "recorded": 2,
+            "dropped": 0,
+            "events": [
+                {"at": 1.0, "kind": "send", "command": "@inf", "data": "@inf\n", "detail": ""},
+                {
+                    "at": 1.1,
+                    "kind": "recv",
+                    "command": "@inf",
+                    "data": f"@inf\r\nsn={TEST_SERIAL_NUMBER}\r\nfwtop=2.13\r\n\r\nready...",
+                    "detail": "ok",
+                },
+            ],
+        }
+    )
+    coordinator.api.generation = 7
+    coordinator.api.captured_at = 1_700_000_000.0
+    coordinator.api.command_status = {"@dat": "ok", "@inf": "silent_timeout"}
+    coordinator.stale_keys = frozenset({"sn"})
     coordinator.last_update_success = True
-    coordinator.update_interval = timedelta(seconds=60)
+    coordinator.poll_interval = timedelta(seconds=60)
     return coordinator
 
 
@@ -71,6 +98,8 @@ class TestDiagnostics:
         assert "device" in result
         assert "coordinator" in result
         assert "sensors" in result
+        assert result["latency"]["separator"]["all"]["count"] == 1
+        assert result["trace"]["recorded"] == 2
 
     @pytest.mark.asyncio
     async def test_diagnostics_config_section(self, hass: HomeAssistant, mock_coordinator) -> None:
@@ -158,6 +187,10 @@ class TestDiagnostics:
         coordinator = result["coordinator"]
         assert coordinator["last_update_success"] is True
         assert coordinator["update_interval_seconds"] == 60.0
+        assert coordinator["data_generation"] == 7
+        assert coordinator["data_captured_at"] == 1_700_000_000.0
+        assert coordinator["command_status"] == {"@dat": "ok", "@inf": "silent_timeout"}
+        assert coordinator["stale_keys"] == ["sn"]
 
     @pytest.mark.asyncio
     async def test_diagnostics_redacts_sensitive_data(
@@ -256,11 +289,47 @@ class TestDiagnostics:
         # Name should NOT be redacted
         assert config_data.get(CONF_NAME) == TEST_NAME
 
+    @pytest.mark.asyncio
+    async def test_diagnostics_trace_redacted(self, hass: HomeAssistant, mock_coordinator) -> None:
+        """Test diagnostics masks the serial number inside traced replies."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                CONF_NAME: TEST_NAME,
+                CONF_HOST: TEST_HOST,
+                CONF_PORT: TEST_PORT,
+            },
+            options={
+                CONF_SCAN_INTERVAL: TEST_SCAN_INTERVAL,
+            },
+        )
+        entry.add_to_hass(hass)
+
+        runtime_data = MagicMock()
+        runtime_data.coordinator = mock_coordinator
+        entry.runtime_data = runtime_data
+
+        result = await async_get_config_entry_diagnostics(hass, entry)
+
+        reply = result["trace"]["events"][1]["data"]
+        assert TEST_SERIAL_NUMBER not in reply
+        assert "sn=**REDACTED**\r\n" in reply
+        assert "fwtop=2.13" in reply
+
+    def test_trace_redaction_ignores_key_case(self) -> None:
+        """Test a record key in upper case is masked too."""
+        trace = {"events": [{"kind": "recv", "data": f"SN={TEST_SERIAL_NUMBER}\r\nfwtop=2.13"}]}
+
+        reply = _redact_trace(trace)["events"][0]["data"]
+
+        assert TEST_SERIAL_NUMBER not in reply
+        assert reply == "SN=**REDACTED**\r\nfwtop=2.13"
+
     @pytest.mark.asyncio
     async def test_diagnostics_with_no_update_interval(
         self, hass: HomeAssistant, mock_coordinator
     ) -> None:
-        """Test diagnostics handles None update_interval."""
+        """Test diagnostics handles None poll_interval."""
         entry = MockConfigEntry(
             domain=DOMAIN,
             data={
@@ -274,7 +343,7 @@ class TestDiagnostics:
         )
         entry.add_to_hass(hass)
 
-        mock_coordinator.update_interval = None
+        mock_coordinator.poll_interval = None
 
         runtime_data = MagicMock()
         runtime_data.coordinator = mock_coordinator
@@ -5,6 +5,7 @@ https://github.com/alexdelprete/ha-4noks-elios4you
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 # Direct imports using symlink (fournoks_elios4you -> 4noks_elios4you)
@@ -12,6 +13,7 @@ from custom_components.fournoks_elios4you import (
     RuntimeData,
     async_migrate_entry,
     async_remove_config_entry_device,
+    async_remove_entry,
     async_setup_entry,
     async_unload_entry,
     async_update_device_registry,
@@ -26,6 +28,8 @@ from custom_components.fournoks_elios4you.const import (
     DEFAULT_FAILURES_THRESHOLD,
     DEFAULT_RECOVERY_SCRIPT,
     DOMAIN,
+    STORAGE_KEY,
+    STORAGE_VERSION,
 )
 from custom_components.fournoks_elios4you.coordinator import Elios4YouCoordinator
 import pytest
@@ -36,7 +40,7 @@ from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceEntry
 
-from .conftest import TEST_HOST, TEST_NAME, TEST_PORT, TEST_SCAN_INTERVAL
+from .conftest import TEST_HOST, TEST_NAME, TEST_PORT, TEST_SCAN_INTERVAL, TEST_SERIAL_NUMBER
 from .test_config_flow import MockConfigEntry
 
 
@@ -121,6 +125,120 @@ async def test_async_setup_entry_raises_not_ready_when_sn_empty(
         await async_setup_entry(hass, entry)
 
 
+def _snapshot_storage(entry_id: str, serial: str) -> tuple[str, dict]:
+    """Return the storage key and stored contents of a persisted snapshot."""
+    return f"{STORAGE_KEY}.{entry_id}", {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{STORAGE_KEY}.{entry_id}",
+        "data": {
+            "saved_at": 1_700_000_000.0,
+            "data": {"sn": serial, "produced_power": 2.5},
+            "updated_at": {"produced_power": ["@dat", 1_699_999_990.0]},
+        },
+    }
+
+
+async def test_async_setup_entry_restores_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    mock_elios4you_api,
+) -> None:
+    """With a persisted snapshot, setup completes without a blocking first refresh."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=TEST_SERIAL_NUMBER,
+        data={
+            CONF_NAME: TEST_NAME,
+            CONF_HOST: TEST_HOST,
+            CONF_PORT: TEST_PORT,
+        },
+        options={
+            CONF_SCAN_INTERVAL: TEST_SCAN_INTERVAL,
+        },
+    )
+    entry.add_to_hass(hass)
+    key, stored = _snapshot_storage(entry.entry_id, TEST_SERIAL_NUMBER)
+    hass_storage[key] = stored
+
+    api_instance = mock_elios4you_api.return_value
+    with (
+        patch.object(_elios4you_coordinator, "Elios4YouAPI", return_value=api_instance),
+        patch.object(
+            Elios4YouCoordinator, "async_config_entry_first_refresh", new_callable=AsyncMock
+        ) as first_refresh,
+        patch.object(
+            Elios4YouCoordinator, "_handle_refresh_interval", new_callable=AsyncMock
+        ) as refresh,
+        patch.object(hass.config_entries, "async_forward_entry_setups", new_callable=AsyncMock),
+    ):
+        assert await async_setup_entry(hass, entry) is True
+        # The only device's slot starts the period: its first poll is due at
+        # once, give or take the base class's sub-second timer jitter
+        await asyncio.sleep(0.6)
+        await hass.async_block_till_done()
+
+    api_instance.restore.assert_called_once_with(
+        stored["data"]["data"], stored["data"]["updated_at"]
+    )
+    first_refresh.assert_not_called()
+    refresh.assert_awaited_once()
+
+
+async def test_async_setup_entry_ignores_snapshot_of_other_device(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    mock_elios4you_api,
+) -> None:
+    """A snapshot with a different serial number falls back to the blocking refresh."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=TEST_SERIAL_NUMBER,
+        data={
+            CONF_NAME: TEST_NAME,
+            CONF_HOST: TEST_HOST,
+            CONF_PORT: TEST_PORT,
+        },
+        options={
+            CONF_SCAN_INTERVAL: TEST_SCAN_INTERVAL,
+        },
+    )
+    entry.add_to_hass(hass)
+    key, stored = _snapshot_storage(entry.entry_id, "OTHER0000000")
+    hass_storage[key] = stored
+
+    api_instance = mock_elios4you_api.return_value
+    with (
+        patch.object(_elios4you_coordinator, "Elios4YouAPI", return_value=api_instance),
+        patch.object(
+            Elios4YouCoordinator, "async_config_entry_first_refresh", new_callable=AsyncMock
+        ) as first_refresh,
+        patch.object(hass.config_entries, "async_forward_entry_setups", new_callable=AsyncMock),
+        patch.object(Elios4YouCoordinator, "async_schedule_first_refresh") as schedule_first,
+    ):
+        assert await async_setup_entry(hass, entry) is True
+
+    api_instance.restore.assert_not_called()
+    first_refresh.assert_awaited_once()
+    # The next poll still lands in the device's slot of the period
+    schedule_first.assert_called_once()
+
+
+async def test_async_remove_entry_deletes_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict,
+) -> None:
+    """Removing the config entry deletes its persisted snapshot."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_NAME: TEST_NAME})
+    entry.add_to_hass(hass)
+    key, stored = _snapshot_storage(entry.entry_id, TEST_SERIAL_NUMBER)
+    hass_storage[key] = stored
+
+    await async_remove_entry(hass, entry)
+
+    assert key not in hass_storage
+
+
 async def test_async_unload_entry(
     hass: HomeAssistant,
     mock_elios4you_api,
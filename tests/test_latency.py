@@ -0,0 +1,143 @@
+"""Tests for the latency histograms.
+
+Covers:
+* percentiles reported as the upper bound of the covering bucket
+* the overflow bucket reporting the observed maximum
+* per-command histograms feeding the ``all`` aggregate
+* snapshot() listing only phases/commands that have samples
+* the RFC 6298 round-trip estimator, its bounds and timeout backoff
+"""
+
+from __future__ import annotations
+
+from custom_components.fournoks_elios4you.latency import (
+    ALL_COMMANDS,
+    LatencyHistogram,
+    LatencyPhase,
+    LatencyTracker,
+    RttEstimator,
+)
+import pytest
+
+
+class TestLatencyHistogram:
+    """Bucketing and percentile estimates."""
+
+    def test_empty_histogram_reports_zero(self) -> None:
+        """No samples: every percentile and the summary are zero."""
+        hist = LatencyHistogram()
+        assert hist.percentile(95) == 0.0
+        assert hist.summary() == {
+            "count": 0,
+            "mean_ms": 0.0,
+            "max_ms": 0.0,
+            "p50_ms": 0.0,
+            "p95_ms": 0.0,
+            "p99_ms": 0.0,
+        }
+
+    def test_percentile_is_within_one_bucket(self) -> None:
+        """The estimate is never below the true value and at most ~19 % above it."""
+        hist = LatencyHistogram()
+        for ms in range(1, 101):
+            hist.record(ms / 1000)
+
+        for pct, exact in ((50, 0.050), (95, 0.095), (99, 0.099)):
+            estimate = hist.percentile(pct)
+            assert exact <= estimate <= exact * 2**0.25
+
+    def test_tail_sample_drives_p99(self) -> None:
+        """One slow reply among fast ones shows in p99 but not p50."""
+        hist = LatencyHistogram()
+        for _ in range(99):
+            hist.record(0.040)
+        hist.record(2.0)
+        assert hist.percentile(50) < 0.05
+        assert hist.percentile(100) >= 2.0
+        assert hist.max == 2.0
+        assert hist.count == 100
+
+    def test_overflow_bucket_reports_maximum(self) -> None:
+        """Samples beyond the last bound report the observed maximum."""
+        hist = LatencyHistogram()
+        hist.record(120.0)
+        assert hist.percentile(50) == 120.0
+
+
+class TestLatencyTracker:
+    """Per-command and aggregate histograms."""
+
+    @pytest.mark.parametrize(
+        ("cmd", "label"), [("@dat", "@dat"), ("@REL 0 1", "@rel"), ("@inf", "@inf")]
+    )
+    def test_label_is_first_token(self, cmd: str, label: str) -> None:
+        """Relay writes with arguments share the ``@rel`` histograms."""
+        assert LatencyTracker.label(cmd) == label
+
+    def test_record_feeds_command_and_aggregate(self) -> None:
+        """Each sample lands in its command's histogram and in ``all``."""
+        tracker = LatencyTracker()
+        tracker.record("@dat", LatencyPhase.SEPARATOR, 0.2)
+        tracker.record("@sta", LatencyPhase.SEPARATOR, 0.1)
+
+        assert tracker.histogram("@dat", LatencyPhase.SEPARATOR).count == 1
+        assert tracker.histogram(ALL_COMMANDS, LatencyPhase.SEPARATOR).count == 2
+        assert tracker.histogram(ALL_COMMANDS, LatencyPhase.TTFB).count == 0
+
+    def test_snapshot_skips_empty_histograms(self) -> None:
+        """Diagnostics only list phases and commands that were measured."""
+        tracker = LatencyTracker()
+        tracker.connect.record(0.03)
+        tracker.record("@dat", LatencyPhase.WRITE, 0.001)
+
+        snap = tracker.snapshot()
+        assert set(snap) == {"connect", "write"}
+        assert set(snap["write"]) == {"@dat", ALL_COMMANDS}
+        assert snap["connect"][ALL_COMMANDS]["count"] == 1
+
+
+class TestRttEstimator:
+    """Timeouts derived from observed round trips."""
+
+    def test_ceiling_until_first_sample(self) -> None:
+        """Without measurements the configured ceiling applies."""
+        assert RttEstimator(1.0, 5.0).timeout == 5.0
+
+    def test_first_sample_sets_srtt_and_rttvar(self) -> None:
+        """SRTT = R and RTTVAR = R/2 after the first sample (RFC 6298 2.2)."""
+        estimator = RttEstimator(0.0, 60.0)
+        estimator.sample(0.4)
+        assert estimator.srtt == pytest.approx(0.4)
+        assert estimator.rttvar == pytest.approx(0.2)
+        assert estimator.timeout == pytest.approx(0.4 + 4 * 0.2)
+
+    def test_smoothing_follows_rfc_6298(self) -> None:
+        """Later samples update RTTVAR before SRTT with beta=1/4, alpha=1/8."""
+        estimator = RttEstimator(0.0, 60.0)
+        estimator.sample(0.4)
+        estimator.sample(0.8)
+        assert estimator.rttvar == pytest.approx(0.75 * 0.2 + 0.25 * 0.4)
+        assert estimator.srtt == pytest.approx(0.875 * 0.4 + 0.125 * 0.8)
+
+    def test_timeout_clamped_to_floor_and_ceiling(self) -> None:
+        """Fast replies cannot push the timeout below the floor, nor slow ones past the ceiling."""
+        fast = RttEstimator(1.0, 5.0)
+        fast.sample(0.05)
+        assert fast.timeout == 1.0
+
+        slow = RttEstimator(1.0, 5.0)
+        slow.sample(4.0)
+        assert slow.timeout == 5.0
+
+    def test_backoff_doubles_until_next_sample(self) -> None:
+        """Each timeout doubles the timeout; a good sample resets the multiplier."""
+        estimator = RttEstimator(0.0, 60.0)
+        estimator.sample(0.5)
+        base = estimator.timeout
+        estimator.backoff()
+        assert estimator.timeout == pytest.approx(2 * base)
+        estimator.backoff()
+        assert estimator.timeout == pytest.approx(4 * base)
+
+        estimator.sample(0.5)
+        assert estimator.timeout < 2 * base
@@ -0,0 +1,73 @@
+"""Tests for the typed device snapshot.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+import dataclasses
+
+from custom_components.fournoks_elios4you.api import Elios4YouAPI
+from custom_components.fournoks_elios4you.const import SENSOR_ENTITIES
+from custom_components.fournoks_elios4you.model import DeviceSnapshot, snapshot_reader
+import pytest
+
+from .conftest import TEST_HOST, TEST_NAME, TEST_PORT, TEST_SERIAL_NUMBER
+
+
+def test_snapshot_coerces_values_by_section(mock_hass) -> None:
+    """Values are typed by their field: floats, ints and strings."""
+    api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+    api.data.update(produced_power=2.318, relay_state=1, sn=TEST_SERIAL_NUMBER)
+
+    snapshot = api.device_snapshot()
+
+    assert snapshot.measurements.produced_power == 2.318
+    assert isinstance(snapshot.measurements.daily_peak, float)
+    assert snapshot.measurements.relay_state == 1
+    assert snapshot.static.sn == TEST_SERIAL_NUMBER
+    assert snapshot.static.manufact == "4-noks"
+    assert snapshot.diagnostics.state == "disconnected"
+    assert snapshot.diagnostics.commands_sent == 0
+
+
+def test_missing_keys_get_zero_values() -> None:
+    """A key absent from the dict view gets its type's zero value."""
+    snapshot = DeviceSnapshot.from_data({})
+
+    assert snapshot.measurements.produced_power == 0.0
+    assert snapshot.measurements.alarm_1 == 0
+    assert snapshot.static.sn == ""
+
+
+def test_snapshot_is_immutable_and_slotted() -> None:
+    """Snapshots can be shared safely: no assignment, no per-instance dict."""
+    snapshot = DeviceSnapshot.from_data({})
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.measurements.produced_power = 1.0  # type: ignore[misc]
+    assert not hasattr(snapshot.measurements, "__dict__")
+
+
+def test_as_dict_round_trips_the_dict_view(mock_hass) -> None:
+    """as_dict() rebuilds the flat view, diagnostics with the cm_ prefix."""
+    api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+    view = api.device_snapshot().as_dict()
+
+    assert view["cm_state"] == "disconnected"
+    rebuilt = DeviceSnapshot.from_data(view)
+    assert rebuilt.measurements == api.device_snapshot().measurements
+    assert rebuilt.static == api.device_snapshot().static
+    assert rebuilt.diagnostics == api.device_snapshot().diagnostics
+
+
+def test_every_sensor_key_has_a_reader(mock_hass) -> None:
+    """Each sensor's key maps to a typed field of the snapshot."""
+    api = Elios4YouAPI(mock_hass, TEST_NAME, TEST_HOST, TEST_PORT)
+    snapshot = api.device_snapshot()
+
+    for sensor in SENSOR_ENTITIES:
+        reader = snapshot_reader(sensor["key"])
+        assert reader is not None, sensor["key"]
+        assert reader(snapshot) == type(reader(snapshot))(api.data[sensor["key"]])
+    assert snapshot_reader("utc_time") is None
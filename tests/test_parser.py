@@ -0,0 +1,94 @@
+"""Tests for the incremental response parser.
+
+Covers:
+* both record formats (``index;key;value`` and ``key=value``)
+* echoed command vs. stray leading LF
+* identical results however the response is split into chunks
+* malformed lines surfacing as ValueError from ``result()``
+* ``reset()`` discarding a half-read response
+"""
+
+from __future__ import annotations
+
+from custom_components.fournoks_elios4you.parser import ResponseParser, parse_response
+import pytest
+
+DAT_RAW = "@dat\n0;produced_power;2.5\n1;Consumed Power;1.8\n2;utc_time;12:00\n\nready..."
+INF_RAW = "@inf\nsn=ABC123\nfwtop=1.0\nfwbtm=2.0\n\nready..."
+
+
+def _feed_in_chunks(cmd: str, raw: str, size: int) -> ResponseParser:
+    data = raw.encode()
+    parser = ResponseParser(cmd)
+    for i in range(0, len(data), size):
+        parser.feed(data[i : i + size])
+    parser.finish()
+    return parser
+
+
+class TestParseResponse:
+    """One-shot parsing of complete responses."""
+
+    def test_semicolon_format(self) -> None:
+        """@dat records are index;key;value with normalized keys."""
+        assert parse_response("@dat", DAT_RAW) == {
+            "produced_power": "2.5",
+            "consumed_power": "1.8",
+            "utc_time": "12:00",
+        }
+
+    def test_equals_format(self) -> None:
+        """@inf records are key=value."""
+        assert parse_response("@inf", INF_RAW) == {"sn": "ABC123", "fwtop": "1.0", "fwbtm": "2.0"}
+
+    def test_leading_linefeed_skips_echo(self) -> None:
+        """A stray LF before the echoed command shifts the first record by one line."""
+        assert parse_response("@dat", "\n" + DAT_RAW) == parse_response("@dat", DAT_RAW)
+
+    def test_crlf_line_endings(self) -> None:
+        """CRLF line endings parse the same as LF."""
+        assert parse_response("@inf", INF_RAW.replace("\n", "\r\n")) == parse_response(
+            "@inf", INF_RAW
+        )
+
+    def test_trailing_newline_after_separator(self) -> None:
+        """A LF after the separator does not turn the trailer into a record."""
+        assert parse_response("@inf", INF_RAW + "\n") == parse_response("@inf", INF_RAW)
+
+    def test_malformed_line_raises_value_error(self) -> None:
+        """A record without the expected separator raises ValueError."""
+        with pytest.raises(ValueError):
+            parse_response("@inf", "@inf\nnot-a-record\n\nready...")
+
+
+class TestStreaming:
+    """Push-style feeding of partial chunks."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+    def test_chunking_does_not_change_the_result(self, size: int) -> None:
+        """Every chunk size yields the same records as the one-shot parse."""
+        parser = _feed_in_chunks("@dat", DAT_RAW, size)
+        assert parser.complete is True
+        assert parser.result() == parse_response("@dat", DAT_RAW)
+
+    def test_records_are_parsed_before_the_response_ends(self) -> None:
+        """A record is emitted once two more lines have arrived after it."""
+        parser = ResponseParser("@inf")
+        parser.feed(b"@inf\nsn=ABC123\nfwtop=1.0\nfwbtm=2.0\n")
+        assert parser.complete is False
+        assert parser.result() == {"sn": "ABC123"}
+
+    def test_multibyte_character_split_across_chunks(self) -> None:
+        """UTF-8 sequences split between chunks decode correctly."""
+        raw = "@inf\nname=Caffè\n\nready..."
+        parser = _feed_in_chunks("@inf", raw, 1)
+        assert parser.result() == {"name": "Caffè"}
+
+    def test_reset_discards_partial_response(self) -> None:
+        """After reset() the parser starts over, as on a retried command."""
+        parser = ResponseParser("@inf")
+        parser.feed(b"@inf\nsn=OLD\nfwtop=0.1\n")
+        parser.reset()
+        parser.feed(INF_RAW.encode())
+        parser.finish()
+        assert parser.result() == {"sn": "ABC123", "fwtop": "1.0", "fwbtm": "2.0"}
@@ -0,0 +1,126 @@
+"""Tests for the poll schedule.
+
+Covers:
+* delays landing on wall-clock multiples of the interval, shifted by the phase
+* a boundary closer than MIN_DELAY being skipped
+* devices spread evenly over the period by the shared scheduler
+* the cap on concurrent sessions, stale devices first
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.fournoks_elios4you.schedule import (
+    MIN_DELAY,
+    PollScheduler,
+    next_aligned_delay,
+)
+import pytest
+
+
+@pytest.mark.parametrize(
+    ("now", "phase", "expected"),
+    [
+        (1000.0, 0.0, 10.0),  # on a boundary: the next one
+        (1003.5, 0.0, 6.5),
+        (1003.5, 2.0, 8.5),  # boundaries at ...2, 12, 22
+        (1001.0, 2.0, 1.0),
+    ],
+)
+def test_delay_lands_on_shifted_boundary(now: float, phase: float, expected: float) -> None:
+    """The delay reaches the next multiple of the interval plus the phase."""
+    delay = next_aligned_delay(now, 10, phase)
+
+    assert delay == pytest.approx(expected)
+    assert (now + delay - phase) % 10 == pytest.approx(0)
+
+
+def test_close_boundary_is_skipped() -> None:
+    """A boundary less than MIN_DELAY away is skipped for the following one."""
+    assert next_aligned_delay(1009.5, 10) == pytest.approx(10.5)
+    assert next_aligned_delay(1010 - MIN_DELAY, 10) == pytest.approx(MIN_DELAY)
+
+
+def test_cycle_duration_does_not_drift() -> None:
+    """However long each cycle takes, polls keep firing on the same boundaries."""
+    now = 1000.0
+    fired = []
+    for duration in (0.2, 3.7, 8.0, 0.0, 5.5):
+        now += next_aligned_delay(now, 10)
+        fired.append(now)
+        now += duration
+
+    assert fired == pytest.approx([1010, 1020, 1030, 1040, 1050])
+
+
+def test_devices_spread_evenly_over_the_period() -> None:
+    """Registered devices get evenly spaced slots, recomputed on unregister."""
+    scheduler = PollScheduler(2)
+    for key in ("c", "a", "b", "a"):
+        scheduler.register(key)
+
+    assert [scheduler.phase(key, 60) for key in "abc"] == [0, 20, 40]
+    scheduler.unregister("a")
+    assert [scheduler.phase(key, 60) for key in "bc"] == [0, 30]
+    assert scheduler.phase("unknown", 60) == 0
+
+
+async def _cycle(scheduler: PollScheduler, name: str, order: list[str], *, stale=False) -> None:
+    async with scheduler.session(stale=stale):
+        order.append(name)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_capped() -> None:
+    """No more than max_sessions cycles run at once."""
+    scheduler = PollScheduler(2)
+    peak = 0
+
+    async def cycle() -> None:
+        nonlocal peak
+        async with scheduler.session():
+            peak = max(peak, scheduler.active)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(cycle() for _ in range(5)))
+
+    assert peak == 2
+    assert scheduler.active == 0
+    assert scheduler.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_devices_get_the_next_session() -> None:
+    """Waiting cycles of stale devices run before the others, then in arrival order."""
+    scheduler = PollScheduler(1)
+    order: list[str] = []
+    async with scheduler.session():
+        tasks = [
+            asyncio.create_task(_cycle(scheduler, "fresh-1", order)),
+            asyncio.create_task(_cycle(scheduler, "fresh-2", order)),
+            asyncio.create_task(_cycle(scheduler, "stale", order, stale=True)),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.waiting == 3
+
+    await asyncio.gather(*tasks)
+    assert order == ["stale", "fresh-1", "fresh-2"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_passes_the_session_on() -> None:
+    """A cycle cancelled while waiting never holds a session."""
+    scheduler = PollScheduler(1)
+    order: list[str] = []
+    async with scheduler.session():
+        cancelled = asyncio.create_task(_cycle(scheduler, "cancelled", order))
+        waiting = asyncio.create_task(_cycle(scheduler, "waiting", order))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+    await waiting
+    assert order == ["waiting"]
+    assert scheduler.active == 0
@@ -0,0 +1,154 @@
+"""Tests for the priority command scheduler.
+
+Covers:
+* one holder at a time, waiters served by priority then arrival order
+* cancelled waiters being skipped, and a granted-then-cancelled waiter
+  passing the slot on
+* yield_to_higher() handing the slot to a more urgent waiter
+* cancel_queued() rejecting waiters without touching the holder
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.fournoks_elios4you.scheduler import CommandPriority, CommandScheduler
+import pytest
+
+
+async def _run(
+    scheduler: CommandScheduler,
+    priority: CommandPriority,
+    name: str,
+    order: list[str],
+    hold: asyncio.Event | None = None,
+) -> None:
+    async with scheduler.slot(priority):
+        order.append(name)
+        if hold is not None:
+            await hold.wait()
+
+
+class TestOrdering:
+    """Who gets the slot next."""
+
+    @pytest.mark.asyncio
+    async def test_waiters_served_by_priority_then_fifo(self) -> None:
+        """A later interactive waiter overtakes queued polls; equal priorities stay FIFO."""
+        scheduler = CommandScheduler()
+        order: list[str] = []
+        hold = asyncio.Event()
+
+        holder = asyncio.create_task(_run(scheduler, CommandPriority.POLL, "holder", order, hold))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(_run(scheduler, CommandPriority.POLL, "poll-1", order)),
+            asyncio.create_task(_run(scheduler, CommandPriority.POLL, "poll-2", order)),
+            asyncio.create_task(_run(scheduler, CommandPriority.INTERACTIVE, "relay", order)),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.busy is True
+        assert scheduler.queued == 3
+
+        hold.set()
+        await asyncio.gather(holder, *waiters)
+
+        assert order == ["holder", "relay", "poll-1", "poll-2"]
+        assert scheduler.busy is False
+        assert scheduler.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_skipped(self) -> None:
+        """A waiter cancelled while queued never gets the slot."""
+        scheduler = CommandScheduler()
+        order: list[str] = []
+        hold = asyncio.Event()
+
+        holder = asyncio.create_task(_run(scheduler, CommandPriority.POLL, "holder", order, hold))
+        await asyncio.sleep(0)
+        doomed = asyncio.create_task(_run(scheduler, CommandPriority.INTERACTIVE, "doomed", order))
+        other = asyncio.create_task(_run(scheduler, CommandPriority.POLL, "other", order))
+        await asyncio.sleep(0)
+
+        doomed.cancel()
+        hold.set()
+        await asyncio.gather(holder, other)
+        with pytest.raises(asyncio.CancelledError):
+            await doomed
+
+        assert order == ["holder", "other"]
+        assert scheduler.busy is False
+
+    @pytest.mark.asyncio
+    async def test_granted_then_cancelled_waiter_passes_slot_on(self) -> None:
+        """Cancelling a waiter right after it was granted the slot does not leak it."""
+        scheduler = CommandScheduler()
+        await scheduler.acquire(CommandPriority.POLL)
+        first = asyncio.create_task(scheduler.acquire(CommandPriority.POLL))
+        second = asyncio.create_task(scheduler.acquire(CommandPriority.POLL))
+        await asyncio.sleep(0)
+
+        scheduler.release()  # grants ``first``...
+        first.cancel()  # ...which is cancelled before it resumes
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.wait_for(second, 1.0)
+
+        assert scheduler.busy is True
+        scheduler.release()
+        assert scheduler.busy is False
+
+
+class TestYieldAndCancel:
+    """Temporarily giving the slot away, and rejecting waiters."""
+
+    @pytest.mark.asyncio
+    async def test_yield_to_higher_lets_interactive_run(self) -> None:
+        """A holder yields only to strictly more urgent waiters and gets the slot back."""
+        scheduler = CommandScheduler()
+        order: list[str] = []
+
+        async with scheduler.slot(CommandPriority.POLL) as slot:
+            poll = asyncio.create_task(_run(scheduler, CommandPriority.POLL, "poll", order))
+            await asyncio.sleep(0)
+            assert await slot.yield_to_higher() is False
+
+            relay = asyncio.create_task(
+                _run(scheduler, CommandPriority.INTERACTIVE, "relay", order)
+            )
+            await asyncio.sleep(0)
+            assert await slot.yield_to_higher() is True
+            order.append("holder-again")
+
+        await asyncio.gather(poll, relay)
+        assert order == ["relay", "holder-again", "poll"]
+        assert scheduler.busy is False
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_respects_min_priority(self) -> None:
+        """Only waiters at min_priority or less urgent are rejected; the holder is untouched."""
+        scheduler = CommandScheduler()
+        order: list[str] = []
+        hold = asyncio.Event()
+
+        holder = asyncio.create_task(_run(scheduler, CommandPriority.POLL, "holder", order, hold))
+        await asyncio.sleep(0)
+        relay = asyncio.create_task(_run(scheduler, CommandPriority.INTERACTIVE, "relay", order))
+        polls = [
+            asyncio.create_task(_run(scheduler, CommandPriority.POLL, f"poll-{n}", order))
+            for n in (1, 2)
+        ]
+        await asyncio.sleep(0)
+
+        cancelled = scheduler.cancel_queued(
+            lambda: RuntimeError("superseded"), min_priority=CommandPriority.POLL
+        )
+        hold.set()
+        await asyncio.gather(holder, relay)
+
+        assert cancelled == 2
+        for task in polls:
+            with pytest.raises(RuntimeError, match="superseded"):
+                await task
+        assert order == ["holder", "relay"]
+        assert scheduler.busy is False
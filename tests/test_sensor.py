@@ -11,6 +11,7 @@ import pytest
 
 # Direct imports using symlink (fournoks_elios4you -> 4noks_elios4you)
 from custom_components.fournoks_elios4you.const import CONF_SCAN_INTERVAL, DOMAIN, SENSOR_ENTITIES
+from custom_components.fournoks_elios4you.model import DeviceSnapshot
 from custom_components.fournoks_elios4you.sensor import Elios4YouSensor, async_setup_entry
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, UnitOfEnergy, UnitOfPower
@@ -38,6 +39,11 @@ def mock_coordinator(mock_api_data):
     for sensor in SENSOR_ENTITIES:
         if sensor["key"] not in coordinator.api.data:
             coordinator.api.data[sensor["key"]] = 1.0
+    # No snapshot before the first refresh: sensors read the dict view
+    coordinator.data = None
+    coordinator.stale_keys = frozenset()
+    coordinator.max_data_age = 0
+    coordinator.last_update_success = True
     return coordinator
 
 
@@ -190,6 +196,81 @@ class TestSensorEntity:
 
         assert sensor.native_value is None
 
+    def test_sensor_native_value_from_snapshot(self, mock_coordinator) -> None:
+        """Once the coordinator has a snapshot, the typed value is read from it."""
+        mock_coordinator.data = DeviceSnapshot.from_data({"produced_power": 2.5})
+        mock_coordinator.api.data["produced_power"] = 9.9
+
+        sensor = Elios4YouSensor(
+            mock_coordinator,
+            "Produced Power",
+            "produced_power",
+            "mdi:solar-power-variant-outline",
+            SensorDeviceClass.POWER,
+            SensorStateClass.MEASUREMENT,
+            UnitOfPower.KILO_WATT,
+            True,  # enabled_default
+        )
+
+        assert sensor.native_value == 2.5
+
+    def test_sensor_available_follows_last_poll_without_max_age(self, mock_coordinator) -> None:
+        """Without a maximum data age, a failed poll makes the sensor unavailable."""
+        sensor = Elios4YouSensor(
+            mock_coordinator,
+            "Produced Power",
+            "produced_power",
+            "mdi:solar-power-variant-outline",
+            SensorDeviceClass.POWER,
+            SensorStateClass.MEASUREMENT,
+            UnitOfPower.KILO_WATT,
+            True,  # enabled_default
+        )
+
+        assert sensor.available is True
+        mock_coordinator.last_update_success = False
+        assert sensor.available is False
+
+    def test_sensor_available_follows_own_value_age(self, mock_coordinator) -> None:
+        """With a maximum data age, only the sensor's own stale value makes it unavailable."""
+        mock_coordinator.max_data_age = 120
+        mock_coordinator.last_update_success = False
+        sensor = Elios4YouSensor(
+            mock_coordinator,
+            "Produced Power",
+            "produced_power",
+            "mdi:solar-power-variant-outline",
+            SensorDeviceClass.POWER,
+            SensorStateClass.MEASUREMENT,
+            UnitOfPower.KILO_WATT,
+            True,  # enabled_default
+        )
+
+        assert sensor.available is True
+        mock_coordinator.stale_keys = frozenset({"produced_power"})
+        assert sensor.available is False
+
+    def test_connection_metric_stays_current_through_failed_polls(self, mock_coordinator) -> None:
+        """A cm_* sensor shows the metrics of failed polls, not the last good snapshot."""
+        mock_coordinator.data = DeviceSnapshot.from_data({"cm_consecutive_failures": 0})
+        mock_coordinator.api.data["cm_consecutive_failures"] = 3
+        mock_coordinator.last_update_success = False
+        sensor = Elios4YouSensor(
+            mock_coordinator,
+            "Consecutive Failures",
+            "cm_consecutive_failures",
+            "mdi:alert-circle-outline",
+            None,
+            None,
+            None,
+            True,  # enabled_default
+        )
+
+        assert sensor.available is True
+        assert sensor.native_value == 3
+        del mock_coordinator.api.data["cm_consecutive_failures"]
+        assert sensor.available is False
+
     def test_sensor_native_unit_of_measurement(self, mock_coordinator) -> None:
         """Test sensor unit of measurement."""
         sensor = Elios4YouSensor(
@@ -335,8 +416,6 @@ class TestSensorEntity:
 
     def test_sensor_handle_coordinator_update(self, mock_coordinator) -> None:
         """Test sensor handles coordinator updates."""
-        mock_coordinator.api.data["rcap"] = 42
-
         sensor = Elios4YouSensor(
             mock_coordinator,
             "RedCap",
@@ -351,9 +430,23 @@ class TestSensorEntity:
 
         sensor._handle_coordinator_update()
 
-        assert sensor._state == 42
         sensor.async_write_ha_state.assert_called_once()
 
+    def test_sensor_coordinator_context_is_key(self, mock_coordinator) -> None:
+        """The sensor listens on its own data key, so it is only woken when it changes."""
+        sensor = Elios4YouSensor(
+            mock_coordinator,
+            "RedCap",
+            "rcap",
+            "mdi:information-outline",
+            None,
+            None,
+            None,
+            True,  # enabled_default
+        )
+
+        assert sensor.coordinator_context == "rcap"
+
 
 class TestSensorTypes:
     """Tests for different sensor types."""
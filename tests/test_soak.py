@@ -0,0 +1,106 @@
+"""Accelerated-time soak tests for the ConnectionManager state machine.
+
+One simulated day of 10 s polling through every scripted fault runs by
+default. Soak longer with ``E4U_SOAK_DAYS``, e.g.::
+
+    E4U_SOAK_DAYS=30 pytest tests/test_soak.py
+"""
+
+from __future__ import annotations
+
+import os
+
+from custom_components.fournoks_elios4you import connection_manager as cm
+from custom_components.fournoks_elios4you.clock import ManualClock
+from custom_components.fournoks_elios4you.connection_manager import (
+    ConnectionManager,
+    ConnectionState,
+    ConnectionUnavailableError,
+    TelnetConnectionError,
+)
+import pytest
+
+from .soak import DAY, FAULTS, HEALTHY, FaultWindow, SoakDevice, fault_at, run_soak
+
+SOAK_DAYS = float(os.environ.get("E4U_SOAK_DAYS", "1"))
+
+
+@pytest.mark.asyncio
+async def test_soak_invariants_hold() -> None:
+    """Days of polling through every fault keep one socket, RST-only closes and capped backoff."""
+    report = await run_soak(SOAK_DAYS)
+
+    assert report.violations == []
+    assert report.polls > 0.95 * SOAK_DAYS * DAY / 10
+    assert set(report.polls_by_fault) == {HEALTHY, *FAULTS}
+    assert report.max_open == 1
+    assert report.fins <= 1  # only the final close()
+    # Every fault window ends in backoff, capped at backoff_max.
+    assert report.backoff_entries > 0
+    assert 0 < report.max_backoff <= 60.0
+    assert report.failed > 0
+    assert report.refused > 0
+    # Healthy polls reuse one socket instead of reconnecting every time.
+    assert report.connects < report.ok / 10
+
+
+@pytest.mark.asyncio
+async def test_soak_recovers_after_each_fault() -> None:
+    """The last poll of every fault-free stretch succeeds."""
+    schedule = (FaultWindow(3600, 1800, "silent"),)
+    report = await run_soak(2 / 24, schedule=schedule)
+
+    assert report.violations == []
+    # After 30 min deaf, the device is polled again within backoff_max.
+    healthy = report.polls_by_fault[HEALTHY]
+    assert report.ok >= healthy - 60.0 / 10 - 1
+
+
+@pytest.mark.asyncio
+async def test_manual_clock_drives_backoff_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Backoff expiry and state timestamps follow the injected clock, not real time."""
+    clock = ManualClock()
+    device = SoakDevice(clock)
+    device.fault = "refuse"
+    manager = ConnectionManager(
+        "soak.invalid",
+        5001,
+        clock=clock,
+        max_retries=0,
+        backoff_threshold=1,
+        backoff_initial=30.0,
+    )
+    assert manager.metrics.state_since == clock.time()
+    monkeypatch.setattr(cm, "open_transport", device.open_transport)
+
+    with pytest.raises(TelnetConnectionError, match="refused"):
+        await manager.execute("@dat")
+    assert manager.state is ConnectionState.BACKOFF
+    assert manager.metrics.backoff_until == clock.time() + 30.0
+
+    clock.advance(29.0)
+    with pytest.raises(ConnectionUnavailableError):
+        await manager.execute("@dat")
+    assert manager.metrics_snapshot()["backoff_seconds_remaining"] == 1.0
+
+    clock.advance(1.0)
+    device.fault = HEALTHY
+    assert "ready..." in await manager.execute("@dat")
+    assert manager.state is ConnectionState.READY
+    assert manager.metrics.last_success_at == clock.time()
+
+    # The reuse window is measured on the injected clock too.
+    clock.advance(91.0)
+    await manager.execute("@dat")
+    assert device.opened == 2
+    assert device.resets == 1
+    await manager.close()
+
+
+def test_fault_schedule_repeats_daily() -> None:
+    """Fault windows apply at the same time of every simulated day."""
+    schedule = (FaultWindow(100, 50, "eof"),)
+    assert fault_at(schedule, 99) == HEALTHY
+    assert fault_at(schedule, 100) == "eof"
+    assert fault_at(schedule, DAY + 149) == "eof"
+    assert fault_at(schedule, DAY + 150) == HEALTHY
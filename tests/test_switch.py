@@ -21,6 +21,17 @@ from .conftest import TEST_HOST, TEST_NAME, TEST_PORT, TEST_SCAN_INTERVAL, TEST_
 from .test_config_flow import MockConfigEntry
 
 
+def _relay_write(api: MagicMock, result: bool, *, read_back: bool = True) -> AsyncMock:
+    """Return a telnet_set_relay answering ``result``, after reading the relay back or not."""
+
+    async def _set_relay(state: str) -> bool:
+        if read_back:
+            api.relay_reads += 1
+        return result
+
+    return AsyncMock(side_effect=_set_relay)
+
+
 @pytest.fixture
 def mock_coordinator(mock_api_data):
     """Create a mock coordinator with API data."""
@@ -35,8 +46,10 @@ def mock_coordinator(mock_api_data):
     coordinator.api.data["swver"] = "1.0 / 2.0"
     coordinator.api.data["hwver"] = "3.0"
     coordinator.api.data["relay_state"] = 0
-    coordinator.api.telnet_set_relay = AsyncMock(return_value=True)
+    coordinator.api.relay_reads = 0
+    coordinator.api.telnet_set_relay = _relay_write(coordinator.api, True)
     coordinator.async_update_data = AsyncMock()
+    coordinator.async_refresh_relay = AsyncMock()
     return coordinator
 
 
@@ -320,8 +333,8 @@ class TestSwitchTurnOnOff:
         mock_coordinator.api.telnet_set_relay.assert_called_once_with("off")
 
     @pytest.mark.asyncio
-    async def test_turn_on_calls_coordinator_update(self, mock_coordinator) -> None:
-        """Test that turn on triggers coordinator update."""
+    async def test_turn_on_publishes_through_coordinator(self, mock_coordinator) -> None:
+        """Turning on publishes the read-back relay state through the coordinator."""
         switch = Elios4YouSwitch(
             mock_coordinator,
             "Relay",
@@ -333,12 +346,12 @@ class TestSwitchTurnOnOff:
 
         await switch.async_turn_on()
 
-        # Should call async_write_ha_state via _handle_coordinator_update
-        switch.async_write_ha_state.assert_called()
+        # The coordinator wakes the switch if the relay state changed
+        mock_coordinator.async_publish.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_turn_off_calls_coordinator_update(self, mock_coordinator) -> None:
-        """Test that turn off triggers coordinator update."""
+    async def test_turn_off_publishes_through_coordinator(self, mock_coordinator) -> None:
+        """Turning off publishes the read-back relay state through the coordinator."""
         switch = Elios4YouSwitch(
             mock_coordinator,
             "Relay",
@@ -350,8 +363,42 @@ class TestSwitchTurnOnOff:
 
         await switch.async_turn_off()
 
-        # Should call async_write_ha_state via _handle_coordinator_update
-        switch.async_write_ha_state.assert_called()
+        # The coordinator wakes the switch if the relay state changed
+        mock_coordinator.async_publish.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_turn_on_is_not_published(self, mock_coordinator) -> None:
+        """A write that failed before the relay was read back publishes nothing."""
+        mock_coordinator.api.telnet_set_relay = _relay_write(
+            mock_coordinator.api, False, read_back=False
+        )
+        switch = Elios4YouSwitch(
+            mock_coordinator,
+            "Relay",
+            "relay_state",
+            "mdi:toggle-switch-outline",
+            SwitchDeviceClass.SWITCH,
+        )
+
+        await switch.async_turn_on()
+
+        mock_coordinator.async_publish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_mismatched_read_back_is_published(self, mock_coordinator) -> None:
+        """A read-back that does not match the request is still shown by the switch."""
+        mock_coordinator.api.telnet_set_relay = _relay_write(mock_coordinator.api, False)
+        switch = Elios4YouSwitch(
+            mock_coordinator,
+            "Relay",
+            "relay_state",
+            "mdi:toggle-switch-outline",
+            SwitchDeviceClass.SWITCH,
+        )
+
+        await switch.async_turn_on()
+
+        mock_coordinator.async_publish.assert_called_once()
 
 
 class TestSwitchForceUpdate:
@@ -370,7 +417,9 @@ class TestSwitchForceUpdate:
 
         await switch.async_force_update()
 
-        mock_coordinator.async_update_data.assert_called_once()
+        # Only the relay is re-read, not a full poll
+        mock_coordinator.async_refresh_relay.assert_awaited_once()
+        mock_coordinator.async_update_data.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_async_force_update_with_delay(self, mock_coordinator) -> None:
@@ -388,7 +437,7 @@ class TestSwitchForceUpdate:
             await switch.async_force_update(delay=1)
 
             mock_sleep.assert_called_once_with(1)
-            mock_coordinator.async_update_data.assert_called_once()
+            mock_coordinator.async_refresh_relay.assert_awaited_once()
 
 
 class TestSwitchCoordinatorUpdate:
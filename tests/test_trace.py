@@ -0,0 +1,150 @@
+"""Tests for the exchange trace ring buffer and its replay.
+
+Traces are captured from a real ConnectionManager on a manual clock against
+the in-memory soak device, then replayed with ``tests/trace_replay.py``.
+"""
+
+from __future__ import annotations
+
+from contextlib import suppress
+from custom_components.fournoks_elios4you import connection_manager as cm
+from custom_components.fournoks_elios4you.clock import ManualClock
+from custom_components.fournoks_elios4you.connection_manager import (
+    ConnectionManager,
+    ConnectionManagerError,
+)
+from custom_components.fournoks_elios4you.trace import ExchangeTrace, TraceEvent, TraceKind
+import pytest
+
+from .soak import HEALTHY, SoakDevice
+from .trace_replay import replay
+
+
+def test_ring_buffer_keeps_the_newest_events_in_order() -> None:
+    """Once full, the oldest events are overwritten and counted as dropped."""
+    trace = ExchangeTrace(3)
+    for i in range(5):
+        trace.record(float(i), TraceKind.SEND, f"@c{i}")
+
+    assert [event.command for event in trace.events()] == ["@c2", "@c3", "@c4"]
+    snapshot = trace.snapshot()
+    assert snapshot["recorded"] == 5
+    assert snapshot["dropped"] == 2
+    assert snapshot["events"][0] == {
+        "at": 2.0,
+        "kind": "send",
+        "command": "@c2",
+        "data": "",
+        "detail": "",
+    }
+    assert TraceEvent.from_dict(snapshot["events"][0]) == trace.events()[0]
+
+
+def test_zero_capacity_records_nothing() -> None:
+    """A trace of size 0 is switched off."""
+    trace = ExchangeTrace(0)
+    trace.record(0.0, TraceKind.CONNECT)
+    assert trace.events() == []
+    assert trace.snapshot()["recorded"] == 0
+
+
+async def _capture(
+    monkeypatch: pytest.MonkeyPatch, faults: list[str], *, trace_size: int = 256
+) -> ConnectionManager:
+    """Poll the soak device once per fault (10 s apart) and return the manager."""
+    clock = ManualClock()
+    device = SoakDevice(clock)
+    monkeypatch.setattr(cm, "open_transport", device.open_transport)
+    manager = ConnectionManager(
+        "trace.invalid",
+        5001,
+        clock=clock,
+        retry_delay=0.3,
+        backoff_threshold=2,
+        backoff_initial=15.0,
+        trace_size=trace_size,
+    )
+    for fault in faults:
+        device.fault = fault
+        with suppress(ConnectionManagerError):
+            await manager.execute_batch(["@dat", "@sta"])
+        await clock.sleep(10.0)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_manager_traces_exchanges(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Executes, connects, writes, replies, closes and transitions are all traced."""
+    manager = await _capture(monkeypatch, [HEALTHY, "silent"])
+    events = manager.trace_snapshot()["events"]
+    kinds = [event["kind"] for event in events]
+
+    assert kinds[:7] == [
+        "execute",
+        "transition",
+        "connect",
+        "transition",
+        "send",
+        "recv",
+        "recv",
+    ]
+    assert events[0]["command"] == "@dat+@sta"
+    assert events[0]["detail"] == "state=disconnected failures=0 pipelining=1"
+    assert events[4]["data"] == "@dat\n@sta\n"
+    assert "Produced Power" in events[5]["data"]
+    assert events[5]["detail"] == "ok"
+    # The silent poll reuses the socket, times out and resets it.
+    assert "idle=10.000" in events[8]["detail"]
+    assert {"kind": "recv", "command": "@dat", "detail": "silent"}.items() <= events[10].items()
+    assert events[11]["kind"] == "abort"
+    assert events[-1] == {**events[-1], "kind": "result", "command": "@dat"}
+    assert events[-1]["detail"].startswith("failed: silent_timeout")
+    assert manager.trace_snapshot()["settings"]["backoff_threshold"] == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_reproduces_parser_and_state_machine(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A trace through faults, backoff and recovery replays event for event."""
+    faults = [HEALTHY, "silent", "reset", "refuse", "refuse", "eof", "stall", HEALTHY, HEALTHY]
+    manager = await _capture(monkeypatch, faults)
+    snapshot = manager.trace_snapshot()
+
+    result = await replay(snapshot)
+
+    assert result.divergence == ""
+    assert result.executes == len(faults)
+    assert len(result.replayed) == len(snapshot["events"])
+    parsed = dict(result.parsed)
+    assert parsed["@dat"]["produced_power"] == "2.50"
+    assert parsed["@sta"]["sold_energy_f2"] == "580.20"
+    # Replaying twice gives the same result: it is deterministic.
+    assert (await replay(snapshot)).replayed == result.replayed
+
+
+@pytest.mark.asyncio
+async def test_replay_of_a_wrapped_trace(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A buffer that wrapped mid-streak replays from the state it recorded."""
+    faults = [HEALTHY, HEALTHY, "silent", "silent", "refuse", HEALTHY, HEALTHY]
+    manager = await _capture(monkeypatch, faults, trace_size=40)
+    snapshot = manager.trace_snapshot()
+    assert snapshot["dropped"] > 0
+
+    result = await replay(snapshot)
+
+    assert result.divergence == ""
+
+
+@pytest.mark.asyncio
+async def test_replay_reports_divergence(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A trace the state machine would not produce is flagged."""
+    manager = await _capture(monkeypatch, [HEALTHY, HEALTHY])
+    snapshot = manager.trace_snapshot()
+    for event in snapshot["events"]:
+        if event["kind"] == "result":
+            event["detail"] = "failed: tampered"
+
+    result = await replay(snapshot)
+
+    assert "tampered" in result.divergence
@@ -0,0 +1,190 @@
+"""Tests for the device transports.
+
+Covers:
+* the raw asyncio.Protocol backend against a real localhost server
+  (bytes in/out, EOF, RST on abort, FIN on graceful close)
+* ConnectionManager defaulting to the raw backend end to end
+* the telnetlib3 fallback adapting its str-based reader/writer to bytes
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import suppress
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.fournoks_elios4you.connection_manager import (
+    RESPONSE_SEPARATOR,
+    ConnectionManager,
+)
+from custom_components.fournoks_elios4you.transport import (
+    RawTcpTransport,
+    TelnetlibTransport,
+    TransportBackend,
+    open_transport,
+)
+import pytest
+
+LOCALHOST = "127.0.0.1"
+
+Handler = Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]
+
+
+@pytest.fixture
+async def serve(socket_enabled: None) -> AsyncGenerator[Callable[[Handler], Awaitable[int]]]:
+    """Start localhost servers with a given handler and return their port."""
+    servers: list[asyncio.Server] = []
+
+    async def _serve(handler: Handler) -> int:
+        server = await asyncio.start_server(handler, LOCALHOST, 0)
+        servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    yield _serve
+
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
+# ---------------------------------------------------------------------- #
+# RawTcpTransport
+# ---------------------------------------------------------------------- #
+
+
+@pytest.mark.asyncio
+async def test_raw_transport_round_trip_and_eof(serve) -> None:
+    """Bytes written reach the server; server bytes are read back until EOF."""
+    received: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+
+    async def handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        received.set_result(await reader.readline())
+        writer.write(b"hello")
+        await writer.drain()
+        writer.close()
+
+    port = await serve(handler)
+    transport = await open_transport(TransportBackend.RAW, LOCALHOST, port)
+    assert isinstance(transport, RawTcpTransport)
+
+    transport.write(b"@dat\n")
+    await transport.drain()
+    assert await asyncio.wait_for(received, 1.0) == b"@dat\n"
+
+    data = b""
+    while chunk := await asyncio.wait_for(transport.read(2), 1.0):
+        assert len(chunk) <= 2
+        data += chunk
+    assert data == b"hello"
+    assert transport.is_closing() is True
+    transport.abort()
+
+
+@pytest.mark.asyncio
+async def test_raw_transport_abort_sends_rst(serve) -> None:
+    """abort() resets the connection instead of closing it gracefully."""
+    outcome: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+
+    async def handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            data = await reader.read(100)
+        except ConnectionResetError:
+            outcome.set_result("rst")
+        else:
+            outcome.set_result("fin" if not data else "data")
+        writer.close()
+
+    port = await serve(handler)
+    transport = await RawTcpTransport.open(LOCALHOST, port)
+    transport.abort()
+
+    assert await asyncio.wait_for(outcome, 1.0) == "rst"
+    assert transport.is_closing() is True
+
+
+@pytest.mark.asyncio
+async def test_raw_transport_close_sends_fin(serve) -> None:
+    """close() shuts down with FIN and returns once the connection is gone."""
+    outcome: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+
+    async def handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        outcome.set_result(await reader.read(100))
+        writer.close()
+
+    port = await serve(handler)
+    transport = await RawTcpTransport.open(LOCALHOST, port)
+    transport.write(b"bye")
+    await asyncio.wait_for(transport.close(timeout=1.0), 2.0)
+
+    # Buffered data is flushed before the FIN.
+    assert await asyncio.wait_for(outcome, 1.0) == b"bye"
+    assert transport.is_closing() is True
+
+
+@pytest.mark.asyncio
+async def test_raw_transport_write_after_close_raises(serve) -> None:
+    """Writing to a dropped connection surfaces as an OSError for the retry logic."""
+
+    async def handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with suppress(ConnectionResetError):
+            await reader.read(100)
+        writer.close()
+
+    port = await serve(handler)
+    transport = await RawTcpTransport.open(LOCALHOST, port)
+    transport.abort()
+
+    with pytest.raises(ConnectionResetError):
+        transport.write(b"@dat\n")
+    with pytest.raises(ConnectionResetError):
+        await transport.drain()
+
+
+@pytest.mark.asyncio
+async def test_manager_uses_raw_backend_by_default(serve) -> None:
+    """A default ConnectionManager pipelines a batch over the raw backend."""
+    lines: list[bytes] = []
+
+    async def handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while line := await reader.readline():
+            lines.append(line)
+            cmd = line.decode().strip()
+            writer.write(f"{cmd}\n0;k;1\n\n{RESPONSE_SEPARATOR}\n".encode())
+            await writer.drain()
+        writer.close()
+
+    port = await serve(handler)
+    mgr = ConnectionManager(LOCALHOST, port)
+    try:
+        replies = await mgr.execute_batch(["@dat", "@sta"])
+    finally:
+        await mgr.close()
+
+    assert lines == [b"@dat\n", b"@sta\n"]
+    assert [reply.split()[0] for reply in replies] == ["@dat", "@sta"]
+    assert all(reply.endswith(RESPONSE_SEPARATOR) for reply in replies)
+    assert mgr.metrics.connects_succeeded == 1
+    assert mgr.metrics.graceful_closes == 1
+
+
+# ---------------------------------------------------------------------- #
+# TelnetlibTransport
+# ---------------------------------------------------------------------- #
+
+
+@pytest.mark.asyncio
+async def test_telnetlib_transport_converts_bytes_and_str() -> None:
+    """The fallback adapter decodes writes and encodes reads."""
+    reader = MagicMock()
+    reader.read = AsyncMock(side_effect=["ready...", ""])
+    writer = MagicMock()
+    writer.drain = AsyncMock()
+    transport = TelnetlibTransport(reader, writer)
+
+    transport.write(b"@inf\n")
+    await transport.drain()
+
+    writer.write.assert_called_once_with("@inf\n")
+    assert await transport.read(1024) == b"ready..."
+    assert await transport.read(1024) == b""
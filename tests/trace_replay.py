@@ -0,0 +1,232 @@
+"""Replay a captured exchange trace.
+
+Takes the ``trace`` section of a config entry diagnostics dump (or
+``ConnectionManager.trace_snapshot()``) and plays it back deterministically:
+
+* every complete reply goes through ``Elios4YouAPI._parse``, as in the read
+  cycle
+* a fresh ``ConnectionManager`` with the traced settings, seeded with the
+  state the first traced ``execute`` started from, re-runs every traced
+  ``execute`` on a ``ManualClock`` set to the traced timestamps. Its
+  transport serves the traced connects, connect failures and replies
+  (``silent`` replies time out, ``error`` replies reset the connection) in
+  order
+
+The replayed manager's own trace must then match the captured one event by
+event (timestamps aside); the first divergence is reported. Priority yields
+that interleave two executes are not reconstructed.
+
+Run standalone with ``python -m tests.trace_replay diagnostics.json``.
+
+https://github.com/alexdelprete/ha-4noks-elios4you
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from custom_components.fournoks_elios4you import connection_manager as cm
+from custom_components.fournoks_elios4you.api import Elios4YouAPI
+from custom_components.fournoks_elios4you.clock import ManualClock
+from custom_components.fournoks_elios4you.connection_manager import (
+    ConnectionManager,
+    ConnectionManagerError,
+    ConnectionState,
+)
+from custom_components.fournoks_elios4you.trace import RECV_OK, RECV_SILENT, TraceEvent, TraceKind
+from custom_components.fournoks_elios4you.transport import DeviceTransport
+
+# Events the replay transport serves, in trace order.
+_DEVICE_EVENTS = (TraceKind.CONNECT, TraceKind.CONNECT_FAILED, TraceKind.RECV)
+
+
+@dataclass
+class ReplayResult:
+    """What a replay reproduced."""
+
+    executes: int = 0
+    parsed: list[tuple[str, dict[str, str]]] = field(default_factory=list)
+    replayed: list[TraceEvent] = field(default_factory=list)
+    divergence: str = ""
+
+    @property
+    def matches(self) -> bool:
+        """Return True if the replayed trace matches the captured one."""
+        return not self.divergence
+
+
+class _Script:
+    """Cursor over the captured events that drives the clock and the device."""
+
+    def __init__(self, events: list[TraceEvent], clock: ManualClock) -> None:
+        self.events = events
+        self.clock = clock
+        self.position = 0
+
+    def seek(self, at: float) -> None:
+        self.clock.advance_to(at)
+
+    def next_device_event(self) -> TraceEvent | None:
+        """Consume and return the next connect / reply event."""
+        while self.position < len(self.events):
+            event = self.events[self.position]
+            self.position += 1
+            if event.kind is TraceKind.EXECUTE:
+                # The device side of the current execute is exhausted.
+                self.position -= 1
+                return None
+            if event.kind in _DEVICE_EVENTS:
+                self.seek(event.at)
+                return event
+        return None
+
+    async def open_transport(self, *_args: object) -> DeviceTransport:
+        event = self.next_device_event()
+        if event is None or event.kind is TraceKind.CONNECT_FAILED:
+            if event is not None and event.detail == "timeout":
+                raise TimeoutError
+            raise OSError(event.detail.removeprefix("error: ") if event else "not in trace")
+        return _ReplayTransport(self)
+
+
+class _ReplayTransport(DeviceTransport):
+    """Serves the traced replies of one connection."""
+
+    def __init__(self, script: _Script) -> None:
+        self._script = script
+        self._closed = False
+        self._timeout_next = False
+
+    def write(self, data: bytes) -> None:
+        pass
+
+    async def drain(self) -> None:
+        pass
+
+    async def read(self, n: int) -> bytes:
+        if self._timeout_next:
+            self._timeout_next = False
+            raise TimeoutError
+        event = self._script.next_device_event()
+        if event is None or event.kind is not TraceKind.RECV:
+            raise TimeoutError
+        if event.detail.startswith("error"):
+            raise ConnectionResetError(event.detail.removeprefix("error: "))
+        if event.detail == RECV_SILENT:
+            if not event.data:
+                raise TimeoutError
+            self._timeout_next = True
+        return event.data.encode()
+
+    def is_closing(self) -> bool:
+        return self._closed
+
+    def abort(self) -> None:
+        self._closed = True
+
+    async def close(self, timeout: float) -> None:
+        self._closed = True
+
+
+def _context(detail: str) -> dict[str, str]:
+    return dict(item.split("=", 1) for item in detail.split())
+
+
+def _seed(manager: ConnectionManager, script: _Script, execute: TraceEvent) -> None:
+    """Put ``manager`` in the state the first traced execute started from."""
+    context = _context(execute.detail)
+    metrics = manager.metrics
+    metrics.state = ConnectionState(context["state"])
+    metrics.consecutive_failures = int(context["failures"])
+    manager._pipelining = context["pipelining"] == "1"
+    if "backoff_until" in context:
+        metrics.backoff_until = float(context["backoff_until"])
+    if "idle" in context:
+        manager._transport = _ReplayTransport(script)
+        manager._last_activity = execute.at - float(context["idle"])
+
+
+def _key(event: TraceEvent) -> tuple[str, str, str, str]:
+    return (event.kind.value, event.command, event.data, event.detail)
+
+
+async def replay(trace: dict[str, Any]) -> ReplayResult:
+    """Replay ``trace`` (a ``trace_snapshot()`` or diagnostics ``trace`` section)."""
+    events = [TraceEvent.from_dict(event) for event in trace["events"]]
+    result = ReplayResult()
+    for event in events:
+        if event.kind is TraceKind.RECV and event.detail == RECV_OK:
+            result.parsed.append((event.command, Elios4YouAPI._parse(event.command, event.data)))
+
+    # Only whole executes can be replayed: skip a partial one at the start.
+    first = next((i for i, e in enumerate(events) if e.kind is TraceKind.EXECUTE), None)
+    if first is None:
+        return result
+    events = events[first:]
+
+    # Epoch 0: the clock reads the traced timestamps back exactly.
+    clock = ManualClock(epoch=0.0)
+    clock.advance_to(events[0].at)
+    script = _Script(events, clock)
+    manager = ConnectionManager(
+        "replay.invalid",
+        0,
+        clock=clock,
+        trace_size=2 * len(events) + 16,
+        **trace.get("settings", {}),
+    )
+    _seed(manager, script, events[0])
+
+    with patch.object(cm, "open_transport", script.open_transport):
+        for index, event in enumerate(events):
+            if event.kind is not TraceKind.EXECUTE:
+                continue
+            script.position = index + 1
+            script.seek(event.at)
+            result.executes += 1
+            with suppress(ConnectionManagerError):
+                await manager.execute_batch(event.command.split("+"))
+
+    result.replayed = manager._trace.events()
+    for index, (captured, replayed) in enumerate(zip(events, result.replayed, strict=False)):
+        if _key(captured) != _key(replayed):
+            result.divergence = (
+                f"event {index}: captured {_key(captured)!r}, replayed {_key(replayed)!r}"
+            )
+            break
+    else:
+        if len(result.replayed) != len(events):
+            result.divergence = f"captured {len(events)} events, replayed {len(result.replayed)}"
+    return result
+
+
+def _load(path: str) -> dict[str, Any]:
+    dump = json.loads(Path(path).read_text())
+    # A diagnostics download nests the integration's dict under "data".
+    dump = dump.get("data", dump)
+    return dump.get("trace", dump)
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description="Replay an Elios4you exchange trace.")
+    parser.add_argument("path", help="diagnostics JSON or a saved trace_snapshot()")
+    args = parser.parse_args()
+
+    result = await replay(_load(args.path))
+    for event in result.replayed:
+        print(  # noqa: T201
+            f"{event.at:14.3f} {event.kind.value:<14} {event.command:<10} {event.detail}"
+        )
+    print(f"{result.executes} executes, {len(result.parsed)} replies parsed")  # noqa: T201
+    print(result.divergence or "replay matches the captured trace")  # noqa: T201
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())